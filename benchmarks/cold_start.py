@@ -0,0 +1,98 @@
+"""Cold start of a worker: imports, create_app and the first requests.
+
+Each sample is a fresh interpreter (like a new gunicorn worker without
+preload) that times `import jokes_tounsi`, create_app(ProductionConfig)
+and its first GET /api/v1/openapi.json and GET /api/v1/jokes. Runs with
+the spec generated on demand and with a prebuilt OPENAPI_SPEC_FILE, and
+reports the median and worst of `--runs` samples.
+
+    python -m benchmarks.cold_start --runs 10 --json cold_start.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+STEPS = ("import_ms", "create_app_ms", "first_spec_ms", "first_list_ms")
+
+
+def child():
+    """One sample, printed as JSON. Runs in the fresh interpreter."""
+    start = time.perf_counter()
+    from jokes_tounsi import create_app
+    from jokes_tounsi.config import ProductionConfig
+    imported = time.perf_counter()
+    app = create_app(ProductionConfig)
+    created = time.perf_counter()
+    client = app.test_client()
+    assert client.get("/api/v1/openapi.json").status_code == 200
+    spec = time.perf_counter()
+    assert client.get("/api/v1/jokes").status_code == 200
+    listed = time.perf_counter()
+    print(json.dumps({
+        "import_ms": (imported - start) * 1000,
+        "create_app_ms": (created - imported) * 1000,
+        "first_spec_ms": (spec - created) * 1000,
+        "first_list_ms": (listed - spec) * 1000,
+        "authlib_imported": "authlib" in sys.modules,
+    }))
+
+
+def sample(env):
+    from .common import ROOT
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.cold_start", "--child"],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        return child()
+    # Imports the app: only in the parent process
+    from .common import ROOT, SECRET, scratch_database, write_results, print_table
+
+    path = scratch_database("cold_start")
+    env = dict(
+        os.environ,
+        FLASK_ENV="production",
+        DATABASE_URL=f"sqlite:///{path}",
+        SECRET_KEY=SECRET,
+        JWT_SECRET_KEY=SECRET,
+    )
+    subprocess.run(
+        [sys.executable, "-m", "flask", "--app", "app", "db", "upgrade"],
+        cwd=ROOT, env=env, capture_output=True, check=True,
+    )
+    spec_file = os.path.join(tempfile.gettempdir(), "jokes_bench_openapi.json")
+    subprocess.run(
+        [sys.executable, "-m", "flask", "--app", "app", "openapi", "write", "--format=json", spec_file],
+        cwd=ROOT, env=env, capture_output=True, check=True,
+    )
+
+    results = {}
+    for name, extra in (("generated spec", {}), ("prebuilt spec", {"OPENAPI_SPEC_FILE": spec_file})):
+        samples = [sample({**env, **extra}) for _ in range(args.runs)]
+        results[name] = {
+            **{f"{step}_median": round(statistics.median(s[step] for s in samples), 1) for step in STEPS},
+            **{f"{step}_max": round(max(s[step] for s in samples), 1) for step in STEPS},
+            "authlib_imported": any(s["authlib_imported"] for s in samples),
+        }
+
+    rows = [{"spec": name, **{step: stats[f"{step}_median"] for step in STEPS}} for name, stats in results.items()]
+    print_table(rows, ["spec", *STEPS])
+    write_results(args.json, "cold_start", results, vars(args))
+
+
+if __name__ == "__main__":
+    main()
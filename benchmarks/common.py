@@ -0,0 +1,143 @@
+"""Helpers shared by the benchmark scripts."""
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import requests
+
+from jokes_tounsi import create_app
+from jokes_tounsi.config import Config
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SECRET = "benchmark-secret-key-of-sufficient-length"
+
+
+def make_config(database_uri, **overrides):
+    """A quiet config class pointing at `database_uri`."""
+    attrs = {
+        "SQLALCHEMY_DATABASE_URI": database_uri,
+        "SQLALCHEMY_ECHO": False,
+        "JWT_SECRET_KEY": SECRET,
+        "SECRET_KEY": SECRET,
+    }
+    attrs.update(overrides)
+    return type("BenchmarkConfig", (Config,), attrs)
+
+
+def scratch_database(name):
+    """Path of a fresh SQLite file in the temp directory."""
+    path = os.path.join(tempfile.gettempdir(), f"jokes_bench_{name}.db")
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    return path
+
+
+def build_app(database_path, **overrides):
+    return create_app(make_config(f"sqlite:///{database_path}", **overrides))
+
+
+def start_gunicorn(database_path, port, workers=None, **env):
+    """Run `gunicorn -c gunicorn.conf.py app:app` in production mode on `port`.
+
+    Extra keyword arguments are environment variables (GUNICORN_WORKER_CLASS,
+    ...). Returns (process, base_url) once /health answers.
+    """
+    env = dict(
+        os.environ,
+        FLASK_ENV="production",
+        DATABASE_URL=f"sqlite:///{database_path}",
+        SECRET_KEY=SECRET,
+        JWT_SECRET_KEY=SECRET,
+        GUNICORN_BIND=f"127.0.0.1:{port}",
+        GUNICORN_ACCESS_LOG="",
+        **env,
+    )
+    if workers:
+        env["GUNICORN_WORKERS"] = str(workers)
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "app:app"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.perf_counter() + 30
+    while time.perf_counter() < deadline:
+        try:
+            if requests.get(f"{base_url}/health", timeout=5).status_code == 200:
+                return server, base_url
+        except requests.RequestException:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("gunicorn did not start")
+
+
+def stop_gunicorn(server):
+    server.terminate()
+    server.wait(timeout=30)
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(latencies, elapsed, errors=0):
+    """Latency percentiles in milliseconds and throughput for one endpoint."""
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2) if latencies else None,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2) if latencies else None,
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2) if latencies else None,
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2) if latencies else None,
+    }
+
+
+def timed(fn, *args, **kwargs):
+    """Call fn, returning (seconds, result)."""
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def environment():
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def write_results(path, name, results, parameters=None):
+    """Store benchmark results as JSON so runs can be diffed."""
+    if not path:
+        return
+    payload = {
+        "benchmark": name,
+        "environment": environment(),
+        "parameters": parameters or {},
+        "results": results,
+    }
+    with open(path, "w") as f:
+        json.dump(payload, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def print_table(rows, columns):
+    """Print a list of dicts as an aligned text table."""
+    widths = {c: max(len(c), *(len(str(r.get(c, ""))) for r in rows)) for c in columns}
+    print("  ".join(c.ljust(widths[c]) for c in columns))
+    for row in rows:
+        print("  ".join(str(row.get(c, "")).ljust(widths[c]) for c in columns))
@@ -0,0 +1,128 @@
+"""Reproducible synthetic corpora of users and jokes.
+
+`seed_corpus` bulk-inserts `jokes` jokes and `users` users into an empty
+database with a fixed random seed, so two runs with the same parameters
+produce the same rows. Classifications are skewed like real submissions
+(most jokes come from Tunis, few from the south; a handful of authors
+write most of them), texts mix Tunisian Arabizi, French and English, and
+creation dates spread over the last `years` years, denser recently.
+
+Every user's password is PASSWORD (hashed once with the app's method).
+"""
+import itertools
+import os
+import random
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+from jokes_tounsi.extensions import db
+from jokes_tounsi.models import User, Joke
+from jokes_tounsi.security.passwords import hash_password
+
+PASSWORD = "password123"
+BATCH_SIZE = 20000
+
+# value -> relative weight
+REGIONS = {"Tunis": 40, "Sfax": 18, "Sousse": 14, "Bizerte": 8, "Nabeul": 7,
+           "Kairouan": 5, "Gabes": 4, "Gafsa": 2, "Tozeur": 1, "Djerba": 1}
+ERAS = {"Post-2011": 55, "Pre-2011": 30, "Bourguiba": 10, "Beylical": 5}
+AGE_GROUPS = {"Adults": 60, "All": 30, "Kids": 10}
+ACCEPTABILITY = {"Safe": 70, "Mild": 22, "Sensitive": 8}
+DELIVERY_TYPES = {"Oral": 45, "TV": 20, "Radio": 15, "Social media": 15, "Theatre": 5}
+TONES = {"Funny": 50, "Sarcastic": 30, "Absurd": 15, "Dark": 5}
+RHYTHMS = {"Fast": 40, "Medium": 40, "Slow": 20}
+
+WORDS_TN = ("jha", "sfaxi", "bouh", "flous", "l7mar", "souk", "mchè", "9al", "ya3tik", "sa7a",
+            "barcha", "chbik", "mouch", "3lech", "bech", "tawa", "famma", "khobza", "kaskrout",
+            "louage", "7anout", "bled", "3arbi", "m3allem", "ta9a", "derja", "9ahwa", "zanga")
+WORDS_FR = ("un", "homme", "arrive", "marché", "argent", "voisin", "âne", "pourquoi", "alors",
+            "répond", "femme", "maison", "café", "taxi", "patron", "école", "médecin", "ville")
+WORDS_EN = ("a", "man", "goes", "market", "money", "neighbour", "donkey", "why", "then",
+            "answers", "wife", "house", "coffee", "taxi", "boss", "school", "doctor", "town")
+
+# Search terms for benchmarks: frequent and rare words, a prefix, a two-word query,
+# and French and English words (only in the translations)
+SEARCH_TERMS = ("jha", "zanga", "souk", "kask", "sfaxi flous", "marché", "donkey")
+
+
+def corpus_database(jokes, seed):
+    """Path of the scratch SQLite file holding the corpus for these parameters."""
+    return os.path.join(tempfile.gettempdir(), f"jokes_bench_corpus_{jokes}_{seed}.db")
+
+
+def _picker(rng, weights):
+    values, cumulative = list(weights), list(itertools.accumulate(weights.values()))
+    return lambda: rng.choices(values, cum_weights=cumulative)[0]
+
+
+def _sentence(rng, words, low, high):
+    return " ".join(rng.choice(words) for _ in range(rng.randint(low, high))).capitalize() + "."
+
+
+def _author_ids(rng, users, count):
+    """Author of each joke: Zipf-like, user 1 writes the most."""
+    weights = list(itertools.accumulate(1 / rank for rank in range(1, users + 1)))
+    return rng.choices(range(1, users + 1), cum_weights=weights, k=count)
+
+
+def user_rows(rng, users, password_hash, now):
+    roles = _picker(rng, {"user": 80, "contributor": 18, "admin": 2})
+    for i in range(users):
+        yield {
+            "id": i + 1,
+            "email": f"user{i}@example.com",
+            "password_hash": password_hash,
+            "display_name": f"User {i}",
+            "role": "admin" if i == 0 else roles(),
+            "created_at": now,
+            "updated_at": now,
+        }
+
+
+def joke_rows(rng, jokes, users, now, years):
+    pick = {
+        column: _picker(rng, weights) for column, weights in (
+            ("region", REGIONS), ("era", ERAS), ("age_group", AGE_GROUPS),
+            ("acceptability", ACCEPTABILITY), ("delivery_type", DELIVERY_TYPES),
+            ("tone", TONES), ("rhythm", RHYTHMS),
+        )
+    }
+    span = years * 365 * 86400
+    authors = _author_ids(rng, users, jokes)
+    for i in range(jokes):
+        # Squaring skews dates towards now: more recent submissions
+        created_at = now - timedelta(seconds=int(span * rng.random() ** 2))
+        row = {
+            "text_tn": _sentence(rng, WORDS_TN, 6, 30),
+            "text_fr": _sentence(rng, WORDS_FR, 6, 30) if rng.random() < 0.6 else None,
+            "text_en": _sentence(rng, WORDS_EN, 6, 30) if rng.random() < 0.4 else None,
+            "is_published": rng.random() < 0.9,
+            "author_id": authors[i],
+            "created_at": created_at,
+            "updated_at": created_at,
+        }
+        for column, choose in pick.items():
+            # Classifications are optional on submission
+            row[column] = choose() if rng.random() < 0.85 else None
+        yield row
+
+
+def seed_corpus(app, jokes, users, seed=0, years=10):
+    """Create the schema and insert the corpus, in batches of BATCH_SIZE rows."""
+    rng = random.Random(seed)
+    now = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    with app.app_context():
+        db.create_all()
+        # A throwaway file: skip fsyncs while loading
+        db.session.execute(db.text("PRAGMA synchronous = OFF"))
+        password_hash = hash_password(PASSWORD)
+        for model, rows in (
+            (User, user_rows(rng, users, password_hash, now)),
+            (Joke, joke_rows(rng, jokes, users, now, years)),
+        ):
+            while batch := list(itertools.islice(rows, BATCH_SIZE)):
+                db.session.execute(db.insert(model), batch)
+        db.session.commit()
+        db.session.execute(db.text("ANALYZE"))
+        db.session.commit()
+        db.session.execute(db.text("PRAGMA wal_checkpoint(TRUNCATE)"))
@@ -0,0 +1,125 @@
+"""Latency of the main endpoints over large synthetic corpora.
+
+For each `--sizes` corpus (jokes; users default to one per 50 jokes),
+seeds a scratch SQLite file with benchmarks.corpus, then drives each
+scenario sequentially through the Flask test client with the production
+SQLite pragmas and read-only engine: listings (first page, filtered,
+offset pages, cursor walk), full-text search, published joke detail,
+random joke and login. Reports p50/p95/p99 and throughput per scenario.
+
+Corpora are seeded from `--seed`, so runs are comparable across versions;
+`--reuse` keeps an already seeded file instead of rebuilding it.
+
+    python -m benchmarks.endpoints --sizes 100000 1000000 --reuse --json endpoints.json
+"""
+import argparse
+import logging
+import os
+import random
+import time
+
+from jokes_tounsi.config import ProductionConfig
+from jokes_tounsi.extensions import db
+from jokes_tounsi.models import Joke
+
+from .common import build_app, scratch_database, summarize, timed, write_results, print_table
+from .corpus import PASSWORD, REGIONS, ERAS, SEARCH_TERMS, corpus_database, seed_corpus
+
+
+def scenarios(rng, joke_ids, users):
+    """name -> callable(client) issuing one request and returning the response."""
+    cursor = {"next": ""}
+
+    def cursor_walk(client):
+        response = client.get("/api/v1/jokes", query_string={"cursor": cursor["next"]})
+        # Restart from the top after the last page
+        cursor["next"] = response.get_json().get("next_cursor") or ""
+        return response
+
+    return {
+        "list": lambda client: client.get("/api/v1/jokes"),
+        "list_filtered": lambda client: client.get("/api/v1/jokes", query_string={
+            "region": rng.choice(list(REGIONS)), "era": rng.choice(list(ERAS)),
+        }),
+        "list_offset_page": lambda client: client.get("/api/v1/jokes", query_string={
+            "page": rng.randint(1, 500), "include_total": "false",
+        }),
+        "list_cursor_walk": cursor_walk,
+        "search": lambda client: client.get("/api/v1/jokes", query_string={
+            "q": rng.choice(SEARCH_TERMS),
+        }),
+        "get_joke": lambda client: client.get(f"/api/v1/jokes/{rng.choice(joke_ids)}"),
+        "random": lambda client: client.get("/api/v1/jokes/random"),
+        "login": lambda client: client.post("/api/v1/login", json={
+            "email": f"user{rng.randrange(users)}@example.com", "password": PASSWORD,
+        }),
+    }
+
+
+def run_size(jokes, args):
+    users = args.users or max(1, jokes // 50)
+    path = corpus_database(jokes, args.seed)
+    overrides = {
+        "SQLITE_PRAGMAS": ProductionConfig.SQLITE_PRAGMAS,
+        "SQLITE_READONLY_ENGINE": True,
+        "PASSWORD_HASH_WORKERS": 0,
+    }
+
+    seed_seconds = None
+    if not (args.reuse and os.path.exists(path)):
+        path = scratch_database(f"corpus_{jokes}_{args.seed}")
+        seed_seconds, _ = timed(seed_corpus, build_app(path, **overrides), jokes, users, args.seed)
+
+    app = build_app(path, **overrides)
+    with app.app_context():
+        published = db.session.scalars(db.select(Joke.id).where(Joke.is_published == db.true())).all()
+    client = app.test_client()
+    rng = random.Random(args.seed)
+    results = {}
+    for name, request in scenarios(rng, published, users).items():
+        iterations = args.login_iterations if name == "login" else args.iterations
+        for _ in range(args.warmup):
+            request(client)
+        latencies, errors = [], 0
+        start = time.perf_counter()
+        for _ in range(iterations):
+            elapsed, response = timed(request, client)
+            latencies.append(elapsed)
+            errors += response.status_code != 200
+        results[name] = summarize(latencies, time.perf_counter() - start, errors)
+
+    return {
+        "jokes": jokes,
+        "users": users,
+        "seed_seconds": round(seed_seconds, 1) if seed_seconds is not None else None,
+        "database_mb": round(os.path.getsize(path) / 2 ** 20, 1),
+        "endpoints": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100000])
+    parser.add_argument("--users", type=int, help="default: one per 50 jokes")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--iterations", type=int, default=300)
+    parser.add_argument("--login-iterations", type=int, default=30)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--reuse", action="store_true", help="reuse an existing corpus file")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    runs = []
+    for jokes in args.sizes:
+        run = run_size(jokes, args)
+        runs.append(run)
+        print(f"\n{jokes} jokes, {run['users']} users, {run['database_mb']} MB"
+              + (f", seeded in {run['seed_seconds']}s" if run["seed_seconds"] is not None else ""))
+        rows = [{"endpoint": name, **stats} for name, stats in run["endpoints"].items()]
+        print_table(rows, ["endpoint", "requests", "errors", "throughput_rps", "p50_ms", "p95_ms", "p99_ms"])
+    write_results(args.json, "endpoints", runs, vars(args))
+
+
+if __name__ == "__main__":
+    main()
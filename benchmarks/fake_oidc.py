@@ -0,0 +1,134 @@
+"""A local stand-in for Google's OpenID Connect provider.
+
+Serves the discovery document, authorize, token, userinfo and JWKS
+endpoints with an RSA key generated at startup. /authorize signs in
+without any consent screen: it picks one of `identities` fake Google
+accounts (or the `login_hint` one) and redirects straight back with a
+code, so a client following redirects goes through the whole
+google_login -> google_callback flow at full speed.
+
+Point the app at it with
+GOOGLE_SERVER_METADATA_URL=<base_url>/.well-known/openid-configuration.
+"""
+import random
+import secrets
+import threading
+import time
+from urllib.parse import urlencode
+
+from authlib.jose import JsonWebKey, jwt
+from flask import Flask, abort, jsonify, redirect, request
+from werkzeug.serving import make_server
+
+CLIENT_ID = "load-test-client"
+CLIENT_SECRET = "load-test-secret"
+
+
+def create_provider(base_url, identities=1000, seed=0):
+    app = Flask(__name__)
+    key = JsonWebKey.generate_key("RSA", 2048, is_private=True, options={"kid": "load-test"})
+    public_jwks = {"keys": [key.as_dict(is_private=False)]}
+    rng = random.Random(seed)
+    lock = threading.Lock()
+    codes = {}  # code -> (subject, nonce)
+    tokens = {}  # access token -> subject
+
+    def identity(subject):
+        return {
+            "sub": subject,
+            "email": f"google{subject}@example.com",
+            "email_verified": True,
+            "name": f"Google User {subject}",
+        }
+
+    @app.get("/.well-known/openid-configuration")
+    def discovery():
+        return jsonify(
+            issuer=base_url,
+            authorization_endpoint=f"{base_url}/authorize",
+            token_endpoint=f"{base_url}/token",
+            userinfo_endpoint=f"{base_url}/userinfo",
+            jwks_uri=f"{base_url}/jwks",
+            response_types_supported=["code"],
+            subject_types_supported=["public"],
+            id_token_signing_alg_values_supported=["RS256"],
+            scopes_supported=["openid", "email", "profile"],
+            token_endpoint_auth_methods_supported=["client_secret_basic", "client_secret_post"],
+        )
+
+    @app.get("/jwks")
+    def jwks():
+        return jsonify(public_jwks)
+
+    @app.get("/authorize")
+    def authorize():
+        if request.args.get("client_id") != CLIENT_ID or request.args.get("response_type") != "code":
+            abort(400)
+        with lock:
+            subject = request.args.get("login_hint") or str(rng.randrange(identities))
+            code = secrets.token_urlsafe(16)
+            codes[code] = (subject, request.args.get("nonce"))
+        query = {"code": code, "state": request.args.get("state", "")}
+        return redirect(f"{request.args['redirect_uri']}?{urlencode(query)}")
+
+    @app.post("/token")
+    def token():
+        auth = request.authorization
+        client = (auth.username, auth.password) if auth else (
+            request.form.get("client_id"), request.form.get("client_secret")
+        )
+        if client != (CLIENT_ID, CLIENT_SECRET):
+            return jsonify(error="invalid_client"), 401
+        with lock:
+            grant = codes.pop(request.form.get("code"), None)
+        if grant is None:
+            return jsonify(error="invalid_grant"), 400
+
+        subject, nonce = grant
+        now = int(time.time())
+        claims = {"iss": base_url, "aud": CLIENT_ID, "iat": now, "exp": now + 3600, **identity(subject)}
+        if nonce:
+            claims["nonce"] = nonce
+        access_token = secrets.token_urlsafe(24)
+        with lock:
+            tokens[access_token] = subject
+        id_token = jwt.encode({"alg": "RS256", "kid": "load-test"}, claims, key).decode()
+        return jsonify(
+            access_token=access_token,
+            token_type="Bearer",
+            expires_in=3600,
+            scope="openid email profile",
+            id_token=id_token,
+        )
+
+    @app.get("/userinfo")
+    def userinfo():
+        access_token = (request.headers.get("Authorization") or "").removeprefix("Bearer ")
+        with lock:
+            subject = tokens.get(access_token)
+        if subject is None:
+            abort(401)
+        return jsonify(identity(subject))
+
+    return app
+
+
+class FakeOIDCProvider:
+    """The provider served by a threaded werkzeug server in the background."""
+
+    def __init__(self, host="127.0.0.1", port=0, identities=1000, seed=0):
+        self._server = make_server(host, port, None, threaded=True)
+        self.base_url = f"http://{host}:{self._server.server_port}"
+        self._server.app = create_provider(self.base_url, identities, seed)
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-oidc", daemon=True)
+
+    @property
+    def metadata_url(self):
+        return f"{self.base_url}/.well-known/openid-configuration"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
@@ -0,0 +1,126 @@
+"""Throughput and tail latency of the joke endpoints per gunicorn worker class.
+
+Seeds a scratch SQLite file, then for each worker class starts
+`gunicorn -c gunicorn.conf.py app:app` with the production config and
+drives it over HTTP with `--clients` keep-alive client threads for
+`--duration` seconds. Clients mostly browse (list, detail, random) and log
+in with probability `--login-ratio`, the slow CPU-bound path.
+
+    python -m benchmarks.gunicorn_modes --modes sync gthread gevent --json modes.json
+"""
+import argparse
+import logging
+import random
+import threading
+import time
+
+import requests
+
+from jokes_tounsi.extensions import db
+from jokes_tounsi.models import User, Joke
+
+from .common import (
+    build_app, scratch_database, start_gunicorn, stop_gunicorn, summarize, write_results, print_table
+)
+
+
+def seed(path, users, jokes):
+    app = build_app(path, PASSWORD_HASH_WORKERS=0)
+    with app.app_context():
+        db.create_all()
+        for i in range(users):
+            user = User(email=f"user{i}@example.com", display_name=f"User {i}", role="contributor")
+            user.set_password("password123")
+            db.session.add(user)
+        db.session.flush()
+        db.session.execute(db.insert(Joke), [
+            {"text_tn": f"Nokta {i}", "region": random.choice(["Tunis", "Sfax", "Sousse"]),
+             "is_published": True, "author_id": 1}
+            for i in range(jokes)
+        ])
+        db.session.commit()
+
+
+def run_mode(mode, path, args):
+    server, base_url = start_gunicorn(path, args.port, workers=args.workers, GUNICORN_WORKER_CLASS=mode)
+    latencies = {"list": [], "detail": [], "random": [], "login": []}
+    errors = dict.fromkeys(latencies, 0)
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    def client(i):
+        rng = random.Random(i)
+        session = requests.Session()
+        while not stop.is_set():
+            if rng.random() < args.login_ratio:
+                endpoint = "login"
+                body = {"email": f"user{rng.randrange(args.users)}@example.com", "password": "password123"}
+                request = lambda: session.post(f"{base_url}/api/v1/login", json=body)
+            else:
+                endpoint = rng.choice(["list", "detail", "random"])
+                url = {
+                    "list": f"{base_url}/api/v1/jokes?per_page=20&region={rng.choice(['Tunis', 'Sfax'])}",
+                    "detail": f"{base_url}/api/v1/jokes/{rng.randint(1, args.jokes)}",
+                    "random": f"{base_url}/api/v1/jokes/random",
+                }[endpoint]
+                request = lambda: session.get(url)
+            start = time.perf_counter()
+            try:
+                ok = request().status_code == 200
+            except requests.RequestException:
+                ok = False
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies[endpoint].append(elapsed)
+                errors[endpoint] += not ok
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(args.clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(args.duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    stop_gunicorn(server)
+
+    results = {
+        endpoint: summarize(samples, elapsed, errors[endpoint])
+        for endpoint, samples in latencies.items()
+    }
+    everything = [sample for samples in latencies.values() for sample in samples]
+    results["all"] = summarize(everything, elapsed, sum(errors.values()))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modes", nargs="+", default=["sync", "gthread", "gevent"])
+    parser.add_argument("--duration", type=float, default=15, help="seconds per mode")
+    parser.add_argument("--clients", type=int, default=32, help="concurrent client threads")
+    parser.add_argument("--workers", type=int, help="override GUNICORN_WORKERS")
+    parser.add_argument("--login-ratio", type=float, default=0.02)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--jokes", type=int, default=20000, help="rows seeded before the runs")
+    parser.add_argument("--port", type=int, default=5087)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    path = scratch_database("gunicorn_modes")
+    seed(path, args.users, args.jokes)
+    results = {mode: run_mode(mode, path, args) for mode in args.modes}
+
+    rows = [
+        {"mode": mode, "endpoint": endpoint, **stats}
+        for mode, endpoints in results.items()
+        for endpoint, stats in endpoints.items()
+    ]
+    print_table(rows, ["mode", "endpoint", "requests", "errors", "throughput_rps", "p50_ms", "p95_ms", "p99_ms"])
+    write_results(args.json, "gunicorn_modes", results, vars(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Cost of one joke listing page: ORM + marshmallow vs column tuples + JOKE_ROWS.
+
+Seeds `--jokes` published rows, then times the page query plus the JSON
+encoding of a `--per-page` page both ways, and the whole GET /api/v1/jokes
+request through the Flask test client (ETag validation included).
+
+    python -m benchmarks.list_serialization --per-page 100 --json list.json
+"""
+import argparse
+import logging
+import random
+
+from flask import jsonify
+
+from jokes_tounsi.extensions import db
+from jokes_tounsi.models import User, Joke
+from jokes_tounsi.resources.jokes import JOKE_ROWS
+from jokes_tounsi.schemas import JokeListResponseSchema
+
+from .common import build_app, scratch_database, summarize, timed, write_results, print_table
+
+
+def seed(app, jokes):
+    with app.app_context():
+        db.create_all()
+        user = User(email="author@example.com", display_name="Author", role="contributor")
+        db.session.add(user)
+        db.session.flush()
+        db.session.execute(db.insert(Joke), [
+            {"text_tn": f"Nokta {i} " * 8, "text_fr": f"Blague {i}", "text_en": None,
+             "region": random.choice(["Tunis", "Sfax", "Sousse"]), "tone": "Funny",
+             "is_published": True, "author_id": user.id}
+            for i in range(jokes)
+        ])
+        db.session.commit()
+
+
+def orm_page(per_page):
+    items = (
+        Joke.query.filter(Joke.is_published == db.true())
+        .order_by(Joke.created_at.desc()).limit(per_page).all()
+    )
+    body = jsonify(JokeListResponseSchema().dump(
+        {"page": 1, "per_page": per_page, "total": None, "items": items}
+    ))
+    db.session.expunge_all()  # a request would start from an empty identity map
+    return body
+
+
+def rows_page(per_page):
+    rows = (
+        Joke.query.filter(Joke.is_published == db.true())
+        .with_entities(*JOKE_ROWS.columns)
+        .order_by(Joke.created_at.desc()).limit(per_page).all()
+    )
+    return jsonify({"page": 1, "per_page": per_page, "total": None, "items": JOKE_ROWS.dump_many(rows)})
+
+
+def measure(fn, iterations):
+    samples = []
+    for _ in range(iterations):
+        elapsed, _ = timed(fn)
+        samples.append(elapsed)
+    return summarize(samples, sum(samples))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jokes", type=int, default=5000)
+    parser.add_argument("--per-page", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=300)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    app = build_app(scratch_database("list_serialization"), PASSWORD_HASH_WORKERS=0)
+    seed(app, args.jokes)
+    client = app.test_client()
+
+    with app.app_context():
+        assert orm_page(args.per_page).data == rows_page(args.per_page).data
+        results = {
+            "orm+marshmallow": measure(lambda: orm_page(args.per_page), args.iterations),
+            "rows+serializer": measure(lambda: rows_page(args.per_page), args.iterations),
+        }
+    results["GET /api/v1/jokes"] = measure(
+        lambda: client.get("/api/v1/jokes", query_string={"per_page": args.per_page, "include_total": "false"}),
+        args.iterations,
+    )
+    speedup = results["orm+marshmallow"]["mean_ms"] / results["rows+serializer"]["mean_ms"]
+
+    rows = [{"path": path, **stats} for path, stats in results.items()]
+    print_table(rows, ["path", "requests", "mean_ms", "p50_ms", "p95_ms", "p99_ms"])
+    print(f"speedup: {speedup:.2f}x")
+    write_results(args.json, "list_serialization", {**results, "speedup": round(speedup, 2)}, vars(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""End-to-end load test of the app under gunicorn, Google sign-in included.
+
+Copies a synthetic corpus (benchmarks.corpus) to a scratch file, starts a
+local OpenID provider standing in for Google (benchmarks.fake_oidc) and
+`gunicorn -c gunicorn.conf.py app:app` pointed at it, then sends requests
+at `--rate` per second for `--duration` seconds. Arrivals are open-loop
+(Poisson, not waiting for responses), and each request is drawn from
+`--mix`:
+
+    browse   GET /jokes (first page or filtered), /jokes/<id>, /jokes/random
+    search   GET /jokes?q=...
+    login    POST /login with a seeded user's password
+    oauth    the whole GET /auth/google -> provider -> /auth/google/callback flow
+    write    POST /jokes as a contributor
+
+Latency is measured from the scheduled send time, so client-side queueing
+when the server falls behind counts against it. Reports latency
+percentiles and error rates per endpoint.
+
+    python -m benchmarks.load_test --rate 40 --duration 30 --mix browse=70,search=10,login=5,oauth=5,write=10
+"""
+import argparse
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from flask_jwt_extended import create_access_token
+
+from jokes_tounsi.config import ProductionConfig
+from jokes_tounsi.extensions import db
+from jokes_tounsi.models import User, Joke
+
+from .common import (
+    build_app, scratch_database, start_gunicorn, stop_gunicorn, summarize, write_results, print_table
+)
+from .corpus import PASSWORD, REGIONS, SEARCH_TERMS, corpus_database, seed_corpus
+from .fake_oidc import CLIENT_ID, CLIENT_SECRET, FakeOIDCProvider
+
+SCENARIOS = ("browse", "search", "login", "oauth", "write")
+
+
+def parse_mix(text):
+    """'browse=70,login=5' -> {"browse": 70.0, "login": 5.0}"""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"unknown scenario {name!r}, expected one of {SCENARIOS}")
+        mix[name.strip()] = float(weight)
+    return mix
+
+
+def prepare_database(args):
+    """A scratch copy of the corpus (the run writes to it), with ids and tokens for the clients."""
+    overrides = {"SQLITE_PRAGMAS": ProductionConfig.SQLITE_PRAGMAS, "PASSWORD_HASH_WORKERS": 0}
+    users = max(1, args.jokes // 50)
+    corpus = corpus_database(args.jokes, args.seed)
+    if not (args.reuse and os.path.exists(corpus)):
+        corpus = scratch_database(f"corpus_{args.jokes}_{args.seed}")
+        seed_corpus(build_app(corpus, **overrides), args.jokes, users, args.seed)
+
+    path = scratch_database("load_test")
+    # The backup API also copies pages still in the corpus's WAL
+    with sqlite3.connect(corpus) as source, sqlite3.connect(path) as target:
+        source.backup(target)
+    app = build_app(path, **overrides)
+    with app.app_context():
+        joke_ids = db.session.scalars(db.select(Joke.id).where(Joke.is_published == db.true())).all()
+        contributors = db.session.execute(
+            db.select(User.id, User.role).where(User.role.in_(("contributor", "admin"))).limit(50)
+        ).all()
+        tokens = [
+            create_access_token(identity=str(user_id), additional_claims={"role": role})
+            for user_id, role in contributors
+        ]
+    return path, users, joke_ids, tokens
+
+
+class LoadClient:
+    """Issues one request per scenario; returns (endpoint label, ok)."""
+
+    def __init__(self, base_url, users, joke_ids, tokens, seed):
+        self.base_url = base_url
+        self.users = users
+        self.joke_ids = joke_ids
+        self.tokens = tokens
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._local = threading.local()
+
+    def _choice(self, fn, *args):
+        with self._rng_lock:
+            return fn(*args)
+
+    @property
+    def session(self):
+        # Keep-alive connections, one pool per client thread
+        if not hasattr(self._local, "session"):
+            self._local.session = requests.Session()
+        return self._local.session
+
+    def browse(self):
+        kind = self._choice(self._rng.choice, ("list", "list_filtered", "detail", "random"))
+        if kind == "list":
+            response = self.session.get(f"{self.base_url}/api/v1/jokes")
+            return "GET /jokes", response.status_code == 200
+        if kind == "list_filtered":
+            region = self._choice(self._rng.choice, list(REGIONS))
+            response = self.session.get(f"{self.base_url}/api/v1/jokes", params={"region": region})
+            return "GET /jokes?region", response.status_code == 200
+        if kind == "detail":
+            joke_id = self._choice(self._rng.choice, self.joke_ids)
+            response = self.session.get(f"{self.base_url}/api/v1/jokes/{joke_id}")
+            return "GET /jokes/<id>", response.status_code == 200
+        response = self.session.get(f"{self.base_url}/api/v1/jokes/random")
+        return "GET /jokes/random", response.status_code == 200
+
+    def search(self):
+        q = self._choice(self._rng.choice, SEARCH_TERMS)
+        response = self.session.get(f"{self.base_url}/api/v1/jokes", params={"q": q})
+        return "GET /jokes?q", response.status_code == 200
+
+    def login(self):
+        user = self._choice(self._rng.randrange, self.users)
+        response = self.session.post(
+            f"{self.base_url}/api/v1/login",
+            json={"email": f"user{user}@example.com", "password": PASSWORD},
+        )
+        return "POST /login", response.status_code == 200
+
+    def oauth(self):
+        # A fresh browser: the OAuth state lives in the session cookie
+        with requests.Session() as browser:
+            response = browser.get(f"{self.base_url}/api/v1/auth/google")
+        ok = response.status_code == 200 and "access_token" in response.json()
+        return "GET /auth/google (flow)", ok
+
+    def write(self):
+        token = self._choice(self._rng.choice, self.tokens)
+        region = self._choice(self._rng.choice, list(REGIONS))
+        response = self.session.post(
+            f"{self.base_url}/api/v1/jokes",
+            json={"text_tn": "Nokta jdida mel load test", "region": region, "is_published": True},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        return "POST /jokes", response.status_code == 201
+
+
+def run_load(client, mix, args):
+    rng = random.Random(args.seed)
+    names, weights = list(mix), list(mix.values())
+    latencies, errors = {}, {}
+    lock = threading.Lock()
+
+    def send(scenario, scheduled):
+        try:
+            endpoint, ok = getattr(client, scenario)()
+        except (requests.RequestException, ValueError):
+            endpoint, ok = scenario, False
+        elapsed = time.perf_counter() - scheduled
+        with lock:
+            latencies.setdefault(endpoint, []).append(elapsed)
+            errors[endpoint] = errors.get(endpoint, 0) + (not ok)
+
+    start = time.perf_counter()
+    next_send = start
+    with ThreadPoolExecutor(max_workers=args.clients) as pool:
+        while next_send < start + args.duration:
+            delay = next_send - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(send, rng.choices(names, weights)[0], next_send)
+            next_send += rng.expovariate(args.rate)
+    elapsed = time.perf_counter() - start
+
+    results = {
+        endpoint: {**summarize(samples, elapsed, errors[endpoint]),
+                   "error_rate": round(errors[endpoint] / len(samples), 4)}
+        for endpoint, samples in sorted(latencies.items())
+    }
+    everything = [sample for samples in latencies.values() for sample in samples]
+    total_errors = sum(errors.values())
+    results["all"] = {**summarize(everything, elapsed, total_errors),
+                      "error_rate": round(total_errors / len(everything), 4) if everything else None}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rate", type=float, default=40, help="target requests per second")
+    parser.add_argument("--duration", type=float, default=30, help="seconds of load")
+    parser.add_argument("--mix", type=parse_mix, default="browse=70,search=10,login=5,oauth=5,write=10")
+    parser.add_argument("--clients", type=int, default=64, help="maximum requests in flight")
+    parser.add_argument("--jokes", type=int, default=20000, help="corpus size")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--reuse", action="store_true", help="reuse an existing corpus file")
+    parser.add_argument("--worker-class", default="gthread", choices=["sync", "gthread", "gevent"])
+    parser.add_argument("--workers", type=int, help="override GUNICORN_WORKERS")
+    parser.add_argument("--port", type=int, default=5088)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    path, users, joke_ids, tokens = prepare_database(args)
+    provider = FakeOIDCProvider(identities=users).start()
+    server, base_url = start_gunicorn(
+        path, args.port, workers=args.workers,
+        GUNICORN_WORKER_CLASS=args.worker_class,
+        GOOGLE_SERVER_METADATA_URL=provider.metadata_url,
+        GOOGLE_CLIENT_ID=CLIENT_ID,
+        GOOGLE_CLIENT_SECRET=CLIENT_SECRET,
+    )
+    try:
+        client = LoadClient(base_url, users, joke_ids, tokens, args.seed)
+        results = run_load(client, args.mix, args)
+    finally:
+        stop_gunicorn(server)
+        provider.stop()
+
+    rows = [{"endpoint": endpoint, **stats} for endpoint, stats in results.items()]
+    print_table(rows, ["endpoint", "requests", "errors", "error_rate", "throughput_rps", "p50_ms", "p95_ms", "p99_ms"])
+    write_results(args.json, "load_test", results, {**vars(args), "mix": args.mix})
+
+
+if __name__ == "__main__":
+    main()
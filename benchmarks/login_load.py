@@ -0,0 +1,124 @@
+"""Login throughput and collateral latency under concurrent login load.
+
+Runs the same workload twice, hashing inline in the request threads and in
+the bounded hashing pool: `--login-threads` clients log in continuously
+while `--reader-threads` clients browse GET /api/v1/jokes, both through the
+Flask test client. Reports login throughput and the latency percentiles of
+the browsing requests.
+
+    python -m benchmarks.login_load --duration 10 --json login.json
+"""
+import argparse
+import logging
+import threading
+import time
+
+from jokes_tounsi.extensions import db
+from jokes_tounsi.models import User, Joke
+
+from .common import build_app, scratch_database, summarize, write_results, print_table
+
+
+def seed(app, users):
+    with app.app_context():
+        db.create_all()
+        for i in range(users):
+            user = User(email=f"user{i}@example.com", display_name=f"User {i}", role="contributor")
+            user.set_password("password123")
+            db.session.add(user)
+        db.session.flush()
+        db.session.add_all(
+            Joke(text_tn=f"Nokta {i}", is_published=True, author_id=1) for i in range(500)
+        )
+        db.session.commit()
+
+
+def run_mode(name, workers, args):
+    path = scratch_database(f"login_{name}")
+    app = build_app(
+        path,
+        PASSWORD_HASH_METHOD=args.method,
+        PASSWORD_HASH_WORKERS=workers,
+        PASSWORD_HASH_MAX_PENDING=args.login_threads,
+    )
+    seed(app, args.login_threads)
+
+    latencies = {"login": [], "list_jokes": []}
+    errors = {"login": 0, "list_jokes": 0}
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    def login_client(i):
+        client = app.test_client()
+        body = {"email": f"user{i}@example.com", "password": "password123"}
+        while not stop.is_set():
+            start = time.perf_counter()
+            response = client.post("/api/v1/login", json=body)
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies["login"].append(elapsed)
+                errors["login"] += response.status_code != 200
+
+    def reader_client():
+        client = app.test_client()
+        while not stop.is_set():
+            start = time.perf_counter()
+            response = client.get("/api/v1/jokes", query_string={"per_page": 20})
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies["list_jokes"].append(elapsed)
+                errors["list_jokes"] += response.status_code != 200
+
+    # Warm the hashing pool so process start-up is not measured
+    with app.app_context():
+        app.extensions["password_hasher"].verify(
+            User.query.first().password_hash, "password123"
+        )
+
+    threads = [threading.Thread(target=login_client, args=(i,)) for i in range(args.login_threads)]
+    threads += [threading.Thread(target=reader_client) for _ in range(args.reader_threads)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(args.duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    with app.app_context():
+        app.extensions["password_hasher"].shutdown()
+
+    return {
+        endpoint: summarize(samples, elapsed, errors[endpoint])
+        for endpoint, samples in latencies.items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--duration", type=float, default=10, help="seconds per mode")
+    parser.add_argument("--login-threads", type=int, default=8)
+    parser.add_argument("--reader-threads", type=int, default=4)
+    parser.add_argument("--pool-workers", type=int, default=2)
+    parser.add_argument("--method", default="scrypt:32768:8:1", help="werkzeug hash method")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    results = {
+        "inline": run_mode("inline", 0, args),
+        "pool": run_mode("pool", args.pool_workers, args),
+    }
+
+    rows = [
+        {"mode": mode, "endpoint": endpoint, **stats}
+        for mode, endpoints in results.items()
+        for endpoint, stats in endpoints.items()
+    ]
+    print_table(rows, ["mode", "endpoint", "requests", "errors", "throughput_rps", "p50_ms", "p95_ms", "p99_ms"])
+    write_results(args.json, "login_load", results, vars(args))
+
+
+if __name__ == "__main__":
+    main()
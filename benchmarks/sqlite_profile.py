@@ -0,0 +1,117 @@
+"""Mixed read/write throughput with and without the production SQLite profile.
+
+Starts `--processes` worker processes (like gunicorn workers) sharing one
+SQLite file. Each one sends a mix of GET /api/v1/jokes and POST
+/api/v1/jokes through its own Flask test client for `--duration` seconds.
+The run is repeated with default pragmas, with
+ProductionConfig.SQLITE_PRAGMAS, and with those pragmas plus the
+read-only engine serving the GETs.
+
+    python -m benchmarks.sqlite_profile --processes 4 --json sqlite.json
+"""
+import argparse
+import logging
+import multiprocessing
+import random
+import time
+
+from flask_jwt_extended import create_access_token
+
+from jokes_tounsi.config import ProductionConfig
+from jokes_tounsi.extensions import db
+from jokes_tounsi.models import User, Joke
+
+from .common import build_app, scratch_database, summarize, write_results, print_table
+
+
+def seed(path, pragmas, jokes):
+    app = build_app(path, SQLITE_PRAGMAS=pragmas, PASSWORD_HASH_WORKERS=0)
+    with app.app_context():
+        db.create_all()
+        user = User(email="writer@example.com", display_name="Writer", role="contributor")
+        db.session.add(user)
+        db.session.flush()
+        db.session.execute(db.insert(Joke), [
+            {"text_tn": f"Nokta {i}", "region": random.choice(["Tunis", "Sfax", "Sousse"]),
+             "is_published": True, "author_id": user.id}
+            for i in range(jokes)
+        ])
+        db.session.commit()
+        return create_access_token(identity=str(user.id), additional_claims={"role": "contributor"})
+
+
+def worker(job):
+    path, pragmas, readonly, token, duration, write_ratio, seed_value = job
+    logging.disable(logging.INFO)
+    random.seed(seed_value)
+    app = build_app(path, SQLITE_PRAGMAS=pragmas, SQLITE_READONLY_ENGINE=readonly, PASSWORD_HASH_WORKERS=0)
+    client = app.test_client()
+    headers = {"Authorization": f"Bearer {token}"}
+
+    latencies = {"read": [], "write": []}
+    errors = {"read": 0, "write": 0}
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        kind = "write" if random.random() < write_ratio else "read"
+        start = time.perf_counter()
+        if kind == "write":
+            response = client.post("/api/v1/jokes", json={"text_tn": "Jdida", "is_published": True}, headers=headers)
+            ok = response.status_code == 201
+        else:
+            response = client.get("/api/v1/jokes", query_string={"region": random.choice(["Tunis", "Sfax"])})
+            ok = response.status_code == 200
+        latencies[kind].append(time.perf_counter() - start)
+        errors[kind] += not ok
+    return latencies, errors
+
+
+def run_profile(name, pragmas, args, readonly=False):
+    path = scratch_database(f"sqlite_{name}")
+    token = seed(path, pragmas, args.jokes)
+    jobs = [
+        (path, pragmas, readonly, token, args.duration, args.write_ratio, i)
+        for i in range(args.processes)
+    ]
+
+    start = time.perf_counter()
+    with multiprocessing.get_context("fork").Pool(args.processes) as pool:
+        outcomes = pool.map(worker, jobs)
+    elapsed = time.perf_counter() - start
+
+    merged = {kind: ([], 0) for kind in ("read", "write")}
+    for latencies, errors in outcomes:
+        for kind in merged:
+            samples, count = merged[kind]
+            merged[kind] = (samples + latencies[kind], count + errors[kind])
+    return {kind: summarize(samples, elapsed, count) for kind, (samples, count) in merged.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=10, help="seconds per profile")
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    parser.add_argument("--jokes", type=int, default=20000, help="rows seeded before the run")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    results = {
+        "default": run_profile("default", {}, args),
+        "production": run_profile("production", ProductionConfig.SQLITE_PRAGMAS, args),
+        "production+readonly": run_profile(
+            "production_readonly", ProductionConfig.SQLITE_PRAGMAS, args, readonly=True
+        ),
+    }
+
+    rows = [
+        {"profile": profile, "kind": kind, **stats}
+        for profile, kinds in results.items()
+        for kind, stats in kinds.items()
+    ]
+    print_table(rows, ["profile", "kind", "requests", "errors", "throughput_rps", "p50_ms", "p95_ms", "p99_ms"])
+    write_results(args.json, "sqlite_profile", results, vars(args))
+
+
+if __name__ == "__main__":
+    main()
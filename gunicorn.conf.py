@@ -0,0 +1,78 @@
+"""Gunicorn settings for jokesTOUNSI.
+
+    gunicorn -c gunicorn.conf.py app:app
+
+GUNICORN_WORKER_CLASS selects the concurrency model:
+
+- gthread (default): each worker process serves GUNICORN_THREADS requests
+  at once. Sessions are scoped per app context and the per-process caches
+  are locked, so threads share a worker safely. Good general default: a
+  slow OAuth callback or password check only holds one thread.
+- gevent: each worker serves up to GUNICORN_WORKER_CONNECTIONS greenlets.
+  Suited to many slow outbound calls (OAuth), but sqlite3 calls do not
+  yield, so a writer waiting on busy_timeout stalls its whole worker.
+  gevent is pinned in requirements.txt, so the image can switch with
+  the variable alone.
+- sync: one request per worker process.
+
+Worker counts default to values derived from the CPUs available to the
+process; every GUNICORN_* variable below overrides them.
+"""
+import os
+import shutil
+import tempfile
+
+
+def _available_cpus():
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+cpus = _available_cpus()
+
+bind = os.getenv("GUNICORN_BIND", f"0.0.0.0:{os.getenv('PORT', '5000')}")
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+
+if worker_class == "sync":
+    default_workers = 2 * cpus + 1
+else:
+    # Threads/greenlets provide the concurrency; one process per core
+    # (at least two so a crashed or recycling worker is not an outage)
+    default_workers = max(2, cpus)
+
+workers = int(os.getenv("GUNICORN_WORKERS", default_workers))
+threads = int(os.getenv("GUNICORN_THREADS", "4")) if worker_class == "gthread" else 1
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", "256"))
+
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+
+# The app is imported in each worker, after gevent has patched the stdlib
+# and without engines, pools or threads inherited from the master.
+preload_app = False
+
+# Workers write their request metrics here and /metrics sums them up
+_metrics_dir = os.environ.setdefault(
+    "METRICS_DIR", os.path.join(tempfile.gettempdir(), "jokes_tounsi_metrics")
+)
+
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-") or None  # "" disables it
+errorlog = "-"
+
+
+def on_starting(server):
+    """Start the metrics from zero: drop the files of a previous master."""
+    shutil.rmtree(_metrics_dir, ignore_errors=True)
+    os.makedirs(_metrics_dir, exist_ok=True)
+
+
+def worker_exit(server, worker):
+    """Stop the per-worker password hashing pool and WAL checkpoint thread."""
+    app = getattr(worker, "wsgi", None)
+    extensions = getattr(app, "extensions", {})
+    if "password_hasher" in extensions:
+        extensions["password_hasher"].shutdown()
+    if "wal_checkpointer" in extensions:
+        extensions["wal_checkpointer"].stop()
@@ -1,13 +1,23 @@
-import os
 from flask import Flask, jsonify
 from werkzeug.exceptions import HTTPException
 
 from .config import DevelopmentConfig
-from .extensions import db, api, jwt, oauth, migrate
+from .extensions import db, api, jwt, migrate
 from .resources.meta import blp as MetaBlueprint
 from .resources.jokes import blp as JokesBlueprint
 from .resources.auth import blp as AuthBlueprint
 from .utils.logging_config import configure_logging
+from .utils.joke_pool import PublishedIdPool
+from .utils.user_cache import UserProfileCache
+from .security.passwords import PasswordHasher
+from .utils.sqlite import configure_sqlite
+from .utils.compression import ResponseCompressor
+from .utils.metrics import init_metrics
+from .utils.query_budget import init_query_budgets
+from .utils.openapi import init_openapi_spec
+from .utils.token_blocklist import init_token_blocklist
+from .routing import READONLY_BIND, configure_read_routing
+from .commands import jokes_cli
 
 def create_app(config_class=DevelopmentConfig):
     configure_logging()  
@@ -22,24 +32,50 @@ def create_app(config_class=DevelopmentConfig):
         raise RuntimeError("Failed to set secret key! Ensure SECRET_KEY or JWT_SECRET_KEY is set in .env")
 
 
+    configure_read_routing(app)
     db.init_app(app)
+    # The read-only engine mirrors the primary: keep it out of create_all/drop_all
+    db.metadatas.pop(READONLY_BIND, None)
+    configure_sqlite(app)
     migrate.init_app(app, db)
     api.init_app(app)
     jwt.init_app(app)
-    oauth.init_app(app)
-
-    oauth.register(
-        name="google",
-        client_id=os.getenv("GOOGLE_CLIENT_ID"),
-        client_secret=os.getenv("GOOGLE_CLIENT_SECRET"),
-        server_metadata_url="https://accounts.google.com/.well-known/openid-configuration",
-        client_kwargs={"scope": "openid email profile"},
+    init_token_blocklist(app, jwt)
+
+    # Per-process caches
+    app.extensions["published_ids"] = PublishedIdPool()
+    app.extensions["password_hasher"] = PasswordHasher(
+        method=app.config["PASSWORD_HASH_METHOD"],
+        salt_length=app.config["PASSWORD_HASH_SALT_LENGTH"],
+        workers=app.config["PASSWORD_HASH_WORKERS"],
+        max_pending=app.config["PASSWORD_HASH_MAX_PENDING"],
+        timeout=app.config["PASSWORD_HASH_TIMEOUT"]
+    )
+    app.extensions["user_profiles"] = UserProfileCache(
+        ttl=app.config["USER_CACHE_TTL"],
+        max_entries=app.config["USER_CACHE_MAX_ENTRIES"]
     )
 
+    # Registered before compression so its after_request runs last and
+    # the measured time includes compressing the body
+    init_metrics(app)
+    init_query_budgets(app)
+
+    if app.config["COMPRESS_ENABLED"]:
+        app.extensions["compressor"] = ResponseCompressor(
+            min_size=app.config["COMPRESS_MIN_SIZE"],
+            level=app.config["COMPRESS_LEVEL"],
+            mimetypes=app.config["COMPRESS_MIMETYPES"],
+            cache_max_bytes=app.config["COMPRESS_CACHE_MAX_BYTES"]
+        )
+        app.extensions["compressor"].init_app(app)
 
     api.register_blueprint(MetaBlueprint, url_prefix="/api/v1")
     api.register_blueprint(JokesBlueprint, url_prefix="/api/v1")
     api.register_blueprint(AuthBlueprint, url_prefix="/api/v1")
+    init_openapi_spec(app, api)
+
+    app.cli.add_command(jokes_cli)
 
     @app.errorhandler(HTTPException)
     def handle_http_exception(e):
@@ -0,0 +1,47 @@
+import click
+from flask.cli import AppGroup
+
+from .extensions import db
+from .models import rebuild_search_index, rebuild_facet_counts, rebuild_author_stats
+from .utils.token_blocklist import prune_revoked_tokens
+
+jokes_cli = AppGroup("jokes", help="Maintenance commands for the jokes tables.")
+
+
+@jokes_cli.command("rebuild-search")
+def rebuild_search():
+    """Rebuild the full-text search index from the jokes table."""
+    rebuild_search_index()
+    click.echo("Search index rebuilt")
+
+
+@jokes_cli.command("rebuild-facets")
+def rebuild_facets():
+    """Recompute the facet counts from the jokes table."""
+    rebuild_facet_counts()
+    click.echo("Facet counts rebuilt")
+
+
+@jokes_cli.command("rebuild-author-stats")
+def rebuild_author_stats_command():
+    """Recompute the per-author joke counts from the jokes table."""
+    rebuild_author_stats()
+    click.echo("Author statistics rebuilt")
+
+
+@jokes_cli.command("checkpoint")
+@click.option("--mode", default="TRUNCATE", show_default=True,
+              type=click.Choice(["PASSIVE", "FULL", "RESTART", "TRUNCATE"], case_sensitive=False))
+def checkpoint(mode):
+    """Checkpoint the SQLite write-ahead log into the database file."""
+    with db.engine.connect() as conn:
+        busy, log_pages, checkpointed = conn.exec_driver_sql(
+            f"PRAGMA wal_checkpoint({mode.upper()})"
+        ).first()
+    click.echo(f"Checkpointed {checkpointed}/{log_pages} WAL pages (busy={busy})")
+
+
+@jokes_cli.command("prune-revoked-tokens")
+def prune_revoked():
+    """Delete the revocations of access tokens that have expired."""
+    click.echo(f"Pruned {prune_revoked_tokens()} expired token revocations")
@@ -12,10 +12,48 @@ class Config:
     SQLALCHEMY_RECORD_QUERIES = True
     SQLALCHEMY_ECHO = True  # Print SQL queries in dev
     
+    # Read-only engine for the SELECTs of GET/HEAD requests (a replica URL).
+    # With SQLITE_READONLY_ENGINE, a SQLite primary file is reopened with
+    # mode=ro when no URL is given.
+    SQLALCHEMY_READONLY_DATABASE_URI = os.getenv("READONLY_DATABASE_URL")
+    SQLITE_READONLY_ENGINE = False
+    
+    # SQLite tuning: PRAGMAs run on every new connection, and the WAL
+    # checkpoint interval in seconds (0 = leave it to SQLite)
+    SQLITE_PRAGMAS = {}
+    SQLITE_CHECKPOINT_INTERVAL = 0
+    SQLITE_CHECKPOINT_MODE = "PASSIVE"
+    
     # JWT
     SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-change-me")
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "dev-secret-change-me")
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
+    # Revoked tokens (logout) are checked in memory; each worker fetches
+    # the other workers' revocations every interval (0 = never, tests)
+    TOKEN_BLOCKLIST_SYNC_INTERVAL = float(os.getenv("TOKEN_BLOCKLIST_SYNC_INTERVAL", "5"))  # seconds
+    
+    # Password hashing (werkzeug method string with explicit parameters).
+    # Changing it rehashes each password at the user's next login.
+    PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+    PASSWORD_HASH_SALT_LENGTH = 16
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))  # 0 = inline
+    PASSWORD_HASH_MAX_PENDING = 32  # Waiting hash calls per worker before 503
+    PASSWORD_HASH_TIMEOUT = 10  # seconds
+    
+    # Per-process cache of user profiles (roles are read from JWT claims).
+    # A role change refreshes the writing worker's entry; other workers
+    # serve the old profile on /users/me for up to USER_CACHE_TTL.
+    USER_CACHE_TTL = 60  # seconds
+    USER_CACHE_MAX_ENTRIES = 1024
+    
+    # Google sign-in. The discovery URL can point at another OpenID
+    # provider, e.g. the local stand-in of the load tests.
+    GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
+    GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET")
+    GOOGLE_SERVER_METADATA_URL = os.getenv(
+        "GOOGLE_SERVER_METADATA_URL",
+        "https://accounts.google.com/.well-known/openid-configuration"
+    )
     
     # Session / Cookies
     SESSION_COOKIE_SAMESITE = 'Lax'
@@ -29,11 +67,40 @@ class Config:
     OPENAPI_REDOC_PATH = "/redoc"
     OPENAPI_SWAGGER_UI_PATH = "/docs"
     OPENAPI_SWAGGER_UI_URL = "https://cdn.jsdelivr.net/npm/swagger-ui-dist/"
+    # Spec written at build time by `flask openapi write` (unset or
+    # missing: generated on first request), cached by clients for a day
+    OPENAPI_SPEC_FILE = os.getenv("OPENAPI_SPEC_FILE")
+    OPENAPI_CACHE_MAX_AGE = 86400  # seconds
+    
+    # Request metrics served at /metrics. Gunicorn workers share them
+    # through per-process files in METRICS_DIR (unset: this process only).
+    METRICS_DIR = os.getenv("METRICS_DIR")
+    METRICS_FLUSH_INTERVAL = 1.0  # seconds
+    SERVER_TIMING = os.getenv("SERVER_TIMING", "false").lower() == "true"  # db/serialize/total header
+    
+    # SQL budgets of the views (see utils/query_budget.py): a route without
+    # @query_budget gets QUERY_BUDGET_DEFAULT (None = unlimited). Violations
+    # are logged, or raised with QUERY_BUDGET_RAISE.
+    QUERY_BUDGET_DEFAULT = None
+    QUERY_BUDGET_RAISE = False
+    
+    # Response compression (gzip/deflate, negotiated with Accept-Encoding).
+    # Compressed bodies are cached per ETag up to COMPRESS_CACHE_MAX_BYTES.
+    COMPRESS_ENABLED = True
+    COMPRESS_MIN_SIZE = 1024  # bytes
+    COMPRESS_LEVEL = int(os.getenv("COMPRESS_LEVEL", "6"))  # 1 (fast) - 9 (small)
+    COMPRESS_MIMETYPES = ("application/json", "application/x-ndjson", "text/csv", "text/html")
+    COMPRESS_CACHE_MAX_BYTES = 32 * 1024 * 1024
+    
+    # Bulk import
+    JOKE_IMPORT_BATCH_SIZE = 1000  # Rows per INSERT batch / transaction
+    JOKE_IMPORT_MAX_ERRORS = 1000  # Line errors kept in the report
 
 
 class DevelopmentConfig(Config):
     """Development configuration"""
     DEBUG = True
+    SERVER_TIMING = True
     SQLALCHEMY_DATABASE_URI = os.getenv(
         "DATABASE_URL",
         "sqlite:///jokes_dev.db"
@@ -44,7 +111,14 @@ class TestingConfig(Config):
     """Testing configuration"""
     TESTING = True
     SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
+    SQLALCHEMY_READONLY_DATABASE_URI = None
+    METRICS_DIR = None
     JWT_SECRET_KEY = "test-secret-key"
+    QUERY_BUDGET_RAISE = True
+    TOKEN_BLOCKLIST_SYNC_INTERVAL = 0
+    # Cheap inline hashing keeps the suite fast
+    PASSWORD_HASH_METHOD = "pbkdf2:sha256:1000"
+    PASSWORD_HASH_WORKERS = 0
 
 
 class ProductionConfig(Config):
@@ -52,6 +126,20 @@ class ProductionConfig(Config):
     DEBUG = False
     SQLALCHEMY_ECHO = False
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL")
+    SQLITE_READONLY_ENGINE = True
+    
+    # Several gunicorn workers share one SQLite file: WAL lets readers run
+    # alongside the writer, and busy_timeout makes writers wait for the
+    # lock instead of failing with "database is locked".
+    SQLITE_PRAGMAS = {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",  # Durable at checkpoints; safe with WAL
+        "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT", "5000")),  # ms
+        "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),  # bytes
+        "cache_size": -int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536")),  # negative = KiB
+        "temp_store": "MEMORY",
+    }
+    SQLITE_CHECKPOINT_INTERVAL = int(os.getenv("SQLITE_CHECKPOINT_INTERVAL", "300"))
 
 
 # Choose config based on environment
@@ -1,11 +1,11 @@
 from flask_sqlalchemy import SQLAlchemy
-from flask_smorest import Api
 from flask_jwt_extended import JWTManager
-from authlib.integrations.flask_client import OAuth
 from flask_migrate import Migrate
 
-db = SQLAlchemy()
-api = Api()
+from .routing import RoutingSession
+from .openapi import LazyDocApi
+
+db = SQLAlchemy(session_options={"class_": RoutingSession})
+api = LazyDocApi()
 jwt = JWTManager()
-oauth = OAuth()
 migrate = Migrate()
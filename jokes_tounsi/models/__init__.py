@@ -1,4 +1,24 @@
 from .user import User
 from .joke import Joke
+from .search import jokes_fts, apply_search, rebuild_search_index
+from .data_version import DataVersion, PUBLISHED_JOKES
+from .facet import FACET_COLUMNS, JokeFacetCount, search_facet_counts, rebuild_facet_counts
+from .revoked_token import RevokedToken
+from .author_stats import AuthorJokeCount, rebuild_author_stats
 
-__all__ = ["User", "Joke"]
\ No newline at end of file
+__all__ = [
+    "User",
+    "Joke",
+    "jokes_fts",
+    "apply_search",
+    "rebuild_search_index",
+    "DataVersion",
+    "PUBLISHED_JOKES",
+    "FACET_COLUMNS",
+    "JokeFacetCount",
+    "search_facet_counts",
+    "rebuild_facet_counts",
+    "RevokedToken",
+    "AuthorJokeCount",
+    "rebuild_author_stats",
+]
\ No newline at end of file
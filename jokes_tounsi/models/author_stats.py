@@ -0,0 +1,118 @@
+from sqlalchemy import DDL, event
+
+from ..extensions import db
+from .joke import Joke
+
+
+class AuthorJokeCount(db.Model):
+    """Published and draft jokes of one author in one region.
+
+    Maintained by triggers on `jokes`, in the transaction of the write
+    itself, so an author's statistics are a read of a few rows instead of
+    COUNT queries over `User.jokes`. NULL regions are stored as ''.
+    """
+
+    __tablename__ = "author_joke_counts"
+
+    author_id = db.Column(db.Integer, db.ForeignKey("users.id"), primary_key=True)
+    region = db.Column(db.String(50), primary_key=True, default="")
+    published_count = db.Column(db.Integer, nullable=False, default=0)
+    draft_count = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<AuthorJokeCount {self.author_id}/{self.region}>"
+
+    @classmethod
+    def stats(cls, author_id):
+        """Totals and per-region counts of an author's jokes, regions by size."""
+        rows = db.session.execute(
+            db.select(cls.region, cls.published_count, cls.draft_count)
+            .where(cls.author_id == author_id)
+        ).all()
+
+        regions = sorted(
+            (
+                {
+                    "region": row.region or None,
+                    "total": row.published_count + row.draft_count,
+                    "published": row.published_count,
+                    "drafts": row.draft_count,
+                }
+                for row in rows
+            ),
+            key=lambda item: (-item["total"], item["region"] or "")
+        )
+        published = sum(item["published"] for item in regions)
+        drafts = sum(item["drafts"] for item in regions)
+        return {
+            "total": published + drafts,
+            "published": published,
+            "drafts": drafts,
+            "regions": regions,
+        }
+
+
+def _counts(alias):
+    """(published, drafts) of one row: 1 or 0 each, a NULL is_published is a draft."""
+    published = f"CASE WHEN {alias}.is_published THEN 1 ELSE 0 END"
+    return published, f"1 - {published}"
+
+
+def _key_match(alias):
+    return f"author_id = {alias}.author_id AND region = coalesce({alias}.region, '')"
+
+
+def _increment(alias):
+    published, drafts = _counts(alias)
+    return f"""
+        INSERT INTO author_joke_counts (author_id, region, published_count, draft_count)
+        VALUES ({alias}.author_id, coalesce({alias}.region, ''), {published}, {drafts})
+        ON CONFLICT (author_id, region) DO UPDATE SET
+            published_count = published_count + excluded.published_count,
+            draft_count = draft_count + excluded.draft_count;
+    """
+
+
+def _decrement(alias):
+    published, drafts = _counts(alias)
+    return f"""
+        UPDATE author_joke_counts SET
+            published_count = published_count - ({published}),
+            draft_count = draft_count - ({drafts})
+        WHERE {_key_match(alias)};
+        DELETE FROM author_joke_counts
+        WHERE {_key_match(alias)} AND published_count <= 0 AND draft_count <= 0;
+    """
+
+
+AUTHOR_STATS_DDL = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS jokes_author_stats_ai AFTER INSERT ON jokes
+    BEGIN {_increment('new')} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS jokes_author_stats_ad AFTER DELETE ON jokes
+    BEGIN {_decrement('old')} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS jokes_author_stats_au AFTER UPDATE OF author_id, region, is_published ON jokes
+    BEGIN {_decrement('old')} {_increment('new')} END
+    """,
+]
+
+for _statement in AUTHOR_STATS_DDL:
+    event.listen(Joke.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+
+
+def rebuild_author_stats():
+    """Recompute every author's counts from the `jokes` table in one pass."""
+    db.session.execute(db.delete(AuthorJokeCount))
+    db.session.execute(db.text("""
+        INSERT INTO author_joke_counts (author_id, region, published_count, draft_count)
+        SELECT author_id, coalesce(region, ''),
+               sum(CASE WHEN is_published THEN 1 ELSE 0 END),
+               sum(CASE WHEN is_published THEN 0 ELSE 1 END)
+        FROM jokes
+        GROUP BY author_id, coalesce(region, '')
+    """))
+    db.session.commit()
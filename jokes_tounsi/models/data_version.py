@@ -0,0 +1,97 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import DDL, event
+
+from ..extensions import db
+from .joke import Joke
+
+
+class DataVersion(db.Model):
+    """Change counter per table, bumped by triggers on every write.
+
+    Readers compare versions instead of re-querying the data, which keeps
+    HTTP validators and per-process caches consistent across workers.
+    """
+
+    __tablename__ = "data_versions"
+
+    name = db.Column(db.String(50), primary_key=True)  # e.g. "jokes"
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(
+        db.DateTime,
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc)
+    )
+
+    def __repr__(self):
+        return f"<DataVersion {self.name}={self.version}>"
+
+    @classmethod
+    def tracked(cls):
+        """Whether versions are maintained: the triggers exist on SQLite only."""
+        return db.engine.dialect.name == "sqlite"
+
+    @classmethod
+    def current(cls, name):
+        """Return (version, updated_at) for a table, (0, None) if never written.
+
+        Returns (None, None) when versions are not tracked (not SQLite):
+        callers must then skip their validators and caches.
+        """
+        if not cls.tracked():
+            return None, None
+        row = db.session.execute(
+            db.select(cls.version, cls.updated_at).where(cls.name == name)
+        ).first()
+        if row is None:
+            return 0, None
+        return row.version, row.updated_at
+
+
+# Version of the published ids per (region, age_group), the filters of
+# /jokes/random: bumped only when that set changes, not on every write
+PUBLISHED_JOKES = "published_jokes"
+PUBLISHED_KEY_COLUMNS = ("id", "is_published", "region", "age_group")
+
+
+def _bump(name):
+    return f"""
+        INSERT INTO data_versions (name, version, updated_at)
+        VALUES ('{name}', 1, strftime('%Y-%m-%d %H:%M:%f', 'now'))
+        ON CONFLICT (name) DO UPDATE SET
+            version = version + 1,
+            updated_at = excluded.updated_at;
+    """
+
+
+def version_trigger_ddl(table):
+    """CREATE TRIGGER statements bumping `data_versions` on writes to `table`."""
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {table}_version_{suffix} AFTER {op} ON {table} "
+        f"BEGIN {_bump(table)} END"
+        for suffix, op in (("ai", "INSERT"), ("au", "UPDATE"), ("ad", "DELETE"))
+    ]
+
+
+def published_version_trigger_ddl():
+    """CREATE TRIGGER statements bumping PUBLISHED_JOKES when published ids or their keys change."""
+    changed = " OR ".join(f"old.{column} IS NOT new.{column}" for column in PUBLISHED_KEY_COLUMNS)
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS jokes_published_version_ai AFTER INSERT ON jokes "
+        f"WHEN new.is_published BEGIN {_bump(PUBLISHED_JOKES)} END",
+        f"CREATE TRIGGER IF NOT EXISTS jokes_published_version_ad AFTER DELETE ON jokes "
+        f"WHEN old.is_published BEGIN {_bump(PUBLISHED_JOKES)} END",
+        f"CREATE TRIGGER IF NOT EXISTS jokes_published_version_au "
+        f"AFTER UPDATE OF {', '.join(PUBLISHED_KEY_COLUMNS)} ON jokes "
+        f"WHEN (old.is_published OR new.is_published) AND ({changed}) "
+        f"BEGIN {_bump(PUBLISHED_JOKES)} END",
+    ]
+
+
+for _statement in version_trigger_ddl(Joke.__tablename__) + published_version_trigger_ddl():
+    # DDL() applies %-formatting, hence the escaping of strftime()
+    event.listen(
+        Joke.__table__,
+        "after_create",
+        DDL(_statement.replace("%", "%%")).execute_if(dialect="sqlite")
+    )
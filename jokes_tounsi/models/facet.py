@@ -0,0 +1,149 @@
+from sqlalchemy import DDL, event
+
+from ..extensions import db
+from .joke import Joke
+from .search import apply_search
+
+
+# Classification columns counted per value
+FACET_COLUMNS = ("era", "region", "age_group", "acceptability", "delivery_type", "tone", "rhythm")
+
+
+class JokeFacetCount(db.Model):
+    """Number of published jokes per combination of classification values.
+
+    Maintained by triggers on `jokes`, so facet counts for any filter set
+    are a sum over a few rows instead of GROUP BY scans of the jokes table.
+    NULL classifications are stored as '' so they can be part of the key.
+    """
+
+    __tablename__ = "joke_facet_counts"
+
+    era = db.Column(db.String(50), primary_key=True, default="")
+    region = db.Column(db.String(50), primary_key=True, default="")
+    age_group = db.Column(db.String(50), primary_key=True, default="")
+    acceptability = db.Column(db.String(50), primary_key=True, default="")
+    delivery_type = db.Column(db.String(50), primary_key=True, default="")
+    tone = db.Column(db.String(50), primary_key=True, default="")
+    rhythm = db.Column(db.String(50), primary_key=True, default="")
+
+    joke_count = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<JokeFacetCount {self.joke_count}>"
+
+    @classmethod
+    def counts(cls, filters=None):
+        """Per-value counts of every facet among published jokes matching `filters`.
+
+        `filters` maps facet columns to required values. Returns
+        {facet: [{"value": ..., "count": ...}, ...]}, most frequent first.
+        """
+        conditions = [getattr(cls, column) == value for column, value in (filters or {}).items()]
+        # One GROUP BY per facet: rows per distinct value, not per combination
+        query = db.union_all(*(
+            db.select(
+                db.literal(column).label("facet"),
+                getattr(cls, column).label("value"),
+                db.func.sum(cls.joke_count).label("count")
+            )
+            .where(*conditions)
+            .group_by(getattr(cls, column))
+            for column in FACET_COLUMNS
+        ))
+        return _facet_totals(db.session.execute(query))
+
+
+def search_facet_counts(q, filters=None):
+    """Facet counts (as JokeFacetCount.counts) of published jokes matching `q` too.
+
+    Search matches are not pre-aggregated: this is one GROUP BY over the
+    full-text matches, so it costs about as much as the search itself.
+    """
+    columns = [getattr(Joke, column) for column in FACET_COLUMNS]
+    query = Joke.query.with_entities(*columns, db.func.count()).filter(Joke.is_published == db.true())
+    for column, value in (filters or {}).items():
+        query = query.filter(getattr(Joke, column) == value)
+    # Relevance order means nothing once grouped
+    query = apply_search(query, q).order_by(None).group_by(*columns)
+    return _facet_totals(
+        (column, value, row[-1])
+        for row in query
+        for column, value in zip(FACET_COLUMNS, row[:-1])
+    )
+
+
+def _facet_totals(counts):
+    """Per-facet value lists from (facet, value, count) rows, most frequent first."""
+    totals = {column: {} for column in FACET_COLUMNS}
+    for column, value, count in counts:
+        value = value or None
+        totals[column][value] = totals[column].get(value, 0) + count
+
+    return {
+        column: [
+            {"value": value, "count": count}
+            for value, count in sorted(
+                values.items(), key=lambda item: (-item[1], item[0] or "")
+            )
+            if count > 0
+        ]
+        for column, values in totals.items()
+    }
+
+
+def _key_values(alias):
+    return ", ".join(f"coalesce({alias}.{column}, '')" for column in FACET_COLUMNS)
+
+
+def _key_match(alias):
+    return " AND ".join(f"{column} = coalesce({alias}.{column}, '')" for column in FACET_COLUMNS)
+
+
+_COLUMNS = ", ".join(FACET_COLUMNS)
+
+_INCREMENT = f"""
+    INSERT INTO joke_facet_counts ({_COLUMNS}, joke_count)
+    VALUES ({_key_values('new')}, 1)
+    ON CONFLICT ({_COLUMNS}) DO UPDATE SET joke_count = joke_count + 1;
+"""
+
+_DECREMENT = f"""
+    UPDATE joke_facet_counts SET joke_count = joke_count - 1 WHERE {_key_match('old')};
+    DELETE FROM joke_facet_counts WHERE {_key_match('old')} AND joke_count <= 0;
+"""
+
+FACET_DDL = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS jokes_facets_ai AFTER INSERT ON jokes
+    WHEN new.is_published BEGIN {_INCREMENT} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS jokes_facets_ad AFTER DELETE ON jokes
+    WHEN old.is_published BEGIN {_DECREMENT} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS jokes_facets_au_old AFTER UPDATE OF is_published, {_COLUMNS} ON jokes
+    WHEN old.is_published BEGIN {_DECREMENT} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS jokes_facets_au_new AFTER UPDATE OF is_published, {_COLUMNS} ON jokes
+    WHEN new.is_published BEGIN {_INCREMENT} END
+    """,
+]
+
+for _statement in FACET_DDL:
+    event.listen(Joke.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+
+
+def rebuild_facet_counts():
+    """Recompute the facet counts from the `jokes` table in one pass."""
+    db.session.execute(db.delete(JokeFacetCount))
+    db.session.execute(db.text(f"""
+        INSERT INTO joke_facet_counts ({_COLUMNS}, joke_count)
+        SELECT {_key_values('jokes')}, count(*)
+        FROM jokes
+        WHERE is_published = 1
+        GROUP BY {_key_values('jokes')}
+    """))
+    db.session.commit()
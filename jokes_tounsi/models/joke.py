@@ -6,6 +6,22 @@ class Joke(db.Model):
     """Joke model storing Tunisian jokes with metadata."""
     
     __tablename__ = "jokes"
+    __table_args__ = (
+        # Partial indexes for the listing access paths: published jokes,
+        # optionally filtered by one classification, newest first.
+        db.Index("ix_jokes_published_created_at", "created_at",
+                 sqlite_where=db.text("is_published = 1")),
+        db.Index("ix_jokes_published_era", "era", "created_at",
+                 sqlite_where=db.text("is_published = 1")),
+        db.Index("ix_jokes_published_region", "region", "created_at",
+                 sqlite_where=db.text("is_published = 1")),
+        db.Index("ix_jokes_published_age_group", "age_group", "created_at",
+                 sqlite_where=db.text("is_published = 1")),
+        db.Index("ix_jokes_published_acceptability", "acceptability", "created_at",
+                 sqlite_where=db.text("is_published = 1")),
+        db.Index("ix_jokes_published_delivery_type", "delivery_type", "created_at",
+                 sqlite_where=db.text("is_published = 1")),
+    )
     
     # Primary key
     id = db.Column(db.Integer, primary_key=True)
@@ -27,7 +43,7 @@ class Joke(db.Model):
     rhythm = db.Column(db.String(50), nullable=True) # e.g., "Fast", "Slow"
     
     # Publishing status
-    is_published = db.Column(db.Boolean, default=False, index=True)
+    is_published = db.Column(db.Boolean, default=False)
     
     # Foreign key to user (who created the joke)
     author_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
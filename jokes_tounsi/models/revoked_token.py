@@ -0,0 +1,25 @@
+from datetime import datetime, timezone
+
+from ..extensions import db
+
+
+class RevokedToken(db.Model):
+    """An access token revoked before its expiry, e.g. at logout.
+
+    Workers keep the unexpired jtis in memory and fetch new rows by id,
+    so ids must never be reused (AUTOINCREMENT): expired rows can be
+    pruned without a later revocation hiding below a worker's watermark.
+    """
+
+    __tablename__ = "revoked_tokens"
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    id = db.Column(db.Integer, primary_key=True)
+    jti = db.Column(db.String(36), unique=True, nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False, index=True)
+    # Expiry of the token itself: past it the row is useless
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    revoked_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+
+    def __repr__(self):
+        return f"<RevokedToken {self.jti}>"
@@ -0,0 +1,106 @@
+import re
+
+from sqlalchemy import DDL, event
+
+from ..extensions import db
+from .joke import Joke
+
+
+# FTS5 external-content index over the joke texts. The rows live in `jokes`;
+# `jokes_fts` only stores the inverted index and is kept in sync by triggers.
+jokes_fts = db.table(
+    "jokes_fts",
+    db.column("rowid", db.Integer),
+    db.column("text_tn", db.Text),
+    db.column("text_fr", db.Text),
+    db.column("text_en", db.Text),
+)
+
+FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS jokes_fts USING fts5(
+        text_tn, text_fr, text_en,
+        content='jokes', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jokes_fts_ai AFTER INSERT ON jokes BEGIN
+        INSERT INTO jokes_fts(rowid, text_tn, text_fr, text_en)
+        VALUES (new.id, new.text_tn, new.text_fr, new.text_en);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jokes_fts_ad AFTER DELETE ON jokes BEGIN
+        INSERT INTO jokes_fts(jokes_fts, rowid, text_tn, text_fr, text_en)
+        VALUES ('delete', old.id, old.text_tn, old.text_fr, old.text_en);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jokes_fts_au AFTER UPDATE OF text_tn, text_fr, text_en ON jokes BEGIN
+        INSERT INTO jokes_fts(jokes_fts, rowid, text_tn, text_fr, text_en)
+        VALUES ('delete', old.id, old.text_tn, old.text_fr, old.text_en);
+        INSERT INTO jokes_fts(rowid, text_tn, text_fr, text_en)
+        VALUES (new.id, new.text_tn, new.text_fr, new.text_en);
+    END
+    """,
+]
+
+FTS_DROP_DDL = [
+    "DROP TRIGGER IF EXISTS jokes_fts_au",
+    "DROP TRIGGER IF EXISTS jokes_fts_ad",
+    "DROP TRIGGER IF EXISTS jokes_fts_ai",
+    "DROP TABLE IF EXISTS jokes_fts",
+]
+
+# Keep db.create_all()/drop_all() (tests, create_admin.py) in line with the
+# migrations, which create the same objects.
+for _statement in FTS_DDL:
+    event.listen(Joke.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+for _statement in FTS_DROP_DDL:
+    event.listen(Joke.__table__, "before_drop", DDL(_statement).execute_if(dialect="sqlite"))
+
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def build_match_expression(q):
+    """Turn free user input into a safe FTS5 MATCH expression.
+
+    Every word is quoted (so FTS5 operators typed by users are inert) and
+    prefix-matched, and all words must match.
+    Returns None when the input contains no searchable word.
+    """
+    tokens = _TOKEN_RE.findall(q or "")
+    if not tokens:
+        return None
+    return " ".join('"{}"*'.format(token.replace('"', '""')) for token in tokens)
+
+
+def apply_search(query, q):
+    """Restrict a Joke query to rows matching `q`, best matches first."""
+    if db.engine.dialect.name != "sqlite":
+        # No FTS5 outside SQLite: fall back to substring matching
+        search_term = f"%{q}%"
+        return query.filter(
+            Joke.text_tn.ilike(search_term) |
+            Joke.text_fr.ilike(search_term) |
+            Joke.text_en.ilike(search_term)
+        )
+
+    match = build_match_expression(q)
+    if match is None:
+        return query.filter(db.false())
+
+    fts = db.literal_column("jokes_fts")
+    return (
+        query.join(jokes_fts, jokes_fts.c.rowid == Joke.id)
+        .filter(fts.match(match))
+        .order_by(db.func.bm25(fts))
+    )
+
+
+def rebuild_search_index():
+    """Rebuild the whole FTS index from the `jokes` table."""
+    db.session.execute(db.text("INSERT INTO jokes_fts(jokes_fts) VALUES ('rebuild')"))
+    db.session.commit()
@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
-from werkzeug.security import generate_password_hash, check_password_hash
 from ..extensions import db
+from ..security.passwords import hash_password, verify_password
 
 
 class User(db.Model):
@@ -51,12 +51,12 @@ class User(db.Model):
         return f"<User {self.email}>"
     
     def set_password(self, password):
-        """Hash and store password securely."""
-        self.password_hash = generate_password_hash(password)
+        """Hash and store password securely (in the hashing pool)."""
+        self.password_hash = hash_password(password)
     
     def check_password(self, password):
-        """Verify password against stored hash."""
-        return check_password_hash(self.password_hash, password)
+        """Verify password against stored hash (in the hashing pool)."""
+        return verify_password(self.password_hash, password)
     
     def to_dict(self):
         """Convert user to dictionary for JSON responses."""
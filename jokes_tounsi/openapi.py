@@ -0,0 +1,46 @@
+import threading
+
+from flask_smorest import Api
+
+
+class LazyDocApi(Api):
+    """flask-smorest Api documenting its blueprints on first use of the spec.
+
+    Api.register_blueprint resolves every view's marshmallow schemas into
+    the spec, about half of create_app. Here blueprints are only routed at
+    registration; their documentation is added the first time `spec` is
+    read (/openapi.json without a prebuilt file, the doc UIs, the
+    `flask openapi` commands), so a worker serving the prebuilt spec never
+    pays for it.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._spec = None
+        self._pending_docs = []
+        self._docs_lock = threading.Lock()
+        super().__init__(*args, **kwargs)
+
+    @property
+    def spec(self):
+        if self._pending_docs:
+            with self._docs_lock:
+                while self._pending_docs:
+                    blp, name, parameters = self._pending_docs[0]
+                    blp.register_views_in_doc(self, self._app, self._spec, name=name, parameters=parameters)
+                    self._spec.tag({"name": name, "description": blp.description})
+                    # Dropped once documented: readers skip the lock only when all are
+                    self._pending_docs.pop(0)
+        return self._spec
+
+    @spec.setter
+    def spec(self, value):
+        # Set by init_app, once per app: forget the previous app's blueprints
+        self._spec = value
+        self._pending_docs = []
+
+    def register_blueprint(self, blp, *, parameters=None, **options):
+        """Register a blueprint in the application, and in the spec when it is read."""
+        name = options.get("name", blp.name)
+        self._app.extensions["flask-smorest"]["blp_name_to_api"][name] = self
+        self._app.register_blueprint(blp, **options)
+        self._pending_docs.append((blp, name, parameters))
@@ -5,13 +5,18 @@ from flask_smorest import Blueprint, abort
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity, get_jwt
 from werkzeug.exceptions import Conflict
 
-from ..extensions import db, oauth
-from ..models import User
+from ..extensions import db
+from ..models import User, AuthorJokeCount
+from ..security import password_needs_rehash, google_client, role_required, current_user_id
+from ..utils.user_cache import get_user_profile, invalidate_user_profile
+from ..utils.query_budget import query_budget
+from ..utils.token_blocklist import revoke_current_token
 from ..schemas import (
     UserRegisterSchema,
     UserLoginSchema,
     UserSchema,
-    UserRoleSchema
+    UserRoleSchema,
+    UserStatsSchema
 )
 
 logger = logging.getLogger(__name__)
@@ -24,6 +29,7 @@ blp = Blueprint(
 
 
 @blp.route("/register", methods=["POST"])
+@query_budget(3)
 @blp.arguments(UserRegisterSchema, location="json")
 @blp.response(201, UserSchema)
 def register(args):
@@ -57,6 +63,7 @@ def register(args):
 
 
 @blp.route("/login", methods=["POST"])
+@query_budget(3)
 @blp.arguments(UserLoginSchema, location="json")
 def login(args):
     """Login user with email and password."""
@@ -69,6 +76,16 @@ def login(args):
         logger.warning(f"Failed login attempt for {args['email']}")
         abort(401, message="Invalid email or password")
     
+    # Upgrade the stored hash if the hashing parameters changed
+    if password_needs_rehash(user.password_hash):
+        user.set_password(args["password"])
+        try:
+            db.session.commit()
+            logger.info(f"Password hash upgraded for {user.email}")
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Password rehash failed: {str(e)}")
+    
     # Create JWT token with role claim
     access_token = create_access_token(
         identity=str(user.id),
@@ -84,22 +101,62 @@ def login(args):
     }
 
 
+@blp.route("/logout", methods=["POST"])
+@query_budget(1)
+@jwt_required()
+@blp.response(204)
+def logout():
+    """Revoke the access token used for this request."""
+    try:
+        revoke_current_token()
+        logger.info(f"User {get_jwt_identity()} logged out")
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Logout failed: {str(e)}")
+        abort(500, message="Error logging out")
+
+    return
+
+
 @blp.route("/users/me", methods=["GET"])
+@query_budget(1)
 @jwt_required()
 @blp.response(200, UserSchema)
 def get_current_user():
     """Get current authenticated user's profile."""
     
-    user_id = get_jwt_identity()          # identity is a str
-    user = User.query.get(int(user_id))   # convert to int for DB lookup
+    user_id = get_jwt_identity()              # identity is a str
+    user = get_user_profile(int(user_id))     # cached profile snapshot
     
     if not user:
         abort(404, message="User not found")
     
-    # IMPORTANT: return the model instance, not .to_dict()
     return user
 
+@blp.route("/users/me/stats", methods=["GET"])
+@query_budget(1)
+@jwt_required()
+@blp.response(200, UserStatsSchema)
+def get_current_user_stats():
+    """Count the current user's jokes: total, published, drafts and per region."""
+    return AuthorJokeCount.stats(current_user_id())
+
+
+@blp.route("/users/<int:user_id>/stats", methods=["GET"])
+@query_budget(2)
+@jwt_required()
+@role_required("admin")
+@blp.response(200, UserStatsSchema)
+def get_user_stats(user_id):
+    """Count any user's jokes – admin only."""
+    if db.session.get(User, user_id) is None:
+        abort(404, message=f"User {user_id} not found")
+
+    return AuthorJokeCount.stats(user_id)
+
+
 @blp.route("/users/role", methods=["PUT"])
+@query_budget(3)
 @jwt_required()
 @blp.arguments(UserRoleSchema, location="json")
 @blp.response(200, UserSchema)
@@ -120,6 +177,7 @@ def change_user_role(args):
     user.role = args["role"]
     try:
         db.session.commit()
+        invalidate_user_profile(user.id)
         logger.info(f"Role of {user.email} changed to {user.role}")
     except Exception as e:
         db.session.rollback()
@@ -131,24 +189,26 @@ def change_user_role(args):
 
 
 @blp.route("/auth/google")
+@query_budget(0)
 def google_login():
     """Initiate Google OAuth login."""
     redirect_uri = url_for('auth.google_callback', _external=True)
     try:
-        return oauth.google.authorize_redirect(redirect_uri)
+        return google_client().authorize_redirect(redirect_uri)
     except Exception as e:
         with open("error.log", "w") as f:
             f.write(str(e))
         return jsonify({"error": str(e), "type": type(e).__name__}), 500
 
 @blp.route("/auth/google/callback")
+@query_budget(3)
 def google_callback():
     """Handle Google OAuth callback."""
     if os.getenv("FLASK_ENV") == "development":
         os.environ['OAUTHLIB_INSECURE_TRANSPORT'] = '1'
 
     try:
-        token = oauth.google.authorize_access_token()
+        token = google_client().authorize_access_token()
         user_info = token['userinfo']
         
         # Find or create user
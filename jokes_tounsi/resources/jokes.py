@@ -1,21 +1,56 @@
+import bisect
+import csv
+import hashlib
+import io
+import json
 import logging
-from flask import request
+import random
+from datetime import datetime, time, timedelta, timezone
+from flask import request, current_app, jsonify, Response
 from flask_smorest import Blueprint, abort
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from marshmallow import ValidationError
+from werkzeug.http import http_date
 
 from ..extensions import db
-from ..models import User, Joke
+from ..models import Joke, DataVersion, apply_search
 from ..schemas import (
     JokeCreateSchema,
     JokeUpdateSchema,
     JokeSchema,
     JokeListQueryArgsSchema,
-    JokeListResponseSchema
+    JokeListResponseSchema,
+    JokeBatchArgsSchema,
+    JokeBatchResponseSchema,
+    JokeBulkUpdateSchema,
+    JokeBulkUpdateResultSchema,
+    JokeExportQueryArgsSchema,
+    JokeRandomQueryArgsSchema,
+    JokeFieldsArgsSchema,
+    JokeImportResultSchema,
+    RowSerializer
 )
-from ..security import role_required
+from ..security import role_required, current_user_id, current_role
+from ..utils.pagination import encode_cursor
+from ..utils.http_cache import make_etag, cache_headers, not_modified
+from ..utils.compression import precompressed_response
+from ..utils.metrics import server_timing
+from ..utils.joke_pool import published_ids
+from ..utils.query_budget import query_budget, stream_with_budget
 
 logger = logging.getLogger(__name__)
 
+# Classification columns accepted as equality filters on listings
+FILTER_COLUMNS = ("era", "region", "age_group", "acceptability", "delivery_type")
+
+# Listings and exports select JokeSchema's columns and dump the tuples
+# directly, without ORM instances or a marshmallow pass
+JOKE_ROWS = RowSerializer(JokeSchema, Joke)
+
+# Exported fields (JokeSchema/Joke.to_dict() order) and rows fetched per round trip
+EXPORT_COLUMNS = JOKE_ROWS.fields
+EXPORT_CHUNK_SIZE = 500
+
 blp = Blueprint(
     "jokes",
     __name__,
@@ -24,9 +59,44 @@ blp = Blueprint(
 
 
 
+def _joke_row(joke_id, rows, published_only=False):
+    """One joke as a `rows` column tuple, or None."""
+    query = db.select(*rows.columns).where(Joke.id == joke_id)
+    if published_only:
+        query = query.where(Joke.is_published == db.true())
+    return db.session.execute(query).first()
+
+
+
+def _filtered_query(args):
+    """
+    Published jokes matching the listing filters and search term.
+    
+    `is_published` is compared with a literal so SQLite can pick the
+    partial `WHERE is_published = 1` indexes declared on Joke.
+    """
+    
+    # Start with base query (only published jokes)
+    query = Joke.query.filter(Joke.is_published == db.true())
+    
+    # Apply filters if provided
+    for column in FILTER_COLUMNS:
+        if args.get(column):
+            query = query.filter_by(**{column: args[column]})
+    
+    # Full-text search if provided (ranked by relevance, then newest first)
+    if args.get("q"):
+        query = apply_search(query, args["q"])
+    
+    return query
+
+
+
 @blp.route("/jokes", methods=["GET"])
+@query_budget(3)
 @blp.arguments(JokeListQueryArgsSchema, location="query")
 @blp.response(200, JokeListResponseSchema)
+@blp.alt_response(304, description="Not modified")
 def list_jokes(args):
     """
     List all jokes with pagination and filtering.
@@ -34,74 +104,262 @@ def list_jokes(args):
     Query parameters:
     - page: Page number (default: 1)
     - per_page: Items per page (default: 20, max: 100)
+    - cursor: Keyset pagination; empty for the first page, then the
+      returned next_cursor (replaces page)
+    - include_total: Compute the total count (default: true for page,
+      false for cursor pagination)
     - era: Filter by era
     - region: Filter by region
     - age_group: Filter by age group
     - acceptability: Filter by acceptability
     - delivery_type: Filter by delivery type
-    - q: Search in joke text
-    """
+    - q: Full-text search in joke text (results ranked by relevance)
+    - fields: Comma-separated joke fields to return (default: all); the
+      other columns are not read
     
-    # Start with base query (only published jokes)
-    query = Joke.query.filter_by(is_published=True)
+    Responses carry ETag/Last-Modified validators derived from the jokes
+    data version; If-None-Match/If-Modified-Since are answered with 304
+    without running the listing query, and a page already served
+    compressed under the same ETag is resent from the compression cache.
     
-    # Apply filters if provided
-    if args.get("era"):
-        query = query.filter_by(era=args["era"])
-    
-    if args.get("region"):
-        query = query.filter_by(region=args["region"])
-    
-    if args.get("age_group"):
-        query = query.filter_by(age_group=args["age_group"])
+    Items are fetched as column tuples and dumped by JOKE_ROWS into the
+    same JSON JokeListResponseSchema would produce from Joke objects.
+    """
     
-    if args.get("acceptability"):
-        query = query.filter_by(acceptability=args["acceptability"])
+    # Conditional GET: answer from the jokes data version before querying
+    # (no validators where versions are not tracked)
+    version, changed_at = DataVersion.current(Joke.__tablename__)
+    headers = {}
+    if version is not None:
+        etag = make_etag("jokes", version, sorted(request.args.items(multi=True)))
+        headers = cache_headers(etag, changed_at)
+        cached = not_modified(etag, changed_at)
+        if cached is None:
+            cached = precompressed_response(etag, headers)
+        if cached is not None:
+            return cached
     
-    if args.get("delivery_type"):
-        query = query.filter_by(delivery_type=args["delivery_type"])
+    rows = JOKE_ROWS.only(args.get("only"))
+    query = _filtered_query(args)
     
-    # Search in text if provided
-    if args.get("q"):
-        search_term = f"%{args['q']}%"
-        query = query.filter(
-            Joke.text_tn.ilike(search_term) |
-            Joke.text_fr.ilike(search_term) |
-            Joke.text_en.ilike(search_term)
-        )
+    if "cursor" in args:
+        payload = _list_jokes_keyset(query, rows, args)
+        with server_timing("serialize"):
+            body = jsonify(payload)
+        return body, 200, headers
     
     # Pagination
     page = args["page"]
     per_page = args["per_page"]
-    pagination = query.order_by(Joke.created_at.desc()).paginate(
+    include_total = args.get("include_total", True)
+    pagination = query.with_entities(*rows.columns).order_by(Joke.created_at.desc()).paginate(
         page=page,
         per_page=per_page,
-        error_out=False
+        error_out=False,
+        count=include_total
+    )
+    
+    with server_timing("serialize"):
+        body = jsonify({
+            "page": page,
+            "per_page": per_page,
+            "total": pagination.total,
+            "items": rows.dump_many(pagination.items)
+        })
+    return body, 200, headers
+
+
+def _list_jokes_keyset(query, rows, args):
+    """
+    Keyset pagination on (created_at, id), newest first.
+    
+    Seeks straight to the cursor position through the created_at indexes
+    instead of skipping OFFSET rows, so every page costs the same. With a
+    search term, rows are still filtered by the match but ordered by date,
+    since relevance ranks are not stable page keys.
+    """
+    per_page = args["per_page"]
+    
+    total = None
+    if args.get("include_total", False):
+        total = query.order_by(None).count()
+    
+    if args["cursor"] is not None:
+        created_at, joke_id = args["cursor"]
+        query = query.filter(
+            db.tuple_(Joke.created_at, Joke.id) < db.tuple_(created_at, joke_id)
+        )
+    
+    # Fetch one extra row to know whether another page exists. The page
+    # keys follow the requested columns, which may not include them.
+    page = (
+        query.with_entities(*rows.columns, Joke.created_at, Joke.id)
+        .order_by(None)
+        .order_by(Joke.created_at.desc(), Joke.id.desc())
+        .limit(per_page + 1)
+        .all()
     )
+    items = page[:per_page]
+    
+    next_cursor = None
+    if len(page) > per_page:
+        created_at, joke_id = items[-1][-2:]
+        next_cursor = encode_cursor(created_at, joke_id)
     
+    with server_timing("serialize"):
+        items = rows.dump_many(items)
     return {
-    "page": page,
-    "per_page": per_page,
-    "total": pagination.total,
-    "items": pagination.items
-}
+        "per_page": per_page,
+        "total": total,
+        "next_cursor": next_cursor,
+        "items": items
+    }
+
+
+
+@blp.route("/jokes/export", methods=["GET"])
+@query_budget(1)
+@blp.arguments(JokeExportQueryArgsSchema, location="query")
+@blp.doc(responses={200: {
+    "description": "Published jokes, one per line",
+    "content": {"application/x-ndjson": {}, "text/csv": {}}
+}})
+def export_jokes(args):
+    """
+    Export all published jokes as NDJSON or CSV.
+    
+    Accepts the listing filters and `q`. Rows are fetched as plain column
+    tuples with a server-side cursor and streamed in chunks, so memory use
+    does not grow with the table.
+    """
+    query = (
+        _filtered_query(args)
+        .order_by(Joke.created_at.desc())
+        .with_entities(*JOKE_ROWS.columns)
+        .yield_per(EXPORT_CHUNK_SIZE)
+    )
+    
+    if args["format"] == "csv":
+        body, mimetype = _export_csv(query), "text/csv"
+    else:
+        body, mimetype = _export_ndjson(query), "application/x-ndjson"
+    
+    return Response(
+        stream_with_budget(body),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f"attachment; filename=jokes.{args['format']}"}
+    )
+
+
+def _export_ndjson(rows):
+    chunk = []
+    for row in rows:
+        chunk.append(json.dumps(JOKE_ROWS.dump(row), ensure_ascii=False))
+        if len(chunk) >= EXPORT_CHUNK_SIZE:
+            yield "\n".join(chunk) + "\n"
+            chunk = []
+    if chunk:
+        yield "\n".join(chunk) + "\n"
+
+
+def _export_csv(rows):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+    writer.writeheader()
+    for count, row in enumerate(rows, start=1):
+        writer.writerow(JOKE_ROWS.dump(row))
+        if count % EXPORT_CHUNK_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+
+@blp.route("/jokes/random", methods=["GET"])
+@query_budget(3)
+@blp.arguments(JokeRandomQueryArgsSchema, location="query")
+@blp.response(200, JokeSchema)
+def random_joke(args):
+    """Get a random published joke, optionally filtered by region or age group."""
+    rows = JOKE_ROWS.only(args.pop("only", None))
+    ids = published_ids(**args)
+    if not ids:
+        abort(404, message="No published joke matches these filters")
+    
+    row = _joke_row(random.choice(ids), rows, published_only=True)
+    if not row:
+        # Deleted or unpublished since the ids were loaded
+        abort(404, message="No published joke matches these filters")
+    
+    with server_timing("serialize"):
+        body = jsonify(rows.dump(row))
+    return body, 200, {"Cache-Control": "no-store"}
+
+
+
+@blp.route("/jokes/today", methods=["GET"])
+@query_budget(4)
+@blp.arguments(JokeRandomQueryArgsSchema, location="query")
+@blp.response(200, JokeSchema)
+def joke_of_the_day(args):
+    """
+    Get the joke of the day, optionally filtered by region or age group.
+    
+    Candidates are the published jokes created before midnight UTC. A
+    hash of the date and filters gives a point in their id range, and the
+    pick is the first candidate id at or after it. Jokes published during
+    the day are not candidates, and removing other jokes never moves the
+    pick, so every worker returns the same joke all day and the response
+    may be cached until midnight UTC. Only unpublishing the pick itself
+    (or publishing an older draft that lands in front of it) changes it.
+    """
+    rows = JOKE_ROWS.only(args.pop("only", None))
+    ids = published_ids(**args)
+    if not ids:
+        abort(404, message="No published joke matches these filters")
+    
+    now = datetime.now(timezone.utc)
+    today = datetime.combine(now.date(), time.min, tzinfo=timezone.utc)
+    # Ids follow creation order: the last joke created before today bounds the candidates
+    last_id = db.session.scalar(
+        db.select(Joke.id).where(Joke.created_at < today)
+        .order_by(Joke.created_at.desc()).limit(1)
+    )
+    candidates = ids[:bisect.bisect_right(ids, last_id)] if last_id is not None else ids
+    if not candidates:
+        # Every match is new today: fall back to all of them
+        candidates = ids
+    
+    seed = "|".join([now.date().isoformat(), args.get("region") or "", args.get("age_group") or ""])
+    digest = hashlib.sha256(seed.encode("utf-8")).digest()
+    point = candidates[0] + int.from_bytes(digest[:8], "big") % (candidates[-1] - candidates[0] + 1)
+    row = _joke_row(candidates[bisect.bisect_left(candidates, point)], rows, published_only=True)
+    if not row:
+        abort(404, message="No published joke matches these filters")
+    
+    midnight = datetime.combine(now.date() + timedelta(days=1), time.min, tzinfo=timezone.utc)
+    with server_timing("serialize"):
+        body = jsonify(rows.dump(row))
+    return body, 200, {
+        "Cache-Control": f"public, max-age={int((midnight - now).total_seconds())}",
+        "Expires": http_date(midnight)
+    }
 
 
 
 @blp.route("/jokes", methods=["POST"])
+@query_budget(3)
 @jwt_required()
 @blp.arguments(JokeCreateSchema, location="json")
 @blp.response(201, JokeSchema)
 def create_joke(args):  
     """Create a new joke (contributor or admin only)."""
     
-    # Get current user
-    user_id = get_jwt_identity()
-    user = User.query.get(int(user_id))
-    
-    # Check permission
-    if user.role not in ["contributor", "admin"]:
+    # Check permission from the token claims
+    if current_role() not in ["contributor", "admin"]:
         abort(403, message="Only contributors and admins can create jokes")
+    user_id = current_user_id()
     
     # Create joke
     joke = Joke(
@@ -116,14 +374,14 @@ def create_joke(args):
         tone=args.get("tone"),
         rhythm=args.get("rhythm"),
         is_published=args.get("is_published", False),
-        author_id=user.id
+        author_id=user_id
     )
     
     # Save to database
     try:
         db.session.add(joke)
         db.session.commit()
-        logger.info(f"Joke created by {user.email}: {joke.id}")
+        logger.info(f"Joke created by user {user_id}: {joke.id}")
     except Exception as e:
         db.session.rollback()
         logger.error(f"Error creating joke: {str(e)}")
@@ -133,20 +391,238 @@ def create_joke(args):
 
 
 
+@blp.route("/jokes/import", methods=["POST"])
+@query_budget(None, allow_repeats=True)
+@jwt_required()
+@blp.response(200, JokeImportResultSchema)
+@blp.doc(requestBody={
+    "required": True,
+    "content": {"application/x-ndjson": {"schema": {"type": "string"}}}
+})
+def import_jokes():
+    """
+    Bulk import jokes from an NDJSON body (contributor or admin only).
+    
+    Each line is one JokeCreateSchema object. The body is read as a stream
+    and valid lines are inserted in executemany batches, one transaction
+    per batch, so memory stays flat whatever the size of the import.
+    Invalid lines are skipped and reported with their line number.
+    """
+    if current_role() not in ["contributor", "admin"]:
+        abort(403, message="Only contributors and admins can import jokes")
+    
+    author_id = current_user_id()
+    batch_size = current_app.config["JOKE_IMPORT_BATCH_SIZE"]
+    max_errors = current_app.config["JOKE_IMPORT_MAX_ERRORS"]
+    schema = JokeCreateSchema()
+    
+    result = {"inserted": 0, "failed": 0, "errors": []}
+    
+    def report(line_number, errors):
+        result["failed"] += 1
+        if len(result["errors"]) < max_errors:
+            result["errors"].append({"line": line_number, "errors": errors})
+    
+    batch = []  # (line number, row) pairs
+    
+    def flush():
+        try:
+            db.session.execute(db.insert(Joke), [row for _, row in batch])
+            db.session.commit()
+            result["inserted"] += len(batch)
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error importing jokes: {str(e)}")
+            for line_number, _ in batch:
+                report(line_number, {"_database": ["Error saving joke"]})
+        batch.clear()
+    
+    # Buffered so lines are not read from the socket one byte at a time
+    stream = io.BufferedReader(request.stream, buffer_size=64 * 1024)
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError:
+            report(line_number, {"_json": ["Invalid JSON."]})
+            continue
+        if not isinstance(data, dict):
+            report(line_number, {"_schema": ["Invalid input type."]})
+            continue
+        try:
+            row = schema.load(data)
+        except ValidationError as e:
+            report(line_number, e.messages)
+            continue
+        
+        row["author_id"] = author_id
+        batch.append((line_number, row))
+        if len(batch) >= batch_size:
+            flush()
+    
+    if batch:
+        flush()
+    
+    logger.info(
+        f"Jokes imported by user {author_id}: "
+        f"{result['inserted']} inserted, {result['failed']} failed"
+    )
+    return result
+
+
+
+def _jokes_batch(args):
+    """
+    Jokes of `args["ids"]` in request order, from one IN query.
+    
+    Published jokes are visible to everyone; drafts only to their author
+    and admins. Missing and invisible ids alike become null entries and are
+    listed in `not_found`.
+    """
+    ids = args["ids"]
+    rows = JOKE_ROWS.only(args.get("only"))
+    
+    # The id is selected last to map rows back, whatever the fieldset
+    query = db.select(*rows.columns, Joke.id).where(Joke.id.in_(set(ids)))
+    identity = get_jwt_identity()
+    if identity is None:
+        query = query.where(Joke.is_published == db.true())
+    elif current_role() != "admin":
+        query = query.where(db.or_(Joke.is_published == db.true(), Joke.author_id == int(identity)))
+    
+    with server_timing("serialize"):
+        found = {row[-1]: rows.dump(row[:-1]) for row in db.session.execute(query)}
+        body = jsonify({
+            "items": [found.get(joke_id) for joke_id in ids],
+            "not_found": list(dict.fromkeys(joke_id for joke_id in ids if joke_id not in found)),
+        })
+    return body
+
+
+
+@blp.route("/jokes/batch", methods=["GET"])
+@query_budget(1)
+@jwt_required(optional=True)
+@blp.arguments(JokeBatchArgsSchema, location="query")
+@blp.response(200, JokeBatchResponseSchema)
+def get_jokes_batch(args):
+    """
+    Get several jokes by ID (e.g. ?ids=3,1,2, at most 100).
+    
+    Returns one item per requested id, in the same order, null for jokes
+    that do not exist or are not visible; those ids are also listed in
+    not_found. Accepts `fields` like the single-joke endpoint.
+    """
+    return _jokes_batch(args)
+
+
+
+@blp.route("/jokes/batch", methods=["POST"])
+@query_budget(1)
+@jwt_required(optional=True)
+@blp.arguments(JokeBatchArgsSchema, location="json")
+@blp.response(200, JokeBatchResponseSchema)
+def post_jokes_batch(args):
+    """
+    Get several jokes by ID from a JSON body ({"ids": [3, 1, 2]}).
+    
+    Same as GET /jokes/batch, with the ids (and fields) in the body.
+    """
+    return _jokes_batch(args)
+
+
+
+@blp.route("/jokes/batch", methods=["PATCH"])
+@query_budget(2)
+@jwt_required()
+@role_required("admin")
+@blp.arguments(JokeBulkUpdateSchema, location="json")
+@blp.response(200, JokeBulkUpdateResultSchema)
+def bulk_update_jokes(args):
+    """
+    Apply one patch to many jokes – admin only.
+    
+    Targets `ids` or a `filter` (classifications, is_published,
+    author_id), e.g. {"ids": [1, 2], "patch": {"is_published": true}}.
+    Runs as a single UPDATE in one transaction: only rows that the patch
+    changes are written and get a new updated_at, and their number is
+    returned. Search and facet tables follow through their triggers.
+    """
+    # Same semantics as PATCH /jokes/<id>: empty values are ignored
+    values = {key: value for key, value in args["patch"].items() if value not in (None, "")}
+    if not values:
+        abort(422, message="The patch changes nothing")
+    
+    if "ids" in args:
+        target = Joke.id.in_(set(args["ids"]))
+    else:
+        target = db.and_(*(
+            getattr(Joke, column) == value
+            for column, value in args["filter"].items() if value is not None
+        ))
+    changed = db.or_(*(getattr(Joke, column).is_distinct_from(value) for column, value in values.items()))
+    
+    statement = (
+        db.update(Joke)
+        .where(target, changed)
+        .values(**values, updated_at=datetime.now(timezone.utc))
+        .execution_options(synchronize_session=False)
+    )
+    user_id = current_user_id()
+    try:
+        updated = db.session.execute(statement).rowcount
+        db.session.commit()
+        logger.info(f"{updated} jokes updated in bulk by user {user_id}: {sorted(values)}")
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Error updating jokes in bulk: {str(e)}")
+        abort(500, message="Error updating jokes")
+    
+    return {"updated": updated}
+
+
+
 @blp.route("/jokes/<int:joke_id>", methods=["GET"])
+@query_budget(2)
+@blp.arguments(JokeFieldsArgsSchema, location="query")
 @blp.response(200, JokeSchema)
-def get_joke(joke_id):
-    """Get a single joke by ID."""
+@blp.alt_response(304, description="Not modified")
+def get_joke(args, joke_id):
+    """
+    Get a single joke by ID.
     
-    joke = Joke.query.get(joke_id)
-    if not joke:
+    `fields` restricts the returned fields, and the columns read, to a
+    comma-separated subset.
+    """
+    
+    # Validate against updated_at before loading the text columns
+    updated_at = db.session.execute(
+        db.select(Joke.updated_at).where(Joke.id == joke_id)
+    ).scalar()
+    if updated_at is None:
         abort(404, message=f"Joke {joke_id} not found")
     
-    return joke
+    etag = make_etag("joke", joke_id, updated_at, sorted(request.args.items(multi=True)))
+    cached = not_modified(etag, updated_at)
+    if cached is None:
+        cached = precompressed_response(etag, cache_headers(etag, updated_at))
+    if cached is not None:
+        return cached
+    
+    rows = JOKE_ROWS.only(args.get("only"))
+    row = _joke_row(joke_id, rows)
+    if not row:
+        abort(404, message=f"Joke {joke_id} not found")
+    
+    with server_timing("serialize"):
+        body = jsonify(rows.dump(row))
+    return body, 200, cache_headers(etag, updated_at)
 
 
 
 @blp.route("/jokes/<int:joke_id>", methods=["PATCH"])
+@query_budget(3)
 @jwt_required()
 @blp.arguments(JokeUpdateSchema, location="json")
 @blp.response(200, JokeSchema)
@@ -158,12 +634,9 @@ def update_joke(args, joke_id):
     if not joke:
         abort(404, message=f"Joke {joke_id} not found")
     
-    # Get current user
-    user_id = get_jwt_identity()
-    user = User.query.get(int(user_id))
-    
-    # Check permission (author or admin)
-    if joke.author_id != user.id and user.role != "admin":
+    # Check permission (author or admin) from the token claims
+    user_id = current_user_id()
+    if joke.author_id != user_id and current_role() != "admin":
         abort(403, message="You can only edit your own jokes")
     
     # Update fields if provided
@@ -193,7 +666,7 @@ def update_joke(args, joke_id):
     # Save
     try:
         db.session.commit()
-        logger.info(f"Joke {joke_id} updated by {user.email}")
+        logger.info(f"Joke {joke_id} updated by user {user_id}")
     except Exception as e:
         db.session.rollback()
         logger.error(f"Error updating joke: {str(e)}")
@@ -204,6 +677,7 @@ def update_joke(args, joke_id):
 
 
 @blp.route("/jokes/<int:joke_id>", methods=["DELETE"])
+@query_budget(2)
 @jwt_required()
 @role_required("admin")
 @blp.response(204)
@@ -213,13 +687,12 @@ def delete_joke(joke_id):
     if not joke:
         abort(404, message=f"Joke {joke_id} not found")
 
-    user_id = get_jwt_identity()
-    user = User.query.get(int(user_id))
+    user_id = current_user_id()
 
     try:
         db.session.delete(joke)
         db.session.commit()
-        logger.info(f"Joke {joke_id} deleted by {user.email if user else 'unknown'}")
+        logger.info(f"Joke {joke_id} deleted by user {user_id}")
     except Exception as e:
         db.session.rollback()
         logger.error(f"Error deleting joke: {str(e)}")
@@ -1,6 +1,10 @@
+from flask import request
 from flask_smorest import Blueprint, abort
 from ..extensions import db
-from ..models import Joke, User
+from ..models import Joke, User, DataVersion, JokeFacetCount, search_facet_counts
+from ..schemas import JokeFacetArgsSchema, JokeFacetsSchema
+from ..utils.http_cache import make_etag, cache_headers, not_modified
+from ..utils.query_budget import query_budget
 
 
 blp = Blueprint(
@@ -12,20 +16,58 @@ blp = Blueprint(
 
 
 @blp.route("/ping", methods=["GET"])
+@query_budget(0)
 def ping():
     """API health check endpoint."""
     return {"status": "pong", "message": "API is healthy"}
 
 
 @blp.route("/classification", methods=["GET"])
+@query_budget(1)
 def get_classification():
-    """Get all classification values used in the system."""
+    """Get all classification values used by published jokes."""
+    facets = JokeFacetCount.counts()
+
+    def values(column):
+        return sorted(item["value"] for item in facets[column] if item["value"] is not None)
+
     return {
-        "eras": ["Pre-2011", "Post-2011"],
-        "regions": ["Tunis", "Sfax", "Ariana", "Ben Arous", "Sousse", "Kairouan"],
-        "age_groups": ["Kids", "Teens", "Adults", "Elders"],
-        "acceptability_levels": ["Safe", "Sensitive", "Taboo"],
-        "delivery_types": ["Radio", "TV", "Stand-up", "Book", "Oral"],
-        "tones": ["Sarcastic", "Funny", "Dark", "Subtle", "Witty"],
-        "rhythms": ["Fast", "Slow", "Medium"]
-    }
\ No newline at end of file
+        "eras": values("era"),
+        "regions": values("region"),
+        "age_groups": values("age_group"),
+        "acceptability_levels": values("acceptability"),
+        "delivery_types": values("delivery_type"),
+        "tones": values("tone"),
+        "rhythms": values("rhythm")
+    }
+
+
+@blp.route("/facets", methods=["GET"])
+@query_budget(2)
+@blp.arguments(JokeFacetArgsSchema, location="query")
+@blp.response(200, JokeFacetsSchema)
+@blp.alt_response(304, description="Not modified")
+def get_facets(args):
+    """
+    Count published jokes per classification value.
+    
+    Accepts the same filters and search term `q` as GET /jokes and
+    returns, for each of era, region, age_group, acceptability,
+    delivery_type, tone and rhythm, the number of matching jokes per value
+    (null for unclassified jokes). Without `q` the counts are read from
+    the pre-aggregated table; with it, grouped over the search matches.
+    """
+    version, changed_at = DataVersion.current(Joke.__tablename__)
+    headers = {}
+    if version is not None:
+        etag = make_etag("facets", version, sorted(request.args.items(multi=True)))
+        headers = cache_headers(etag, changed_at)
+        cached = not_modified(etag, changed_at)
+        if cached is not None:
+            return cached
+
+    q = args.pop("q", None)
+    filters = {column: value for column, value in args.items() if value}
+    if q:
+        return search_facet_counts(q, filters), 200, headers
+    return JokeFacetCount.counts(filters), 200, headers
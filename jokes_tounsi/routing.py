@@ -0,0 +1,68 @@
+import sqlalchemy as sa
+from flask import g, has_request_context, request
+from flask_sqlalchemy.session import Session
+
+# Bind key of the optional read-only engine (see SQLALCHEMY_READONLY_DATABASE_URI)
+READONLY_BIND = "readonly"
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+def sqlite_readonly_uri(uri):
+    """Read-only URI for a SQLite database file, or None for other databases."""
+    if not uri:
+        return None
+    url = sa.engine.make_url(uri)
+    if url.get_backend_name() != "sqlite" or url.database in (None, "", ":memory:"):
+        return None
+    database = url.database if url.query.get("uri") else f"file:{url.database}"
+    url = url.set(database=database).update_query_dict({"mode": "ro", "uri": "true"})
+    return url.render_as_string(hide_password=False)
+
+
+def configure_read_routing(app):
+    """Register the read-only engine as a bind; call before db.init_app."""
+    uri = app.config.get("SQLALCHEMY_READONLY_DATABASE_URI")
+    if not uri and app.config.get("SQLITE_READONLY_ENGINE"):
+        uri = sqlite_readonly_uri(app.config.get("SQLALCHEMY_DATABASE_URI"))
+    if uri:
+        binds = dict(app.config.get("SQLALCHEMY_BINDS") or {})
+        binds[READONLY_BIND] = uri
+        app.config["SQLALCHEMY_BINDS"] = binds
+
+
+def pin_to_primary():
+    """Send the rest of this request's statements to the read-write engine.
+
+    Called automatically after the first flush of a request, so reads that
+    follow a write see it even if the read-only engine lags behind.
+    """
+    if has_request_context():
+        g.pin_primary = True
+
+
+class RoutingSession(Session):
+    """Session sending the SELECTs of safe requests to the read-only engine.
+
+    Everything else (writes, CLI commands, non-GET requests, and any
+    request pinned with pin_to_primary) uses the primary engine.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self._reads_from_replica(clause):
+            return self._db.engines[READONLY_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _reads_from_replica(self, clause):
+        if not isinstance(clause, (sa.Select, sa.CompoundSelect)):
+            return False
+        if not has_request_context() or request.method not in SAFE_METHODS:
+            return False
+        if g.get("pin_primary") or self._flushing or self.new or self.dirty or self.deleted:
+            return False
+        return READONLY_BIND in self._db.engines
+
+
+@sa.event.listens_for(RoutingSession, "after_flush")
+def _pin_after_write(session, flush_context):
+    pin_to_primary()
@@ -2,24 +2,50 @@ from .user import (
     UserRegisterSchema,
     UserLoginSchema,
     UserSchema,
-    UserRoleSchema
+    UserRoleSchema,
+    UserStatsSchema
 )
 from .joke import (
     JokeCreateSchema,
     JokeUpdateSchema,
     JokeSchema,
+    JokeFilterArgsSchema,
+    JokeFacetArgsSchema,
+    JokeFieldsArgsSchema,
     JokeListQueryArgsSchema,
-    JokeListResponseSchema
+    JokeListResponseSchema,
+    JokeBatchArgsSchema,
+    JokeBatchResponseSchema,
+    JokeBulkUpdateSchema,
+    JokeBulkUpdateResultSchema,
+    JokeExportQueryArgsSchema,
+    JokeRandomQueryArgsSchema,
+    JokeFacetsSchema,
+    JokeImportResultSchema
 )
+from .rows import RowSerializer
 
 __all__ = [
     "UserRegisterSchema",
     "UserLoginSchema",
     "UserSchema",
     "UserRoleSchema",
+    "UserStatsSchema",
     "JokeCreateSchema",
     "JokeUpdateSchema",
     "JokeSchema",
+    "JokeFilterArgsSchema",
+    "JokeFacetArgsSchema",
+    "JokeFieldsArgsSchema",
     "JokeListQueryArgsSchema",
     "JokeListResponseSchema",
+    "JokeBatchArgsSchema",
+    "JokeBatchResponseSchema",
+    "JokeBulkUpdateSchema",
+    "JokeBulkUpdateResultSchema",
+    "JokeExportQueryArgsSchema",
+    "JokeRandomQueryArgsSchema",
+    "JokeFacetsSchema",
+    "JokeImportResultSchema",
+    "RowSerializer",
 ]
\ No newline at end of file
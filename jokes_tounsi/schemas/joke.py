@@ -1,4 +1,56 @@
-from marshmallow import Schema, fields, validate
+from marshmallow import Schema, fields, validate, validates_schema, ValidationError
+
+from ..utils.pagination import decode_cursor
+
+
+class CursorField(fields.String):
+    """Opaque keyset cursor; an empty value asks for the first page."""
+
+    def _deserialize(self, value, attr, data, **kwargs):
+        value = super()._deserialize(value, attr, data, **kwargs)
+        if not value:
+            return None
+        try:
+            return decode_cursor(value)
+        except ValueError as e:
+            raise ValidationError("Invalid cursor.") from e
+
+
+class SparseFieldsetField(fields.String):
+    """Comma-separated field names of `schema`, returned in schema order."""
+
+    def __init__(self, schema, **kwargs):
+        super().__init__(**kwargs)
+        self.schema = schema
+
+    def _deserialize(self, value, attr, data, **kwargs):
+        value = super()._deserialize(value, attr, data, **kwargs)
+        names = {name.strip() for name in value.split(",") if name.strip()}
+        if not names:
+            return None
+        valid = list(self.schema._declared_fields)
+        unknown = sorted(names.difference(valid))
+        if unknown:
+            raise ValidationError(
+                f"Unknown fields: {', '.join(unknown)}. Valid fields: {', '.join(valid)}."
+            )
+        return tuple(name for name in valid if name in names)
+
+
+class IdListField(fields.Field):
+    """Joke ids, as a JSON list or a comma-separated string."""
+
+    default_error_messages = {"invalid": "Not a list of integer ids."}
+
+    def _deserialize(self, value, attr, data, **kwargs):
+        if isinstance(value, str):
+            value = [part for part in value.split(",") if part.strip()]
+        if not isinstance(value, list):
+            raise self.make_error("invalid")
+        try:
+            return [int(part) for part in value]
+        except (TypeError, ValueError) as e:
+            raise self.make_error("invalid") from e
 
 
 class JokeCreateSchema(Schema):
@@ -39,6 +91,19 @@ class JokeUpdateSchema(Schema):
     is_published = fields.Boolean(allow_none=True)
 
 
+class JokeImportErrorSchema(Schema):
+    line = fields.Int()
+    errors = fields.Dict()
+
+
+class JokeImportResultSchema(Schema):
+    """Outcome of an NDJSON bulk import."""
+    
+    inserted = fields.Int()
+    failed = fields.Int()
+    errors = fields.List(fields.Nested(JokeImportErrorSchema))
+
+
 class JokeSchema(Schema):
     id = fields.Int(dump_only=True)
     text_tn = fields.Str(required=True)
@@ -58,25 +123,117 @@ class JokeSchema(Schema):
 
 
 
-class JokeListQueryArgsSchema(Schema):
-    """Schema for query parameters when listing jokes."""
-    
-    page = fields.Integer(load_default=1, validate=validate.Range(min=1))
-    per_page = fields.Integer(load_default=20, validate=validate.Range(min=1, max=100))
+class JokeFilterArgsSchema(Schema):
+    """Schema for the classification filters shared by joke listings."""
     
-    # Filters
     age_group = fields.String(allow_none=True)
     era = fields.String(allow_none=True)
     region = fields.String(allow_none=True)
     acceptability = fields.String(allow_none=True)
     delivery_type = fields.String(allow_none=True)
+
+
+class JokeFacetArgsSchema(JokeFilterArgsSchema):
+    """Schema for the facet counts: the listing filters and search term."""
+    
+    q = fields.String(allow_none=True)  # Full text search
+
+
+class JokeFieldsArgsSchema(Schema):
+    """Schema for the sparse fieldset parameter of joke responses."""
+    
+    # e.g. fields=id,text_tn: only these columns are read and returned
+    only = SparseFieldsetField(JokeSchema, data_key="fields")
+
+
+class JokeListQueryArgsSchema(JokeFilterArgsSchema, JokeFieldsArgsSchema):
+    """Schema for query parameters when listing jokes."""
+    
+    page = fields.Integer(load_default=1, validate=validate.Range(min=1))
+    per_page = fields.Integer(load_default=20, validate=validate.Range(min=1, max=100))
+    
+    # Keyset pagination: pass an empty cursor for the first page, then the
+    # returned next_cursor. Ignores `page` when present.
+    cursor = CursorField()
+    # Total count is computed by default in page mode only
+    include_total = fields.Boolean()
     
     # Search
     q = fields.String(allow_none=True)  # Full text search
 
 
+class JokeBatchArgsSchema(JokeFieldsArgsSchema):
+    """Schema for the ids of a batch get (query string or JSON body)."""
+    
+    ids = IdListField(required=True, validate=validate.Length(min=1, max=100))
+
+
+class JokeBulkFilterSchema(JokeFilterArgsSchema):
+    """Jokes targeted by a bulk update: classifications, status, author."""
+    
+    is_published = fields.Boolean(allow_none=True)
+    author_id = fields.Integer(allow_none=True)
+
+
+class JokeBulkUpdateSchema(Schema):
+    """Schema for an admin bulk update: one patch applied to ids or a filter."""
+    
+    ids = IdListField(validate=validate.Length(min=1, max=10000))
+    filter = fields.Nested(JokeBulkFilterSchema)
+    patch = fields.Nested(JokeUpdateSchema, required=True)
+    
+    @validates_schema
+    def validate_target(self, data, **kwargs):
+        if ("ids" in data) == ("filter" in data):
+            raise ValidationError("Give either ids or filter.")
+        if "filter" in data and all(value is None for value in data["filter"].values()):
+            raise ValidationError("The filter needs at least one criterion.", "filter")
+
+
+class JokeBulkUpdateResultSchema(Schema):
+    updated = fields.Int()
+
+
+class JokeRandomQueryArgsSchema(JokeFieldsArgsSchema):
+    """Schema for query parameters when picking a random joke."""
+    
+    region = fields.String(allow_none=True)
+    age_group = fields.String(allow_none=True)
+
+
+class JokeExportQueryArgsSchema(JokeFilterArgsSchema):
+    """Schema for query parameters when exporting jokes."""
+    
+    format = fields.String(load_default="ndjson", validate=validate.OneOf(["ndjson", "csv"]))
+    q = fields.String(allow_none=True)  # Full text search
+
+
 class JokeListResponseSchema(Schema):
     page = fields.Int()
     per_page = fields.Int()
-    total = fields.Int()
+    total = fields.Int(allow_none=True)
+    next_cursor = fields.Str(allow_none=True)
     items = fields.List(fields.Nested(JokeSchema))
+
+
+class JokeBatchResponseSchema(Schema):
+    # One entry per requested id, in request order: null if not found
+    items = fields.List(fields.Nested(JokeSchema, allow_none=True))
+    not_found = fields.List(fields.Int())
+
+
+class FacetValueSchema(Schema):
+    value = fields.Str(allow_none=True)
+    count = fields.Int()
+
+
+class JokeFacetsSchema(Schema):
+    """Per-value counts of each classification among published jokes."""
+    
+    era = fields.List(fields.Nested(FacetValueSchema))
+    region = fields.List(fields.Nested(FacetValueSchema))
+    age_group = fields.List(fields.Nested(FacetValueSchema))
+    acceptability = fields.List(fields.Nested(FacetValueSchema))
+    delivery_type = fields.List(fields.Nested(FacetValueSchema))
+    tone = fields.List(fields.Nested(FacetValueSchema))
+    rhythm = fields.List(fields.Nested(FacetValueSchema))
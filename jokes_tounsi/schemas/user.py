@@ -39,4 +39,21 @@ class UserRoleSchema(Schema):
     role = fields.String(
         required=True,
         validate=validate.OneOf(["user", "contributor", "admin"])
-    )
\ No newline at end of file
+    )
+
+class RegionStatsSchema(Schema):
+    """An author's jokes in one region (null: no region set)."""
+    
+    region = fields.String(allow_none=True)
+    total = fields.Integer()
+    published = fields.Integer()
+    drafts = fields.Integer()
+
+
+class UserStatsSchema(Schema):
+    """Counts of a user's jokes, overall and per region (largest first)."""
+    
+    total = fields.Integer()
+    published = fields.Integer()
+    drafts = fields.Integer()
+    regions = fields.List(fields.Nested(RegionStatsSchema))
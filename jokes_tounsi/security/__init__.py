@@ -1,3 +1,14 @@
-from .roles import role_required
+from .roles import role_required, current_user_id, current_role
+from .passwords import PasswordHasher, hash_password, verify_password, password_needs_rehash
+from .oauth import google_client
 
-__all__ = ["role_required"]
\ No newline at end of file
+__all__ = [
+    "role_required",
+    "current_user_id",
+    "current_role",
+    "PasswordHasher",
+    "hash_password",
+    "verify_password",
+    "password_needs_rehash",
+    "google_client",
+]
\ No newline at end of file
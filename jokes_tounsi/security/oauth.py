@@ -0,0 +1,30 @@
+import threading
+
+from flask import current_app
+
+_lock = threading.Lock()
+
+
+def google_client():
+    """
+    The app's authlib client for Google sign-in, registered on first use.
+
+    Importing authlib and registering the client are left out of
+    create_app: most workers never serve a Google sign-in.
+    """
+    app = current_app._get_current_object()
+    client = app.extensions.get("google_oauth")
+    if client is None:
+        with _lock:
+            client = app.extensions.get("google_oauth")
+            if client is None:
+                from authlib.integrations.flask_client import OAuth
+                client = OAuth(app).register(
+                    name="google",
+                    client_id=app.config["GOOGLE_CLIENT_ID"],
+                    client_secret=app.config["GOOGLE_CLIENT_SECRET"],
+                    server_metadata_url=app.config["GOOGLE_SERVER_METADATA_URL"],
+                    client_kwargs={"scope": "openid email profile"},
+                )
+                app.extensions["google_oauth"] = client
+    return client
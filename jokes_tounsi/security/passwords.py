@@ -0,0 +1,113 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from flask import current_app
+from werkzeug.exceptions import ServiceUnavailable
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, generate_password_hash, check_password_hash
+
+
+def normalize_method(method):
+    """werkzeug's spelling of a hash method, as stored in the hashes it makes.
+
+    Fills in the default parameters the way generate_password_hash does
+    ("scrypt" -> "scrypt:32768:8:1"), without deriving a key.
+    """
+    name, *args = method.split(":")
+    if name == "scrypt":
+        n, r, p = map(int, args) if args else (2**15, 8, 1)
+        return f"scrypt:{n}:{r}:{p}"
+    if name == "pbkdf2":
+        hash_name = args[0] if args else "sha256"
+        iterations = int(args[1]) if len(args) > 1 else DEFAULT_PBKDF2_ITERATIONS
+        return f"pbkdf2:{hash_name}:{iterations}"
+    raise ValueError(f"Invalid hash method '{method}'.")
+
+
+class PasswordHasher:
+    """Runs password key derivation in a bounded process pool.
+
+    pbkdf2/scrypt are CPU-bound for tens of milliseconds; doing them in the
+    request thread lets a burst of logins starve every other endpoint.
+    `workers` processes do the hashing, and at most `max_pending` calls may
+    wait for them; callers beyond that get a 503 instead of queueing.
+    With `workers=0` hashing runs inline (tests, scripts).
+    """
+
+    def __init__(self, method, salt_length=16, workers=2, max_pending=32, timeout=10):
+        self.method = method
+        self.salt_length = salt_length
+        self.workers = workers
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        # Compared with the prefix of stored hashes to detect outdated ones
+        self._normalized_method = normalize_method(method)
+
+    def hash(self, password):
+        return self._run(
+            generate_password_hash, password,
+            method=self.method, salt_length=self.salt_length
+        )
+
+    def verify(self, pwhash, password):
+        if not pwhash:
+            return False
+        return self._run(check_password_hash, pwhash, password)
+
+    def needs_rehash(self, pwhash):
+        """True if `pwhash` was made with other parameters than the configured ones."""
+        if not pwhash:
+            return False
+        return pwhash.split("$", 1)[0] != self._normalized_method
+
+    def shutdown(self):
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def _run(self, fn, *args, **kwargs):
+        if not self.workers:
+            return fn(*args, **kwargs)
+
+        if not self._slots.acquire(blocking=False):
+            raise ServiceUnavailable("Too many concurrent password checks, retry shortly")
+        try:
+            future = self._get_executor().submit(fn, *args, **kwargs)
+            return future.result(timeout=self.timeout)
+        finally:
+            self._slots.release()
+
+    def _get_executor(self):
+        # Created lazily so every gunicorn worker gets its own pool after fork
+        with self._executor_lock:
+            if self._executor is None:
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context(
+                    "forkserver" if "forkserver" in methods else "spawn"
+                )
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=context
+                )
+            return self._executor
+
+
+def _hasher():
+    return current_app.extensions["password_hasher"]
+
+
+def hash_password(password):
+    """Hash a password with the configured method, off the request thread."""
+    return _hasher().hash(password)
+
+
+def verify_password(pwhash, password):
+    """Check a password against a stored hash, off the request thread."""
+    return _hasher().verify(pwhash, password)
+
+
+def password_needs_rehash(pwhash):
+    """True if a stored hash should be upgraded to the configured parameters."""
+    return _hasher().needs_rehash(pwhash)
@@ -1,5 +1,5 @@
 from functools import wraps
-from flask_jwt_extended import verify_jwt_in_request, get_jwt
+from flask_jwt_extended import verify_jwt_in_request, get_jwt, get_jwt_identity
 from flask import abort
 
 
@@ -28,4 +28,14 @@ def role_required(*allowed_roles):
             return fn(*args, **kwargs)
         
         return wrapper
-    return decorator
\ No newline at end of file
+    return decorator
+
+
+def current_user_id():
+    """Id of the authenticated user, from the JWT identity (no DB lookup)."""
+    return int(get_jwt_identity())
+
+
+def current_role():
+    """Role of the authenticated user, from the JWT claims set at login."""
+    return get_jwt().get("role", "user")
@@ -1,3 +1,51 @@
 from .logging_config import configure_logging
+from .pagination import encode_cursor, decode_cursor
+from .http_cache import make_etag, cache_headers, not_modified
+from .compression import (
+    CompressedBodyCache,
+    ResponseCompressor,
+    negotiate_encoding,
+    precompressed_response
+)
+from .joke_pool import PublishedIdPool, published_ids
+from .user_cache import UserProfileCache, get_user_profile, invalidate_user_profile
+from .sqlite import WalCheckpointer, configure_sqlite
+from .metrics import MetricsRegistry, init_metrics, server_timing
+from .query_budget import QueryBudgetExceeded, init_query_budgets, query_budget, stream_with_budget
+from .token_blocklist import (
+    TokenBlocklist,
+    init_token_blocklist,
+    revoke_current_token,
+    prune_revoked_tokens
+)
 
-__all__ = ["configure_logging"]
\ No newline at end of file
+__all__ = [
+    "configure_logging",
+    "encode_cursor",
+    "decode_cursor",
+    "make_etag",
+    "cache_headers",
+    "not_modified",
+    "CompressedBodyCache",
+    "ResponseCompressor",
+    "negotiate_encoding",
+    "precompressed_response",
+    "PublishedIdPool",
+    "published_ids",
+    "UserProfileCache",
+    "get_user_profile",
+    "invalidate_user_profile",
+    "WalCheckpointer",
+    "configure_sqlite",
+    "MetricsRegistry",
+    "init_metrics",
+    "server_timing",
+    "QueryBudgetExceeded",
+    "init_query_budgets",
+    "query_budget",
+    "stream_with_budget",
+    "TokenBlocklist",
+    "init_token_blocklist",
+    "revoke_current_token",
+    "prune_revoked_tokens",
+]
\ No newline at end of file
@@ -0,0 +1,185 @@
+import gzip
+import threading
+import zlib
+from collections import OrderedDict
+
+from flask import current_app, request, Response
+from werkzeug.datastructures import ETags
+
+# Supported content codings, in server preference order, with the zlib
+# window bits producing their framing (gzip header or zlib wrapper)
+CONTENT_CODINGS = {"gzip": 31, "deflate": 15}
+
+
+def negotiate_encoding(accept_encoding):
+    """Best supported coding allowed by an Accept-Encoding header, or None."""
+    best = None
+    for coding in CONTENT_CODINGS:
+        quality = accept_encoding[coding]  # also matches "*"
+        if quality and (best is None or quality > best[1]):
+            best = (coding, quality)
+    return best[0] if best else None
+
+
+def compress(data, coding, level):
+    """Compress a whole body. gzip output has no timestamp, so it is reproducible."""
+    if coding == "gzip":
+        return gzip.compress(data, compresslevel=level, mtime=0)
+    return zlib.compress(data, level)
+
+
+def compress_stream(chunks, coding, level):
+    """Compress an iterable of byte chunks incrementally."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, CONTENT_CODINGS[coding])
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def variant_etag(etag, coding):
+    """Strong ETag of the `coding`-encoded representation."""
+    return f"{etag}-{coding}"
+
+
+class CompressedBodyCache:
+    """Thread-safe LRU of compressed bodies, bounded by total size in bytes."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+            return body
+
+    def put(self, key, body):
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = body
+            self._size += len(body)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+class ResponseCompressor:
+    """after_request hook applying negotiated gzip/deflate compression.
+
+    Bodies below `min_size` bytes or of other mimetypes are sent as is.
+    Compressed bodies of responses with a strong ETag are kept in a
+    CompressedBodyCache, keyed by path and ETag, so a page served again
+    costs a lookup instead of a compression. Others (random picks, batch
+    results, auth payloads) are one-off and compressed inline without being
+    stored, so they do not evict the reusable entries. Streamed responses
+    (exports) are compressed chunk by chunk on the way out.
+    The ETag of a compressed response gets a per-coding suffix, keeping
+    validators distinct per representation.
+    """
+
+    def __init__(self, min_size=1024, level=6, mimetypes=(), cache_max_bytes=0):
+        self.min_size = min_size
+        self.level = level
+        self.mimetypes = frozenset(mimetypes)
+        self.cache = CompressedBodyCache(cache_max_bytes) if cache_max_bytes else None
+
+    def init_app(self, app):
+        app.after_request(self.after_request)
+
+    def after_request(self, response):
+        if response.status_code == 304:
+            response.vary.add("Accept-Encoding")
+            return response
+        if (
+            response.status_code != 200
+            or request.method == "HEAD"
+            or "Content-Encoding" in response.headers
+            or response.mimetype not in self.mimetypes
+        ):
+            return response
+
+        response.vary.add("Accept-Encoding")
+        coding = negotiate_encoding(request.accept_encodings)
+        if coding is None:
+            return response
+
+        etag, weak = response.get_etag()
+        if response.is_streamed:
+            response.response = compress_stream(response.iter_encoded(), coding, self.level)
+            response.headers.pop("Content-Length", None)
+        else:
+            body = response.get_data()
+            if len(body) < self.min_size:
+                return response
+            response.set_data(self._compressed(body, coding, etag, weak))
+
+        response.headers["Content-Encoding"] = coding
+        if etag:
+            response.set_etag(variant_etag(etag, coding), weak=weak)
+        return response
+
+    def cached(self, etag):
+        """(coding, body) stored for `etag` at this path in the negotiated coding, or None."""
+        coding = negotiate_encoding(request.accept_encodings)
+        if self.cache is None or coding is None:
+            return None
+        body = self.cache.get((request.path, etag, coding))
+        return (coding, body) if body is not None else None
+
+    def _compressed(self, body, coding, etag, weak):
+        if self.cache is None or not etag or weak:
+            return compress(body, coding, self.level)
+
+        key = (request.path, etag, coding)
+        compressed = self.cache.get(key)
+        if compressed is None:
+            compressed = compress(body, coding, self.level)
+            self.cache.put(key, compressed)
+        return compressed
+
+
+def precompressed_response(etag, headers, mimetype="application/json"):
+    """Serve a representation already compressed under strong `etag`, if cached.
+
+    Lets a view skip its query and serialization entirely; `headers` are
+    the validators it would have sent. Returns None on a miss.
+    """
+    compressor = current_app.extensions.get("compressor")
+    hit = compressor.cached(etag) if compressor is not None else None
+    if hit is None:
+        return None
+    coding, body = hit
+    response = Response(body, mimetype=mimetype, headers=headers)
+    response.headers["Content-Encoding"] = coding
+    response.set_etag(variant_etag(etag, coding))
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+def matching_etag(if_none_match, etag):
+    """The tag of `etag`'s representations (plain or compressed) listed in `if_none_match`.
+
+    Uses the weak comparison RFC 9110 prescribes for If-None-Match, so a
+    tag weakened by a proxy (W/"...") still matches.
+    """
+    if not isinstance(if_none_match, ETags):
+        return None
+    for candidate in (etag, *(variant_etag(etag, coding) for coding in CONTENT_CODINGS)):
+        if if_none_match.contains_weak(candidate):
+            return candidate
+    return None
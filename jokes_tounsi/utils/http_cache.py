@@ -0,0 +1,58 @@
+import hashlib
+import json
+from datetime import timezone
+
+from flask import request, make_response
+from werkzeug.http import http_date, quote_etag
+
+from .compression import matching_etag
+
+
+def make_etag(*parts):
+    """Build a strong ETag value from JSON-serializable parts."""
+    data = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha1(data.encode("utf-8")).hexdigest()
+
+
+def _http_date(value):
+    """Naive datetimes from the database are UTC, truncated to seconds for HTTP."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.replace(microsecond=0)
+
+
+def cache_headers(etag, last_modified=None):
+    """Validator headers for a response that clients must revalidate."""
+    headers = {"ETag": quote_etag(etag), "Cache-Control": "no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(_http_date(last_modified))
+    return headers
+
+
+def not_modified(etag, last_modified=None):
+    """Return a 304 response if the request's validators are still fresh.
+
+    If-None-Match takes precedence over If-Modified-Since (RFC 9110), and
+    matches the compressed representations' ETags too; the 304 repeats the
+    tag the client holds. Returns None when the full response must be sent.
+    """
+    if request.method not in ("GET", "HEAD"):
+        return None
+
+    if request.if_none_match:
+        matched = matching_etag(request.if_none_match, etag)
+        fresh = matched is not None
+        etag = matched or etag
+    elif request.if_modified_since and last_modified is not None:
+        fresh = _http_date(last_modified) <= request.if_modified_since
+    else:
+        fresh = False
+
+    if not fresh:
+        return None
+
+    response = make_response("", 304)
+    response.headers.update(cache_headers(etag, last_modified))
+    return response
@@ -0,0 +1,64 @@
+import threading
+from array import array
+from collections import OrderedDict
+
+from flask import current_app
+
+from ..extensions import db
+from ..models import Joke, DataVersion, PUBLISHED_JOKES
+
+
+class PublishedIdPool:
+    """Per-process arrays of published joke ids, one per filter combination.
+
+    Arrays are tagged with the PUBLISHED_JOKES version, which triggers bump
+    only when a published joke is added or removed or its region/age group
+    changes (from any worker). Text edits and draft writes keep the arrays,
+    so picking a random joke costs one version lookup and an index into a
+    compact array instead of ORDER BY RANDOM().
+    Where versions are not tracked (not SQLite) the ids are loaded per call.
+    """
+
+    def __init__(self, max_entries=32):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # filters -> (version, array of ids)
+        self._lock = threading.Lock()
+
+    def ids(self, **filters):
+        """Sorted published ids matching the equality `filters`."""
+        key = tuple(sorted((column, value) for column, value in filters.items() if value))
+        version, _ = DataVersion.current(PUBLISHED_JOKES)
+        if version is None:
+            # Writes are not versioned on this database: nothing to cache against
+            return self._load(key)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                return entry[1]
+
+        ids = self._load(key)
+
+        with self._lock:
+            self._entries[key] = (version, ids)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return ids
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    @staticmethod
+    def _load(key):
+        query = db.select(Joke.id).where(Joke.is_published == db.true())
+        for column, value in key:
+            query = query.where(getattr(Joke, column) == value)
+        return array("q", db.session.execute(query.order_by(Joke.id)).scalars())
+
+
+def published_ids(**filters):
+    """Ids from the current app's pool (see PublishedIdPool.ids)."""
+    return current_app.extensions["published_ids"].ids(**filters)
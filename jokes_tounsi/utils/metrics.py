@@ -0,0 +1,265 @@
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import Response, current_app, g, request
+from flask_sqlalchemy.record_queries import get_recorded_queries
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# name -> (type, help, histogram buckets)
+METRICS = {
+    "http_requests_total": ("counter", "Requests by endpoint, method and status.", None),
+    "http_request_errors_total": ("counter", "Requests answered with a 5xx status.", None),
+    "http_requests_in_flight": ("gauge", "Requests being processed.", None),
+    "http_request_duration_seconds": ("histogram", "Request latency.", LATENCY_BUCKETS),
+    "db_queries_per_request": ("histogram", "SQL statements executed per request.", QUERY_COUNT_BUCKETS),
+    "db_seconds_per_request": ("histogram", "Time spent in SQL per request.", LATENCY_BUCKETS),
+}
+
+
+class MetricsRegistry:
+    """Thread-safe counters, gauges and histograms of one process.
+
+    Samples are keyed by metric name and a tuple of (label, value) pairs.
+    With a `directory`, a background thread writes the process's samples
+    to `<directory>/metrics-<pid>.json` every `flush_interval` seconds so
+    that /metrics in any gunicorn worker can sum up all of them.
+    """
+
+    def __init__(self, directory=None, flush_interval=1.0):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._values = {}  # (name, labels) -> number, or [bucket counts, sum, count]
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._pid = None
+
+    def inc(self, name, labels=(), value=1):
+        with self._lock:
+            key = (name, labels)
+            self._values[key] = self._values.get(key, 0) + value
+            self._dirty = True
+
+    def observe(self, name, labels, value):
+        buckets = METRICS[name][2]
+        with self._lock:
+            entry = self._values.get((name, labels))
+            if entry is None:
+                entry = self._values[(name, labels)] = [[0] * len(buckets), 0.0, 0]
+            for index, bound in enumerate(buckets):
+                if value <= bound:
+                    entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+            self._dirty = True
+
+    def snapshot(self):
+        with self._lock:
+            return [
+                [name, [list(label) for label in labels], value if not isinstance(value, list)
+                 else [list(value[0]), value[1], value[2]]]
+                for (name, labels), value in self._values.items()
+            ]
+
+    # Cross-process aggregation
+
+    def ensure_flusher(self):
+        """Start this process's flush thread (once per pid, so once per worker)."""
+        if not self.directory or self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            threading.Thread(target=self._run, name="metrics-flush", daemon=True).start()
+
+    def flush(self):
+        """Write this process's samples atomically."""
+        with self._lock:
+            if not self._dirty:
+                return
+            self._dirty = False
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"metrics-{os.getpid()}.json")
+        with open(f"{path}.tmp", "w") as f:
+            json.dump({"pid": os.getpid(), "samples": self.snapshot()}, f)
+        os.replace(f"{path}.tmp", path)
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except OSError as e:
+                logger.warning(f"Metrics flush failed: {str(e)}")
+
+    def collect(self):
+        """Samples of every worker, summed. Gauges only count live processes."""
+        if not self.directory:
+            return _merge([(os.getpid(), self.snapshot())])
+
+        self.flush()
+        processes = []
+        for path in glob.glob(os.path.join(self.directory, "metrics-*.json")):
+            try:
+                with open(path) as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue  # Removed or being replaced
+            processes.append((data["pid"], data["samples"]))
+        return _merge(processes)
+
+
+def _alive(pid):
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _merge(processes):
+    merged = {}
+    for pid, samples in processes:
+        alive = None
+        for name, labels, value in samples:
+            if METRICS[name][0] == "gauge":
+                alive = _alive(pid) if alive is None else alive
+                if not alive:
+                    continue
+            key = (name, tuple(tuple(label) for label in labels))
+            if not isinstance(value, list):
+                merged[key] = merged.get(key, 0) + value
+                continue
+            entry = merged.setdefault(key, [[0] * len(value[0]), 0.0, 0])
+            entry[0] = [a + b for a, b in zip(entry[0], value[0])]
+            entry[1] += value[1]
+            entry[2] += value[2]
+    return merged
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (
+        (key, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for key, value in pairs
+    )
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render(samples):
+    """Prometheus text exposition format (version 0.0.4)."""
+    lines = []
+    for name, (kind, help_text, buckets) in METRICS.items():
+        series = sorted((labels, value) for (sample, labels), value in samples.items() if sample == name)
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in series:
+            if kind != "histogram":
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+                continue
+            counts, total, count = value
+            for bound, bucket_count in zip(buckets, counts):
+                lines.append(f"{name}_bucket{_format_labels(labels, [('le', bound)])} {bucket_count}")
+            lines.append(f"{name}_bucket{_format_labels(labels, [('le', '+Inf')])} {count}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{name}_count{_format_labels(labels)} {count}")
+    return "\n".join(lines) + "\n"
+
+
+# Per-request instrumentation
+
+@contextmanager
+def server_timing(name):
+    """Add the time spent in the block to the request's `name` Server-Timing entry."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings = g.setdefault("_server_timing", {})
+        timings[name] = timings.get(name, 0.0) + time.perf_counter() - start
+
+
+def request_queries():
+    """Statements recorded since the current request started."""
+    return get_recorded_queries()[g.get("_metrics_query_offset", 0):]
+
+
+def _labels():
+    return (("endpoint", request.endpoint or "unmatched"), ("method", request.method))
+
+
+def _before_request():
+    current_app.extensions["metrics"].ensure_flusher()
+    g._metrics_start = time.perf_counter()
+    # The app context (and its recorded queries) may outlive one request
+    g._metrics_query_offset = len(get_recorded_queries())
+    g._metrics_in_flight = True
+    g._server_timing = {}
+    current_app.extensions["metrics"].inc("http_requests_in_flight")
+
+
+def _after_request(response):
+    start = g.pop("_metrics_start", None)
+    if start is None:
+        return response
+    metrics = current_app.extensions["metrics"]
+    total = time.perf_counter() - start
+    queries = request_queries()
+    db_time = sum(query.duration for query in queries)
+
+    labels = _labels()
+    metrics.inc("http_requests_total", labels + (("status", response.status_code),))
+    if response.status_code >= 500:
+        metrics.inc("http_request_errors_total", labels + (("status", response.status_code),))
+    metrics.observe("http_request_duration_seconds", labels, total)
+    metrics.observe("db_queries_per_request", labels, len(queries))
+    metrics.observe("db_seconds_per_request", labels, db_time)
+
+    timings = g.pop("_server_timing", {})
+    if current_app.config.get("SERVER_TIMING"):
+        entries = [f'db;dur={db_time * 1000:.2f};desc="{len(queries)} queries"']
+        entries += [f"{name};dur={seconds * 1000:.2f}" for name, seconds in timings.items()]
+        entries.append(f"total;dur={total * 1000:.2f}")
+        response.headers["Server-Timing"] = ", ".join(entries)
+    return response
+
+
+def _teardown_request(exc):
+    if g.pop("_metrics_in_flight", False):
+        current_app.extensions["metrics"].inc("http_requests_in_flight", value=-1)
+
+
+def metrics_view():
+    samples = current_app.extensions["metrics"].collect()
+    return Response(render(samples), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+def init_metrics(app):
+    """Record request metrics, serve them at /metrics, and add Server-Timing if enabled."""
+    app.extensions["metrics"] = MetricsRegistry(
+        directory=app.config.get("METRICS_DIR"),
+        flush_interval=app.config.get("METRICS_FLUSH_INTERVAL", 1.0)
+    )
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
+    app.add_url_rule("/metrics", "metrics", metrics_view)
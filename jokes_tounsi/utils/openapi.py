@@ -0,0 +1,58 @@
+import hashlib
+import json
+import logging
+import threading
+
+from flask import Response
+from werkzeug.http import quote_etag
+
+from .http_cache import not_modified
+from .compression import precompressed_response
+
+logger = logging.getLogger(__name__)
+
+
+def init_openapi_spec(app, api):
+    """
+    Serve /openapi.json as bytes built once per process.
+
+    The document is read from OPENAPI_SPEC_FILE (written at build time by
+    `flask openapi write`) or generated on first request, and served with
+    a strong ETag and a public max-age of OPENAPI_CACHE_MAX_AGE seconds.
+    """
+    endpoint = next(
+        rule.endpoint for rule in app.url_map.iter_rules() if rule.endpoint.endswith(".openapi_json")
+    )
+    document = {}
+    lock = threading.Lock()
+
+    def load():
+        with lock:
+            if document:
+                return document
+            path = app.config.get("OPENAPI_SPEC_FILE")
+            body = None
+            if path:
+                try:
+                    with open(path, "rb") as f:
+                        body = f.read()
+                except OSError as e:
+                    logger.warning(f"Prebuilt OpenAPI spec unavailable, generating it: {str(e)}")
+            if body is None:
+                body = json.dumps(api.spec.to_dict(), indent=2).encode("utf-8")
+            document.update(body=body, etag=hashlib.sha1(body).hexdigest())
+            return document
+
+    def openapi_json():
+        spec = document or load()
+        headers = {
+            "ETag": quote_etag(spec["etag"]),
+            "Cache-Control": f"public, max-age={app.config['OPENAPI_CACHE_MAX_AGE']}",
+        }
+        cached = not_modified(spec["etag"]) or precompressed_response(spec["etag"], headers)
+        if cached is not None:
+            cached.headers["Cache-Control"] = headers["Cache-Control"]
+            return cached
+        return Response(spec["body"], mimetype="application/json", headers=headers)
+
+    app.view_functions[endpoint] = openapi_json
@@ -0,0 +1,22 @@
+import base64
+import json
+from datetime import datetime
+
+
+def encode_cursor(created_at, joke_id):
+    """Encode the (created_at, id) position of a row as an opaque token."""
+    payload = json.dumps([created_at.isoformat(), joke_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token):
+    """Decode a token made by encode_cursor.
+
+    Raises ValueError if the token is malformed.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        created_at, joke_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(created_at), int(joke_id)
+    except (TypeError, ValueError, UnicodeError) as e:
+        raise ValueError("Invalid cursor") from e
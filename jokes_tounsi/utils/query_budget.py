@@ -0,0 +1,112 @@
+import logging
+from collections import defaultdict
+
+from flask import current_app, g, request, stream_with_context
+from flask_sqlalchemy.record_queries import get_recorded_queries
+
+from .metrics import request_queries
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A request ran more SQL statements than its route allows (raised in tests)."""
+
+
+def query_budget(max_queries, allow_repeats=False):
+    """
+    Declare the SQL budget of a view; put it right under @blp.route.
+
+    `max_queries` caps the statements one request may run (None: no cap).
+    Unless `allow_repeats`, running the same statement twice with
+    different parameters is flagged as an N+1 pattern (e.g. a lazy load
+    per listed item). Views streaming their body must wrap it in
+    stream_with_budget() for its queries to count.
+    """
+    def decorator(fn):
+        fn._query_budget = (max_queries, allow_repeats)
+        return fn
+    return decorator
+
+
+def _repeated_statements(queries):
+    """Statements executed with several distinct parameter sets."""
+    parameters = defaultdict(set)
+    locations = defaultdict(set)
+    for query in queries:
+        parameters[query.statement].add(repr(query.parameters))
+        locations[query.statement].add(query.location)
+    return {
+        statement: sorted(locations[statement])
+        for statement, params in parameters.items()
+        if len(params) > 1
+    }
+
+
+def _route_budget():
+    view = current_app.view_functions.get(request.endpoint)
+    budget = getattr(view, "_query_budget", None)
+    if budget is None:
+        budget = (current_app.config.get("QUERY_BUDGET_DEFAULT"), False)
+    return budget
+
+
+def _check(queries, budget):
+    max_queries, allow_repeats = budget
+    problems = []
+    if max_queries is not None and len(queries) > max_queries:
+        problems.append(f"{len(queries)} queries, budget {max_queries}")
+    if not allow_repeats:
+        for statement, locations in _repeated_statements(queries).items():
+            problems.append(
+                f"repeated statement (possible N+1) from {', '.join(locations)}: "
+                f"{' '.join(statement.split())[:200]}"
+            )
+    if not problems:
+        return
+
+    message = f"Query budget of {request.endpoint} exceeded: " + "; ".join(problems)
+    if current_app.config.get("QUERY_BUDGET_RAISE"):
+        raise QueryBudgetExceeded(message)
+    logger.warning(message)
+
+
+def check_query_budget(response):
+    """after_request hook checking the request's recorded queries against its budget."""
+    if not g.get("_query_budget_streamed"):
+        _check(request_queries(), _route_budget())
+    return response
+
+
+def stream_with_budget(generator):
+    """
+    stream_with_context() keeping the route's query budget.
+
+    A streamed body runs its queries after the after_request check, so the
+    statements of the view and of `generator` are checked together once
+    the body has been sent.
+    """
+    budget = _route_budget()
+    view_queries = list(request_queries())
+    g._query_budget_streamed = True
+
+    def checked():
+        queries = list(view_queries)
+        chunks = iter(generator)
+        end = object()
+        while True:
+            # Only the statements run by this body: other streams may
+            # record into the same app context between two chunks
+            start = len(get_recorded_queries())
+            chunk = next(chunks, end)
+            queries += get_recorded_queries()[start:]
+            if chunk is end:
+                break
+            yield chunk
+        _check(queries, budget)
+
+    return stream_with_context(checked())
+
+
+def init_query_budgets(app):
+    app.after_request(check_query_budget)
@@ -0,0 +1,93 @@
+import logging
+import os
+import threading
+
+from sqlalchemy import event
+
+from ..extensions import db
+from ..routing import READONLY_BIND
+
+logger = logging.getLogger(__name__)
+
+
+def _apply_pragmas(pragmas):
+    """connect listener running `PRAGMA name = value` on each new DBAPI connection."""
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name} = {value}")
+        finally:
+            cursor.close()
+    return on_connect
+
+
+class WalCheckpointer:
+    """Background thread checkpointing the WAL of an engine at a fixed interval.
+
+    SQLite's automatic checkpoints run inside whichever write happens to
+    cross the threshold; a regular PASSIVE checkpoint keeps the WAL short
+    without blocking readers or writers. Started lazily per process so
+    each gunicorn worker owns its thread.
+    """
+
+    def __init__(self, engine, interval, mode="PASSIVE"):
+        self.engine = engine
+        self.interval = interval
+        self.mode = mode
+        self._pid = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def ensure_started(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._stop.clear()
+            thread = threading.Thread(target=self._run, name="sqlite-wal-checkpoint", daemon=True)
+            thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def checkpoint(self):
+        """Run one checkpoint; returns (busy, wal pages, checkpointed pages)."""
+        with self.engine.connect() as conn:
+            return tuple(conn.exec_driver_sql(f"PRAGMA wal_checkpoint({self.mode})").first())
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                busy, log_pages, checkpointed = self.checkpoint()
+                logger.debug(f"WAL checkpoint: {checkpointed}/{log_pages} pages (busy={busy})")
+            except Exception as e:
+                logger.warning(f"WAL checkpoint failed: {str(e)}")
+
+
+def configure_sqlite(app):
+    """Apply SQLITE_PRAGMAS to every new connection and schedule WAL checkpoints."""
+    pragmas = app.config.get("SQLITE_PRAGMAS") or {}
+    interval = app.config.get("SQLITE_CHECKPOINT_INTERVAL") or 0
+
+    with app.app_context():
+        engine = db.engine
+        readonly_engine = db.engines.get(READONLY_BIND)
+    if engine.dialect.name != "sqlite":
+        return
+
+    if pragmas:
+        event.listen(engine, "connect", _apply_pragmas(pragmas))
+    if readonly_engine is not None and readonly_engine.dialect.name == "sqlite":
+        # The journal mode belongs to the file and cannot be set read-only
+        read_pragmas = {name: value for name, value in pragmas.items() if name != "journal_mode"}
+        event.listen(readonly_engine, "connect", _apply_pragmas({**read_pragmas, "query_only": 1}))
+
+    if interval and str(pragmas.get("journal_mode", "")).upper() == "WAL":
+        checkpointer = WalCheckpointer(
+            engine, interval, app.config.get("SQLITE_CHECKPOINT_MODE", "PASSIVE")
+        )
+        app.extensions["wal_checkpointer"] = checkpointer
+        app.before_request(checkpointer.ensure_started)
@@ -0,0 +1,135 @@
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+from flask import current_app
+from flask_jwt_extended import get_jwt
+from sqlalchemy.exc import IntegrityError
+
+from ..extensions import db
+from ..models import RevokedToken
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBlocklist:
+    """Per-process set of revoked token ids (jti), synced from `revoked_tokens`.
+
+    Checking a token is a dict lookup: the table is only read by a
+    background thread fetching the rows added since its previous pass,
+    every `sync_interval` seconds. The thread is started lazily so each
+    gunicorn worker owns one, and the worker's first request waits for
+    its first pass. A revocation is seen at once by the worker that wrote
+    it and within one interval by the others; entries are dropped once
+    the token has expired anyway. A `sync_interval` of 0 disables the
+    thread (tests, single process).
+    """
+
+    def __init__(self, engine, sync_interval=5, start_timeout=5):
+        self.engine = engine
+        self.sync_interval = sync_interval
+        self.start_timeout = start_timeout
+        self._revoked = {}  # jti -> expiry (unix time)
+        self._last_id = 0
+        self._pid = None
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+
+    def is_revoked(self, jti):
+        expires_at = self._revoked.get(jti)
+        return expires_at is not None and expires_at > time.time()
+
+    def add(self, jti, expires_at):
+        """Record a revocation committed by this process."""
+        with self._lock:
+            self._revoked[jti] = expires_at
+
+    def sync(self):
+        """Fetch the revocations added since the last pass and forget expired ones."""
+        table = RevokedToken.__table__
+        now = time.time()
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                db.select(table.c.id, table.c.jti, table.c.expires_at)
+                .where(table.c.id > self._last_id)
+                .order_by(table.c.id)
+            ).all()
+        with self._lock:
+            for row in rows:
+                expires_at = row.expires_at.replace(tzinfo=timezone.utc).timestamp()
+                if expires_at > now:
+                    self._revoked[row.jti] = expires_at
+            if rows:
+                self._last_id = rows[-1].id
+            for jti in [jti for jti, expires_at in self._revoked.items() if expires_at <= now]:
+                del self._revoked[jti]
+        return len(rows)
+
+    def ensure_started(self):
+        if not self.sync_interval or self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._ready.clear()
+                self._stop.clear()
+                threading.Thread(target=self._run, name="token-blocklist-sync", daemon=True).start()
+        # A new worker must not accept tokens revoked before it started
+        if not self._ready.wait(self.start_timeout):
+            logger.warning("Token blocklist not synced yet, serving the request anyway")
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        # Outside any app context: the sync queries do not count against
+        # the budget of the request that happens to be running
+        while True:
+            try:
+                self.sync()
+            except Exception as e:
+                logger.warning(f"Token blocklist sync failed: {str(e)}")
+            self._ready.set()
+            if self._stop.wait(self.sync_interval):
+                return
+
+
+def revoke_current_token():
+    """Revoke the access token of the current request (logout)."""
+    claims = get_jwt()
+    db.session.add(RevokedToken(
+        jti=claims["jti"],
+        user_id=int(claims["sub"]),
+        expires_at=datetime.fromtimestamp(claims["exp"], timezone.utc)
+    ))
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # Revoked meanwhile through another worker, not synced here yet
+        db.session.rollback()
+    current_app.extensions["token_blocklist"].add(claims["jti"], claims["exp"])
+
+
+def prune_revoked_tokens():
+    """Delete the revocations of tokens past their expiry; returns how many."""
+    result = db.session.execute(
+        db.delete(RevokedToken).where(RevokedToken.expires_at <= datetime.now(timezone.utc))
+    )
+    db.session.commit()
+    return result.rowcount
+
+
+def init_token_blocklist(app, jwt):
+    """Reject revoked access tokens, looked up in the per-process blocklist."""
+    with app.app_context():
+        engine = db.engine
+    blocklist = TokenBlocklist(engine, app.config["TOKEN_BLOCKLIST_SYNC_INTERVAL"])
+    app.extensions["token_blocklist"] = blocklist
+    app.before_request(blocklist.ensure_started)
+
+    @jwt.token_in_blocklist_loader
+    def token_revoked(jwt_header, jwt_payload):
+        return current_app.extensions["token_blocklist"].is_revoked(jwt_payload["jti"])
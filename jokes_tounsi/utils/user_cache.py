@@ -0,0 +1,67 @@
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app
+
+from ..extensions import db
+from ..models import User
+
+# User fields kept in the cache (what UserSchema and log lines need)
+PROFILE_FIELDS = ("id", "email", "display_name", "role", "created_at")
+
+
+class UserProfileCache:
+    """Small per-process TTL cache of user profile snapshots.
+
+    Authorization never reads it (roles come from the JWT claims); it only
+    saves a SELECT when a handler needs profile fields such as the email.
+    Entries are plain dicts, safe to share between threads and sessions.
+    Invalidation is per process: other gunicorn workers may serve the old
+    profile until their entry expires (`ttl`).
+    """
+
+    def __init__(self, ttl=60, max_entries=1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # user id -> (expires_at, profile)
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        """Profile dict for `user_id`, or None if the user does not exist."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(user_id)
+                return entry[1]
+
+        user = db.session.get(User, user_id)
+        if user is None:
+            return None
+        profile = {field: getattr(user, field) for field in PROFILE_FIELDS}
+
+        with self._lock:
+            self._entries[user_id] = (now + self.ttl, profile)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return profile
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def get_user_profile(user_id):
+    """Cached profile of a user from the current app's cache."""
+    return current_app.extensions["user_profiles"].get(user_id)
+
+
+def invalidate_user_profile(user_id):
+    """Drop a user's cached profile, e.g. after a role change (this process only)."""
+    current_app.extensions["user_profiles"].invalidate(user_id)
@@ -0,0 +1,55 @@
+"""full-text search index on jokes
+
+Revision ID: 7c1e4a9b2d3f
+Revises: 390dfb45e167
+Create Date: 2026-10-18 09:12:41.518203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c1e4a9b2d3f'
+down_revision = '390dfb45e167'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("""
+        CREATE VIRTUAL TABLE jokes_fts USING fts5(
+            text_tn, text_fr, text_en,
+            content='jokes', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+    """)
+    op.execute("""
+        CREATE TRIGGER jokes_fts_ai AFTER INSERT ON jokes BEGIN
+            INSERT INTO jokes_fts(rowid, text_tn, text_fr, text_en)
+            VALUES (new.id, new.text_tn, new.text_fr, new.text_en);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER jokes_fts_ad AFTER DELETE ON jokes BEGIN
+            INSERT INTO jokes_fts(jokes_fts, rowid, text_tn, text_fr, text_en)
+            VALUES ('delete', old.id, old.text_tn, old.text_fr, old.text_en);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER jokes_fts_au AFTER UPDATE OF text_tn, text_fr, text_en ON jokes BEGIN
+            INSERT INTO jokes_fts(jokes_fts, rowid, text_tn, text_fr, text_en)
+            VALUES ('delete', old.id, old.text_tn, old.text_fr, old.text_en);
+            INSERT INTO jokes_fts(rowid, text_tn, text_fr, text_en)
+            VALUES (new.id, new.text_tn, new.text_fr, new.text_en);
+        END
+    """)
+    # Index the jokes that already exist
+    op.execute("INSERT INTO jokes_fts(jokes_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    op.execute("DROP TRIGGER IF EXISTS jokes_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS jokes_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS jokes_fts_ai")
+    op.execute("DROP TABLE IF EXISTS jokes_fts")
@@ -0,0 +1,88 @@
+"""incrementally maintained per-author joke counts
+
+Revision ID: a6c93e4f1b28
+Revises: f3b81c2d9e57
+Create Date: 2026-10-18 18:11:26.407913
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a6c93e4f1b28'
+down_revision = 'f3b81c2d9e57'
+branch_labels = None
+depends_on = None
+
+
+def counts(alias):
+    published = f"CASE WHEN {alias}.is_published THEN 1 ELSE 0 END"
+    return published, f"1 - {published}"
+
+
+def key_match(alias):
+    return f"author_id = {alias}.author_id AND region = coalesce({alias}.region, '')"
+
+
+def increment(alias):
+    published, drafts = counts(alias)
+    return f"""
+        INSERT INTO author_joke_counts (author_id, region, published_count, draft_count)
+        VALUES ({alias}.author_id, coalesce({alias}.region, ''), {published}, {drafts})
+        ON CONFLICT (author_id, region) DO UPDATE SET
+            published_count = published_count + excluded.published_count,
+            draft_count = draft_count + excluded.draft_count;
+    """
+
+
+def decrement(alias):
+    published, drafts = counts(alias)
+    return f"""
+        UPDATE author_joke_counts SET
+            published_count = published_count - ({published}),
+            draft_count = draft_count - ({drafts})
+        WHERE {key_match(alias)};
+        DELETE FROM author_joke_counts
+        WHERE {key_match(alias)} AND published_count <= 0 AND draft_count <= 0;
+    """
+
+
+def upgrade():
+    op.create_table('author_joke_counts',
+    sa.Column('author_id', sa.Integer(), nullable=False),
+    sa.Column('region', sa.String(length=50), nullable=False),
+    sa.Column('published_count', sa.Integer(), nullable=False),
+    sa.Column('draft_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['author_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('author_id', 'region')
+    )
+
+    op.execute(f"""
+        CREATE TRIGGER jokes_author_stats_ai AFTER INSERT ON jokes
+        BEGIN {increment('new')} END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER jokes_author_stats_ad AFTER DELETE ON jokes
+        BEGIN {decrement('old')} END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER jokes_author_stats_au AFTER UPDATE OF author_id, region, is_published ON jokes
+        BEGIN {decrement('old')} {increment('new')} END
+    """)
+
+    # Count the jokes that already exist
+    op.execute("""
+        INSERT INTO author_joke_counts (author_id, region, published_count, draft_count)
+        SELECT author_id, coalesce(region, ''),
+               sum(CASE WHEN is_published THEN 1 ELSE 0 END),
+               sum(CASE WHEN is_published THEN 0 ELSE 1 END)
+        FROM jokes
+        GROUP BY author_id, coalesce(region, '')
+    """)
+
+
+def downgrade():
+    for name in ('jokes_author_stats_au', 'jokes_author_stats_ad', 'jokes_author_stats_ai'):
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    op.drop_table('author_joke_counts')
@@ -0,0 +1,46 @@
+"""partial composite indexes for joke listings
+
+Revision ID: b58d0e6f3a21
+Revises: 7c1e4a9b2d3f
+Create Date: 2026-10-18 11:04:27.903115
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b58d0e6f3a21'
+down_revision = '7c1e4a9b2d3f'
+branch_labels = None
+depends_on = None
+
+
+PUBLISHED = sa.text('is_published = 1')
+
+
+def upgrade():
+    with op.batch_alter_table('jokes', schema=None) as batch_op:
+        # Superseded by the partial indexes below; SQLite would otherwise
+        # prefer it and sort the published rows in a temp B-tree.
+        batch_op.drop_index('ix_jokes_is_published')
+        batch_op.create_index('ix_jokes_published_created_at', ['created_at'], unique=False, sqlite_where=PUBLISHED)
+        batch_op.create_index('ix_jokes_published_era', ['era', 'created_at'], unique=False, sqlite_where=PUBLISHED)
+        batch_op.create_index('ix_jokes_published_region', ['region', 'created_at'], unique=False, sqlite_where=PUBLISHED)
+        batch_op.create_index('ix_jokes_published_age_group', ['age_group', 'created_at'], unique=False, sqlite_where=PUBLISHED)
+        batch_op.create_index('ix_jokes_published_acceptability', ['acceptability', 'created_at'], unique=False, sqlite_where=PUBLISHED)
+        batch_op.create_index('ix_jokes_published_delivery_type', ['delivery_type', 'created_at'], unique=False, sqlite_where=PUBLISHED)
+
+    # Give the planner fresh statistics for the new indexes
+    op.execute('ANALYZE jokes')
+
+
+def downgrade():
+    with op.batch_alter_table('jokes', schema=None) as batch_op:
+        batch_op.drop_index('ix_jokes_published_delivery_type')
+        batch_op.drop_index('ix_jokes_published_acceptability')
+        batch_op.drop_index('ix_jokes_published_age_group')
+        batch_op.drop_index('ix_jokes_published_region')
+        batch_op.drop_index('ix_jokes_published_era')
+        batch_op.drop_index('ix_jokes_published_created_at')
+        batch_op.create_index('ix_jokes_is_published', ['is_published'], unique=False)
@@ -0,0 +1,48 @@
+"""version of the published joke ids
+
+Revision ID: b9d2e71f4c36
+Revises: a6c93e4f1b28
+Create Date: 2026-10-19 10:12:48.630217
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'b9d2e71f4c36'
+down_revision = 'a6c93e4f1b28'
+branch_labels = None
+depends_on = None
+
+
+BUMP = """
+    INSERT INTO data_versions (name, version, updated_at)
+    VALUES ('published_jokes', 1, strftime('%Y-%m-%d %H:%M:%f', 'now'))
+    ON CONFLICT (name) DO UPDATE SET
+        version = version + 1,
+        updated_at = excluded.updated_at;
+"""
+
+KEY_COLUMNS = ('id', 'is_published', 'region', 'age_group')
+
+
+def upgrade():
+    changed = ' OR '.join(f"old.{column} IS NOT new.{column}" for column in KEY_COLUMNS)
+    op.execute(f"""
+        CREATE TRIGGER jokes_published_version_ai AFTER INSERT ON jokes
+        WHEN new.is_published BEGIN {BUMP} END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER jokes_published_version_ad AFTER DELETE ON jokes
+        WHEN old.is_published BEGIN {BUMP} END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER jokes_published_version_au AFTER UPDATE OF {', '.join(KEY_COLUMNS)} ON jokes
+        WHEN (old.is_published OR new.is_published) AND ({changed}) BEGIN {BUMP} END
+    """)
+
+
+def downgrade():
+    for suffix in ('au', 'ad', 'ai'):
+        op.execute(f"DROP TRIGGER IF EXISTS jokes_published_version_{suffix}")
+    op.execute("DELETE FROM data_versions WHERE name = 'published_jokes'")
@@ -0,0 +1,44 @@
+"""data version counters for conditional requests
+
+Revision ID: d4a7f19c6e08
+Revises: b58d0e6f3a21
+Create Date: 2026-10-18 13:37:09.264550
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4a7f19c6e08'
+down_revision = 'b58d0e6f3a21'
+branch_labels = None
+depends_on = None
+
+
+BUMP = """
+    INSERT INTO data_versions (name, version, updated_at)
+    VALUES ('jokes', 1, strftime('%Y-%m-%d %H:%M:%f', 'now'))
+    ON CONFLICT (name) DO UPDATE SET
+        version = version + 1,
+        updated_at = excluded.updated_at;
+"""
+
+
+def upgrade():
+    op.create_table('data_versions',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    for suffix, operation in (('ai', 'INSERT'), ('au', 'UPDATE'), ('ad', 'DELETE')):
+        op.execute(f"CREATE TRIGGER jokes_version_{suffix} AFTER {operation} ON jokes BEGIN {BUMP} END")
+    # Existing rows count as one change so validators start out set
+    op.execute(BUMP)
+
+
+def downgrade():
+    for suffix in ('ad', 'au', 'ai'):
+        op.execute(f"DROP TRIGGER IF EXISTS jokes_version_{suffix}")
+    op.drop_table('data_versions')
@@ -0,0 +1,80 @@
+"""incrementally maintained facet counts
+
+Revision ID: e29b85c0d7a4
+Revises: d4a7f19c6e08
+Create Date: 2026-10-18 15:21:53.660471
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e29b85c0d7a4'
+down_revision = 'd4a7f19c6e08'
+branch_labels = None
+depends_on = None
+
+
+COLUMNS = ('era', 'region', 'age_group', 'acceptability', 'delivery_type', 'tone', 'rhythm')
+COLUMN_LIST = ', '.join(COLUMNS)
+
+
+def key_values(alias):
+    return ', '.join(f"coalesce({alias}.{column}, '')" for column in COLUMNS)
+
+
+def key_match(alias):
+    return ' AND '.join(f"{column} = coalesce({alias}.{column}, '')" for column in COLUMNS)
+
+
+INCREMENT = f"""
+    INSERT INTO joke_facet_counts ({COLUMN_LIST}, joke_count)
+    VALUES ({key_values('new')}, 1)
+    ON CONFLICT ({COLUMN_LIST}) DO UPDATE SET joke_count = joke_count + 1;
+"""
+
+DECREMENT = f"""
+    UPDATE joke_facet_counts SET joke_count = joke_count - 1 WHERE {key_match('old')};
+    DELETE FROM joke_facet_counts WHERE {key_match('old')} AND joke_count <= 0;
+"""
+
+
+def upgrade():
+    op.create_table('joke_facet_counts',
+    *[sa.Column(column, sa.String(length=50), nullable=False) for column in COLUMNS],
+    sa.Column('joke_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint(*COLUMNS)
+    )
+
+    op.execute(f"""
+        CREATE TRIGGER jokes_facets_ai AFTER INSERT ON jokes
+        WHEN new.is_published BEGIN {INCREMENT} END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER jokes_facets_ad AFTER DELETE ON jokes
+        WHEN old.is_published BEGIN {DECREMENT} END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER jokes_facets_au_old AFTER UPDATE OF is_published, {COLUMN_LIST} ON jokes
+        WHEN old.is_published BEGIN {DECREMENT} END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER jokes_facets_au_new AFTER UPDATE OF is_published, {COLUMN_LIST} ON jokes
+        WHEN new.is_published BEGIN {INCREMENT} END
+    """)
+
+    # Count the jokes that already exist
+    op.execute(f"""
+        INSERT INTO joke_facet_counts ({COLUMN_LIST}, joke_count)
+        SELECT {key_values('jokes')}, count(*)
+        FROM jokes
+        WHERE is_published = 1
+        GROUP BY {key_values('jokes')}
+    """)
+
+
+def downgrade():
+    for name in ('jokes_facets_au_new', 'jokes_facets_au_old', 'jokes_facets_ad', 'jokes_facets_ai'):
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    op.drop_table('joke_facet_counts')
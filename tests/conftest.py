@@ -1,9 +1,12 @@
 import os
 import pytest
 from dotenv import load_dotenv
+from sqlalchemy import event
+from flask_jwt_extended import create_access_token
 from jokes_tounsi import create_app
 from jokes_tounsi.extensions import db
 from jokes_tounsi.config import TestingConfig
+from jokes_tounsi.models import User, Joke
 
 
 @pytest.fixture
@@ -32,4 +35,66 @@ def client(app):
 @pytest.fixture
 def runner(app):
     """CLI runner."""
-    return app.test_cli_runner()
\ No newline at end of file
+    return app.test_cli_runner()
+
+
+@pytest.fixture
+def capture_statements(app):
+    """Record the (statement, parameters) sent to the database.
+
+    Captures from fixture setup on: clear() it right before the requests
+    under test.
+    """
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+def author(app):
+    """A contributor owning the test jokes."""
+    user = User(email="author@example.com", display_name="Author", role="contributor")
+    user.set_password("password123")
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+@pytest.fixture
+def author_headers(author):
+    """Authorization header for the contributor."""
+    token = create_access_token(identity=str(author.id), additional_claims={"role": author.role})
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def jokes(author):
+    """A small published/unpublished corpus."""
+    rows = [
+        Joke(text_tn="Mcha Jha lel souk", text_en="Jha went to the market",
+             region="Tunis", is_published=True, author_id=author.id),
+        Joke(text_tn="Sfaxi w flous", text_fr="Un Sfaxien et son argent",
+             region="Sfax", is_published=True, author_id=author.id),
+        Joke(text_tn="Jha w l7mar", text_en="Jha and his donkey, Jha again",
+             region="Sfax", is_published=True, author_id=author.id),
+        Joke(text_tn="Jha secret", region="Tunis", is_published=False, author_id=author.id),
+    ]
+    db.session.add_all(rows)
+    db.session.commit()
+    return rows
+
+
+@pytest.fixture
+def admin_headers(app):
+    """Authorization header for an admin."""
+    user = User(email="admin@example.com", display_name="Admin", role="admin")
+    user.set_password("password123")
+    db.session.add(user)
+    db.session.commit()
+    token = create_access_token(identity=str(user.id), additional_claims={"role": user.role})
+    return {"Authorization": f"Bearer {token}"}
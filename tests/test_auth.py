@@ -1,4 +1,15 @@
 import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from flask_jwt_extended import create_access_token, decode_token
+from werkzeug.exceptions import ServiceUnavailable
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, generate_password_hash
+
+from jokes_tounsi.extensions import db
+from jokes_tounsi.models import User, Joke, RevokedToken, AuthorJokeCount
+from jokes_tounsi.security import PasswordHasher
+from jokes_tounsi.security.passwords import normalize_method
 
 
 def test_register_user(client):
@@ -92,4 +103,180 @@ def test_login_invalid_password(client):
         }
     )
     
-    assert response.status_code == 401
\ No newline at end of file
+    assert response.status_code == 401
+
+def test_current_user_profile_cache_follows_role_change(client, admin_headers):
+    """/users/me is served from the profile cache, refreshed on role change."""
+    client.post(
+        "/api/v1/register",
+        json={
+            "email": "test@example.com",
+            "password": "password123",
+            "display_name": "Test User"
+        }
+    )
+    token = client.post(
+        "/api/v1/login",
+        json={"email": "test@example.com", "password": "password123"}
+    ).get_json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    assert client.get("/api/v1/users/me", headers=headers).get_json()["role"] == "user"
+
+    client.put(
+        "/api/v1/users/role",
+        json={"email": "test@example.com", "role": "contributor"},
+        headers=admin_headers
+    )
+
+    data = client.get("/api/v1/users/me", headers=headers).get_json()
+    assert data["role"] == "contributor"
+    assert data["email"] == "test@example.com"
+
+
+def test_login_rehashes_outdated_password_hash(client):
+    """A hash made with old parameters is upgraded on successful login."""
+    user = User(
+        email="old@example.com",
+        display_name="Old Hash",
+        password_hash=generate_password_hash("password123", method="pbkdf2:sha256:500")
+    )
+    db.session.add(user)
+    db.session.commit()
+
+    response = client.post(
+        "/api/v1/login",
+        json={"email": "old@example.com", "password": "password123"}
+    )
+
+    assert response.status_code == 200
+    db.session.refresh(user)
+    assert user.password_hash.startswith("pbkdf2:sha256:1000$")
+    assert user.check_password("password123")
+
+
+def test_normalize_method_matches_werkzeug():
+    """needs_rehash compares against werkzeug's spelling without hashing."""
+    for method in ("scrypt:1024:8:1", "pbkdf2:sha256:1000", "pbkdf2:sha512:1000"):
+        spelled = generate_password_hash("x", method=method, salt_length=1).split("$", 1)[0]
+        assert normalize_method(method) == spelled
+    assert normalize_method("scrypt") == "scrypt:32768:8:1"
+    assert normalize_method("pbkdf2") == f"pbkdf2:sha256:{DEFAULT_PBKDF2_ITERATIONS}"
+
+    hasher = PasswordHasher(method="pbkdf2:sha256:1000", workers=0)
+    assert not hasher.needs_rehash(generate_password_hash("x", method="pbkdf2:sha256:1000"))
+    assert hasher.needs_rehash(generate_password_hash("x", method="pbkdf2:sha256:500"))
+
+
+def test_password_hasher_process_pool():
+    """Hashing round-trips through the pool and fails fast when saturated."""
+    hasher = PasswordHasher(method="pbkdf2:sha256:1000", workers=1)
+    try:
+        pwhash = hasher.hash("password123")
+        assert hasher.verify(pwhash, "password123")
+        assert not hasher.verify(pwhash, "wrong")
+        assert not hasher.needs_rehash(pwhash)
+    finally:
+        hasher.shutdown()
+
+    saturated = PasswordHasher(method="pbkdf2:sha256:1000", workers=1, max_pending=0)
+    with pytest.raises(ServiceUnavailable):
+        saturated.hash("password123")
+
+
+def test_logout_revokes_token(client, author, author_headers):
+    """The token used to log out is rejected afterwards; others still work."""
+    other_headers = {"Authorization": f"Bearer {create_access_token(identity=str(author.id))}"}
+
+    assert client.post("/api/v1/logout", headers=author_headers).status_code == 204
+
+    assert client.get("/api/v1/users/me", headers=author_headers).status_code == 401
+    assert client.post("/api/v1/logout", headers=author_headers).status_code == 401
+    assert client.get("/api/v1/users/me", headers=other_headers).status_code == 200
+    assert RevokedToken.query.one().user_id == author.id
+
+
+def test_blocklist_syncs_revocations_of_other_workers(app, client, author, author_headers):
+    """Rows written by another process are picked up at the next sync; expired ones are dropped."""
+    jti = decode_token(author_headers["Authorization"].split()[1])["jti"]
+    now = datetime.now(timezone.utc)
+    db.session.add_all([
+        RevokedToken(jti=jti, user_id=author.id, expires_at=now + timedelta(hours=1)),
+        RevokedToken(jti="expired", user_id=author.id, expires_at=now - timedelta(seconds=1)),
+    ])
+    db.session.commit()
+    blocklist = app.extensions["token_blocklist"]
+
+    assert client.get("/api/v1/users/me", headers=author_headers).status_code == 200
+    assert blocklist.sync() == 2
+    assert client.get("/api/v1/users/me", headers=author_headers).status_code == 401
+    assert not blocklist.is_revoked("expired")
+    assert blocklist.sync() == 0
+
+
+def test_prune_revoked_tokens_command(runner, author):
+    now = datetime.now(timezone.utc)
+    db.session.add_all([
+        RevokedToken(jti="live", user_id=author.id, expires_at=now + timedelta(hours=1)),
+        RevokedToken(jti="expired", user_id=author.id, expires_at=now - timedelta(seconds=1)),
+    ])
+    db.session.commit()
+
+    result = runner.invoke(args=["jokes", "prune-revoked-tokens"])
+    assert "Pruned 1 expired token revocations" in result.output
+    assert [token.jti for token in RevokedToken.query.all()] == ["live"]
+
+
+def author_stats_from_jokes(author):
+    """Ground truth computed straight from the author's jokes."""
+    regions = {}
+    for joke in author.jokes:
+        counts = regions.setdefault(joke.region, {"region": joke.region, "total": 0, "published": 0, "drafts": 0})
+        counts["total"] += 1
+        counts["published" if joke.is_published else "drafts"] += 1
+    return {
+        "total": author.jokes.count(),
+        "published": author.jokes.filter(Joke.is_published == db.true()).count(),
+        "drafts": author.jokes.filter(Joke.is_published != db.true()).count(),
+        "regions": sorted(regions.values(), key=lambda item: (-item["total"], item["region"] or "")),
+    }
+
+
+def test_user_stats_follow_writes(client, author, jokes, author_headers, admin_headers):
+    stats = client.get("/api/v1/users/me/stats", headers=author_headers).get_json()
+    assert stats == author_stats_from_jokes(author)
+    assert stats["regions"][0] == {"region": "Sfax", "total": 2, "published": 2, "drafts": 0}
+
+    client.post("/api/v1/jokes", json={"text_tn": "Bla region"}, headers=author_headers)
+    client.patch(f"/api/v1/jokes/{jokes[3].id}", json={"is_published": True}, headers=author_headers)
+    client.patch(f"/api/v1/jokes/{jokes[1].id}", json={"region": "Tunis"}, headers=author_headers)
+    client.delete(f"/api/v1/jokes/{jokes[0].id}", headers=admin_headers)
+    client.patch(
+        "/api/v1/jokes/batch",
+        json={"filter": {"region": "Sfax"}, "patch": {"is_published": False}},
+        headers=admin_headers
+    )
+
+    stats = client.get("/api/v1/users/me/stats", headers=author_headers).get_json()
+    assert stats == author_stats_from_jokes(author)
+    assert (stats["total"], stats["published"], stats["drafts"]) == (4, 2, 2)
+
+
+def test_user_stats_admin_only(client, author, jokes, author_headers, admin_headers):
+    assert client.get(f"/api/v1/users/{author.id}/stats", headers=author_headers).status_code == 403
+    assert client.get("/api/v1/users/999/stats", headers=admin_headers).status_code == 404
+
+    stats = client.get(f"/api/v1/users/{author.id}/stats", headers=admin_headers).get_json()
+    assert stats == author_stats_from_jokes(author)
+    admin_stats = client.get("/api/v1/users/me/stats", headers=admin_headers).get_json()
+    assert admin_stats == {"total": 0, "published": 0, "drafts": 0, "regions": []}
+
+
+def test_rebuild_author_stats_command(runner, author, jokes):
+    expected = AuthorJokeCount.stats(author.id)
+    db.session.execute(db.delete(AuthorJokeCount))
+    db.session.commit()
+
+    result = runner.invoke(args=["jokes", "rebuild-author-stats"])
+    assert "Author statistics rebuilt" in result.output
+    assert AuthorJokeCount.stats(author.id) == expected == author_stats_from_jokes(author)
@@ -0,0 +1,95 @@
+import gzip
+import zlib
+
+from jokes_tounsi.utils.compression import negotiate_encoding
+from werkzeug.http import parse_accept_header
+
+
+def accept(value):
+    return parse_accept_header(value)
+
+
+def test_negotiate_encoding():
+    assert negotiate_encoding(accept("gzip, deflate, br")) == "gzip"
+    assert negotiate_encoding(accept("deflate")) == "deflate"
+    assert negotiate_encoding(accept("gzip;q=0.5, deflate")) == "deflate"
+    assert negotiate_encoding(accept("*")) == "gzip"
+    assert negotiate_encoding(accept("br")) is None
+    assert negotiate_encoding(accept("")) is None
+
+
+def test_list_is_compressed_when_accepted(app, client, jokes):
+    app.extensions["compressor"].min_size = 0
+    plain = client.get("/api/v1/jokes")
+    assert "Content-Encoding" not in plain.headers
+    assert "Accept-Encoding" in plain.headers["Vary"]
+
+    response = client.get("/api/v1/jokes", headers={"Accept-Encoding": "gzip, deflate"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert gzip.decompress(response.data) == plain.data
+    assert response.headers["ETag"] == plain.headers["ETag"][:-1] + '-gzip"'
+
+    response = client.get("/api/v1/jokes", headers={"Accept-Encoding": "deflate"})
+    assert response.headers["Content-Encoding"] == "deflate"
+    assert zlib.decompress(response.data) == plain.data
+
+
+def test_small_bodies_are_not_compressed(client, jokes):
+    response = client.get("/api/v1/ping", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in response.headers
+
+
+def test_compressed_etag_revalidates(app, client, jokes):
+    app.extensions["compressor"].min_size = 0
+    headers = {"Accept-Encoding": "gzip"}
+    etag = client.get("/api/v1/jokes", headers=headers).headers["ETag"]
+
+    response = client.get("/api/v1/jokes", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+
+
+def test_cached_page_skips_listing_query(app, client, jokes, capture_statements):
+    app.extensions["compressor"].min_size = 0
+    headers = {"Accept-Encoding": "gzip"}
+    first = client.get("/api/v1/jokes", query_string={"per_page": 2}, headers=headers)
+
+    capture_statements.clear()
+    second = client.get("/api/v1/jokes", query_string={"per_page": 2}, headers=headers)
+    statements = [statement for statement, _ in capture_statements]
+
+    assert second.data == first.data
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert second.headers["Cache-Control"] == "no-cache"
+    assert all("data_versions" in statement for statement in statements)
+
+
+def test_bodies_without_strong_etag_are_not_cached(app, client, jokes):
+    app.extensions["compressor"].min_size = 0
+    cache = app.extensions["compressor"].cache
+    response = client.get("/api/v1/jokes/random", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert cache._size == 0
+
+
+def test_export_stream_is_compressed(client, jokes):
+    plain = client.get("/api/v1/jokes/export")
+    response = client.get("/api/v1/jokes/export", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in response.headers
+    assert gzip.decompress(response.data) == plain.data
+
+
+def test_openapi_spec_compressed_once(app, client):
+    cache = app.extensions["compressor"].cache
+    headers = {"Accept-Encoding": "gzip"}
+    first = client.get("/api/v1/openapi.json", headers=headers)
+    size = cache._size
+    second = client.get("/api/v1/openapi.json", headers=headers)
+
+    assert first.headers["Content-Encoding"] == "gzip"
+    assert second.data == first.data
+    assert cache._size == size > 0
@@ -0,0 +1,89 @@
+import os
+import runpy
+import tempfile
+import threading
+
+import pytest
+
+from jokes_tounsi import create_app
+from jokes_tounsi.config import TestingConfig
+from jokes_tounsi.extensions import db
+from jokes_tounsi.models import User, Joke
+
+CONF = os.path.join(os.path.dirname(os.path.dirname(__file__)), "gunicorn.conf.py")
+
+
+def load_conf(monkeypatch, **env):
+    for name in ("GUNICORN_WORKER_CLASS", "GUNICORN_WORKERS", "GUNICORN_THREADS"):
+        monkeypatch.delenv(name, raising=False)
+    # Set so the config's setdefault() does not leak into other tests
+    monkeypatch.setenv("METRICS_DIR", os.path.join(tempfile.gettempdir(), "jokes_test_metrics"))
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    return runpy.run_path(CONF)
+
+
+def test_gunicorn_defaults_to_threaded_workers(monkeypatch):
+    conf = load_conf(monkeypatch)
+
+    assert conf["worker_class"] == "gthread"
+    assert conf["workers"] == max(2, conf["cpus"])
+    assert conf["threads"] == 4
+    assert conf["preload_app"] is False
+
+
+@pytest.mark.parametrize("worker_class, threads", [("gevent", 1), ("sync", 1)])
+def test_gunicorn_worker_classes(monkeypatch, worker_class, threads):
+    conf = load_conf(monkeypatch, GUNICORN_WORKER_CLASS=worker_class)
+
+    assert conf["worker_class"] == worker_class
+    assert conf["threads"] == threads
+    if worker_class == "sync":
+        assert conf["workers"] == 2 * conf["cpus"] + 1
+
+
+def test_gunicorn_overrides(monkeypatch):
+    conf = load_conf(monkeypatch, GUNICORN_WORKERS="3", GUNICORN_THREADS="8")
+
+    assert conf["workers"] == 3
+    assert conf["threads"] == 8
+
+
+def test_concurrent_requests_share_an_app(tmp_path):
+    """What a gthread worker does: many threads, one app, one engine."""
+    config = type("ThreadedConfig", (TestingConfig,), {
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'jokes.db'}",
+        "SQLITE_PRAGMAS": {"journal_mode": "WAL", "busy_timeout": 5000},
+    })
+    app = create_app(config)
+    with app.app_context():
+        db.create_all()
+        user = User(email="author@example.com", display_name="Author", role="contributor")
+        db.session.add(user)
+        db.session.flush()
+        db.session.add_all(
+            Joke(text_tn=f"Nokta {i}", is_published=True, author_id=user.id) for i in range(20)
+        )
+        db.session.commit()
+
+    statuses = []
+    lock = threading.Lock()
+
+    def browse():
+        client = app.test_client()
+        for joke_id in range(1, 21):
+            codes = [
+                client.get("/api/v1/jokes", query_string={"per_page": 5}).status_code,
+                client.get(f"/api/v1/jokes/{joke_id}").status_code,
+                client.get("/api/v1/jokes/random").status_code,
+            ]
+            with lock:
+                statuses.extend(codes)
+
+    threads = [threading.Thread(target=browse) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert statuses == [200] * (8 * 20 * 3)
@@ -0,0 +1,523 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta, timezone
+
+from flask import jsonify
+from flask_jwt_extended import create_access_token
+
+from jokes_tounsi.extensions import db
+from jokes_tounsi.models import DataVersion, Joke, rebuild_search_index
+from jokes_tounsi.resources.jokes import JOKE_ROWS
+from jokes_tounsi.schemas import JokeSchema, JokeListResponseSchema
+
+
+def test_search_uses_full_text_index(client, jokes):
+    """Search matches words in any language column, published jokes only."""
+    response = client.get("/api/v1/jokes", query_string={"q": "jha"})
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["total"] == 2
+    # The joke mentioning "Jha" most often ranks first
+    assert [item["id"] for item in data["items"]] == [jokes[2].id, jokes[0].id]
+
+
+def test_search_combines_with_filters(client, jokes):
+    """Category filters still apply to search results."""
+    response = client.get("/api/v1/jokes", query_string={"q": "jha", "region": "Tunis"})
+
+    data = response.get_json()
+    assert [item["id"] for item in data["items"]] == [jokes[0].id]
+
+
+def test_search_prefix_and_accents(client, jokes):
+    """Words are prefix-matched and accents are ignored."""
+    response = client.get("/api/v1/jokes", query_string={"q": "sfaxièn"})
+    assert [item["id"] for item in response.get_json()["items"]] == [jokes[1].id]
+
+    response = client.get("/api/v1/jokes", query_string={"q": "SFAX"})
+    assert [item["id"] for item in response.get_json()["items"]] == [jokes[1].id]
+
+
+def test_search_ignores_fts_syntax(client, jokes):
+    """FTS5 operators typed by users do not break the query."""
+    response = client.get("/api/v1/jokes", query_string={"q": 'jha" OR NEAR(*'})
+    assert response.status_code == 200
+
+    response = client.get("/api/v1/jokes", query_string={"q": "!!!"})
+    assert response.status_code == 200
+    assert response.get_json()["total"] == 0
+
+
+def test_search_index_follows_updates(client, jokes):
+    """Triggers keep the index in sync with edits and deletes."""
+    jokes[1].text_fr = "Un Sfaxien et Jha"
+    db.session.delete(jokes[0])
+    db.session.commit()
+
+    data = client.get("/api/v1/jokes", query_string={"q": "jha"}).get_json()
+    assert sorted(item["id"] for item in data["items"]) == sorted([jokes[1].id, jokes[2].id])
+
+    rebuild_search_index()
+    data = client.get("/api/v1/jokes", query_string={"q": "jha"}).get_json()
+    assert data["total"] == 2
+
+
+def test_keyset_pagination_walks_all_pages(client, author):
+    """next_cursor chains pages newest first without repeats."""
+    db.session.add_all([
+        Joke(text_tn=f"Nokta {i}", is_published=True, author_id=author.id)
+        for i in range(5)
+    ])
+    db.session.commit()
+
+    seen = []
+    cursor = ""
+    while cursor is not None:
+        data = client.get(
+            "/api/v1/jokes", query_string={"cursor": cursor, "per_page": 2}
+        ).get_json()
+        assert data["total"] is None
+        seen.extend(item["id"] for item in data["items"])
+        cursor = data["next_cursor"]
+
+    expected = [joke.id for joke in Joke.query.order_by(Joke.created_at.desc(), Joke.id.desc())]
+    assert seen == expected
+
+
+def test_keyset_pagination_optional_total(client, jokes):
+    """Cursor mode counts only on request; page mode can skip the count."""
+    data = client.get(
+        "/api/v1/jokes", query_string={"cursor": "", "include_total": "true"}
+    ).get_json()
+    assert data["total"] == 3
+    assert data["next_cursor"] is None
+
+    data = client.get("/api/v1/jokes", query_string={"include_total": "false"}).get_json()
+    assert data["total"] is None
+    assert data["page"] == 1
+    assert len(data["items"]) == 3
+
+
+def test_list_json_matches_schema_dump(app, client, jokes):
+    """The column-tuple path returns byte-for-byte what marshmallow would."""
+    jokes[0].text_fr = "Jha mcha lel souk"
+    jokes[0].tone = "Funny"
+    db.session.commit()
+    published = sorted(jokes[:3], key=lambda joke: joke.created_at, reverse=True)
+    schema = JokeListResponseSchema()
+
+    response = client.get("/api/v1/jokes", query_string={"per_page": 2, "page": 2})
+    expected = {"page": 2, "per_page": 2, "total": 3, "items": published[2:]}
+    assert response.data == jsonify(schema.dump(expected)).data
+
+    response = client.get("/api/v1/jokes", query_string={"cursor": "", "per_page": 2})
+    next_cursor = response.get_json()["next_cursor"]
+    expected = {"per_page": 2, "total": None, "next_cursor": next_cursor, "items": published[:2]}
+    assert response.data == jsonify(schema.dump(expected)).data
+
+
+def test_row_serializer_matches_joke_schema(app, jokes):
+    rows = db.session.execute(
+        db.select(*JOKE_ROWS.columns).order_by(Joke.id)
+    ).all()
+
+    assert JOKE_ROWS.dump_many(rows) == JokeSchema(many=True).dump(jokes)
+
+
+def test_sparse_fieldsets_restrict_select_and_output(app, client, jokes, capture_statements):
+    """fields= limits both the columns read and the fields returned."""
+    joke_id = jokes[0].id
+    capture_statements.clear()
+    listing = client.get("/api/v1/jokes", query_string={"fields": "text_tn, id"})
+    detail = client.get(f"/api/v1/jokes/{joke_id}", query_string={"fields": "id,region"})
+    statements = [statement for statement, _ in capture_statements]
+
+    assert listing.status_code == 200
+    assert [set(item) for item in listing.get_json()["items"]] == [{"id", "text_tn"}] * 3
+    assert detail.get_json() == {"id": joke_id, "region": "Tunis"}
+    assert not any("text_fr" in statement or "text_en" in statement for statement in statements)
+
+    random_joke = client.get("/api/v1/jokes/random", query_string={"fields": "id", "region": "Sfax"})
+    assert random_joke.get_json()["id"] in (jokes[1].id, jokes[2].id)
+    assert set(random_joke.get_json()) == {"id"}
+
+
+def test_sparse_fieldsets_with_keyset_pagination(client, jokes):
+    """Cursors still chain when created_at/id are not requested."""
+    data = client.get(
+        "/api/v1/jokes", query_string={"cursor": "", "per_page": 2, "fields": "text_tn"}
+    ).get_json()
+    assert [set(item) for item in data["items"]] == [{"text_tn"}] * 2
+
+    data = client.get(
+        "/api/v1/jokes", query_string={"cursor": data["next_cursor"], "per_page": 2, "fields": "text_tn"}
+    ).get_json()
+    assert len(data["items"]) == 1
+    assert data["next_cursor"] is None
+
+
+def test_sparse_fieldsets_reject_unknown_fields(client, jokes):
+    response = client.get("/api/v1/jokes", query_string={"fields": "id,password_hash"})
+    assert response.status_code == 422
+
+    response = client.get(f"/api/v1/jokes/{jokes[0].id}", query_string={"fields": "nope"})
+    assert response.status_code == 422
+
+
+def test_batch_get_keeps_request_order(client, jokes):
+    """One entry per requested id, in order, with null for unknown ids."""
+    ids = [jokes[2].id, 999, jokes[0].id, jokes[2].id]
+    data = client.get(
+        "/api/v1/jokes/batch", query_string={"ids": ",".join(map(str, ids)), "fields": "id,text_tn"}
+    ).get_json()
+
+    assert data["items"] == [
+        {"id": jokes[2].id, "text_tn": "Jha w l7mar"},
+        None,
+        {"id": jokes[0].id, "text_tn": "Mcha Jha lel souk"},
+        {"id": jokes[2].id, "text_tn": "Jha w l7mar"},
+    ]
+    assert data["not_found"] == [999]
+
+    posted = client.post("/api/v1/jokes/batch", json={"ids": ids, "fields": "id,text_tn"})
+    assert posted.get_json() == data
+
+
+def test_batch_get_runs_one_query(app, client, jokes, capture_statements):
+    ids = [joke.id for joke in jokes]
+    capture_statements.clear()
+    response = client.get("/api/v1/jokes/batch", query_string={"ids": ",".join(map(str, ids))})
+    statements = [statement for statement, _ in capture_statements]
+
+    assert response.status_code == 200
+    assert len(statements) == 1
+    assert " IN (" in statements[0]
+
+
+def test_batch_get_hides_drafts_from_others(client, jokes, author_headers, admin_headers):
+    draft = jokes[3].id
+    query = {"ids": f"{jokes[0].id},{draft}"}
+
+    anonymous = client.get("/api/v1/jokes/batch", query_string=query).get_json()
+    assert anonymous["items"][1] is None
+    assert anonymous["not_found"] == [draft]
+
+    token = create_access_token(identity="999", additional_claims={"role": "contributor"})
+    other = client.get(
+        "/api/v1/jokes/batch", query_string=query, headers={"Authorization": f"Bearer {token}"}
+    ).get_json()
+    assert other["not_found"] == [draft]
+
+    for headers in (author_headers, admin_headers):
+        data = client.get("/api/v1/jokes/batch", query_string=query, headers=headers).get_json()
+        assert data["items"][1]["id"] == draft
+        assert data["not_found"] == []
+
+
+def test_batch_get_validates_ids(client, jokes):
+    assert client.get("/api/v1/jokes/batch", query_string={"ids": "1,x"}).status_code == 422
+    assert client.get("/api/v1/jokes/batch").status_code == 422
+    too_many = ",".join(str(i) for i in range(1, 102))
+    assert client.get("/api/v1/jokes/batch", query_string={"ids": too_many}).status_code == 422
+
+
+def test_bulk_update_by_ids(app, client, jokes, admin_headers, capture_statements):
+    """One UPDATE; rows the patch does not change keep their updated_at."""
+    before = {joke.id: joke.updated_at for joke in jokes}
+    ids = [jokes[0].id, jokes[3].id]
+    capture_statements.clear()
+    response = client.patch(
+        "/api/v1/jokes/batch", json={"ids": ids, "patch": {"is_published": True}}, headers=admin_headers
+    )
+    statements = [statement for statement, _ in capture_statements]
+
+    assert response.status_code == 200
+    assert response.get_json() == {"updated": 1}  # jokes[0] was already published
+    assert sum(statement.startswith("UPDATE jokes") for statement in statements) == 1
+
+    db.session.expire_all()
+    assert db.session.get(Joke, jokes[3].id).is_published
+    assert db.session.get(Joke, jokes[3].id).updated_at > before[jokes[3].id]
+    assert db.session.get(Joke, jokes[0].id).updated_at == before[jokes[0].id]
+    # Search and facets follow through their triggers
+    assert client.get("/api/v1/jokes", query_string={"q": "secret"}).get_json()["total"] == 1
+    facets = client.get("/api/v1/facets").get_json()
+    assert {"value": "Tunis", "count": 2} in facets["region"]
+
+
+def test_bulk_update_by_filter(client, jokes, admin_headers):
+    response = client.patch(
+        "/api/v1/jokes/batch",
+        json={"filter": {"region": "Sfax", "is_published": True}, "patch": {"era": "Pre-2011", "text_fr": ""}},
+        headers=admin_headers,
+    )
+    assert response.get_json() == {"updated": 2}
+
+    data = client.get("/api/v1/jokes", query_string={"era": "Pre-2011"}).get_json()
+    assert sorted(item["region"] for item in data["items"]) == ["Sfax", "Sfax"]
+    # An empty value is ignored, as in PATCH /jokes/<id>
+    assert "Un Sfaxien et son argent" in [item.get("text_fr") for item in data["items"]]
+
+
+def test_bulk_update_validation(client, jokes, admin_headers, author_headers):
+    url = "/api/v1/jokes/batch"
+    patch = {"is_published": False}
+    assert client.patch(url, json={"ids": [1], "patch": patch}, headers=author_headers).status_code == 403
+    assert client.patch(url, json={"patch": patch}, headers=admin_headers).status_code == 422
+    assert client.patch(url, json={"ids": [1], "filter": {"region": "Sfax"}, "patch": patch},
+                        headers=admin_headers).status_code == 422
+    assert client.patch(url, json={"filter": {}, "patch": patch}, headers=admin_headers).status_code == 422
+    assert client.patch(url, json={"ids": [1], "patch": {}}, headers=admin_headers).status_code == 422
+
+
+def test_keyset_pagination_rejects_bad_cursor(client, jokes):
+    """Malformed cursors are a validation error."""
+    response = client.get("/api/v1/jokes", query_string={"cursor": "not-a-cursor"})
+    assert response.status_code == 422
+
+
+def test_list_conditional_get(client, jokes, author_headers):
+    """The listing answers 304 until a joke is written."""
+    response = client.get("/api/v1/jokes", query_string={"region": "Sfax"})
+    etag = response.headers["ETag"]
+    assert response.headers["Last-Modified"]
+
+    response = client.get(
+        "/api/v1/jokes", query_string={"region": "Sfax"}, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+
+    # If-None-Match uses the weak comparison, e.g. behind a proxy weakening tags
+    response = client.get(
+        "/api/v1/jokes", query_string={"region": "Sfax"}, headers={"If-None-Match": f"W/{etag}"}
+    )
+    assert response.status_code == 304
+
+    # Other filters are other representations
+    response = client.get(
+        "/api/v1/jokes", query_string={"region": "Tunis"}, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+
+    client.post("/api/v1/jokes", json={"text_tn": "Jdida"}, headers=author_headers)
+    response = client.get(
+        "/api/v1/jokes", query_string={"region": "Sfax"}, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_untracked_versions_disable_validators_and_pool(monkeypatch, client, jokes, author_headers):
+    """Without version triggers (not SQLite) listings carry no validators and ids are reloaded."""
+    monkeypatch.setattr(DataVersion, "tracked", classmethod(lambda cls: False))
+
+    response = client.get("/api/v1/jokes")
+    assert response.status_code == 200
+    assert "ETag" not in response.headers
+    assert "ETag" not in client.get("/api/v1/facets").headers
+
+    assert client.get("/api/v1/jokes/random", query_string={"region": "Tunis"}).status_code == 200
+    client.patch(f"/api/v1/jokes/{jokes[0].id}", json={"is_published": False}, headers=author_headers)
+    assert client.get("/api/v1/jokes/random", query_string={"region": "Tunis"}).status_code == 404
+
+
+def test_detail_conditional_get_skips_text_columns(app, client, jokes, author_headers, capture_statements):
+    """A fresh validator is answered without loading the joke texts."""
+    url = f"/api/v1/jokes/{jokes[0].id}"
+    response = client.get(url)
+    etag = response.headers["ETag"]
+    last_modified = response.headers["Last-Modified"]
+
+    capture_statements.clear()
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+    assert client.get(url, headers={"If-Modified-Since": last_modified}).status_code == 304
+    statements = [statement for statement, _ in capture_statements]
+    assert statements
+    assert not any("text_tn" in statement for statement in statements)
+
+    client.patch(url, json={"region": "Bizerte"}, headers=author_headers)
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.get_json()["region"] == "Bizerte"
+
+
+def test_import_ndjson(app, client, author, author_headers):
+    """Valid lines are inserted in batches, invalid ones reported by line."""
+    app.config["JOKE_IMPORT_BATCH_SIZE"] = 2
+    body = "\n".join([
+        '{"text_tn": "Wa7da", "region": "Sfax", "is_published": true}',
+        '{"text_tn": "Zouz"}',
+        '',
+        'not json',
+        '{"text_fr": "sans texte tunisien"}',
+        '["list"]',
+        '{"text_tn": "Thletha", "era": "Post-2011", "is_published": true}',
+    ])
+
+    response = client.post(
+        "/api/v1/jokes/import",
+        data=body,
+        content_type="application/x-ndjson",
+        headers=author_headers,
+    )
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["inserted"] == 3
+    assert data["failed"] == 3
+    assert [error["line"] for error in data["errors"]] == [4, 5, 6]
+    assert "text_tn" in data["errors"][1]["errors"]
+
+    imported = Joke.query.order_by(Joke.id).all()
+    assert [joke.text_tn for joke in imported] == ["Wa7da", "Zouz", "Thletha"]
+    assert {joke.author_id for joke in imported} == {author.id}
+    assert all(joke.created_at and joke.updated_at for joke in imported)
+
+    # Derived tables follow the batched inserts
+    assert client.get("/api/v1/jokes", query_string={"q": "thletha"}).get_json()["total"] == 1
+
+
+def test_import_requires_contributor(client):
+    token = create_access_token(identity="999", additional_claims={"role": "user"})
+    response = client.post(
+        "/api/v1/jokes/import",
+        data='{"text_tn": "x"}',
+        content_type="application/x-ndjson",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 403
+
+
+def test_export_ndjson(client, jokes):
+    """Exports stream every matching published joke as Joke.to_dict()."""
+    response = client.get("/api/v1/jokes/export", query_string={"region": "Sfax"})
+
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert lines == [jokes[2].to_dict(), jokes[1].to_dict()]
+
+
+def test_export_csv(client, jokes):
+    response = client.get("/api/v1/jokes/export", query_string={"format": "csv", "q": "jha"})
+
+    assert response.mimetype == "text/csv"
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert [int(row["id"]) for row in rows] == [jokes[2].id, jokes[0].id]
+    assert rows[1]["text_en"] == "Jha went to the market"
+    assert rows[1]["text_fr"] == ""
+
+
+def test_random_joke_respects_filters(client, jokes):
+    published_sfax = {jokes[1].id, jokes[2].id}
+    picked = {
+        client.get("/api/v1/jokes/random", query_string={"region": "Sfax"}).get_json()["id"]
+        for _ in range(20)
+    }
+    assert picked <= published_sfax
+
+    response = client.get("/api/v1/jokes/random", query_string={"region": "Gabes"})
+    assert response.status_code == 404
+
+
+def test_random_joke_pool_follows_writes(client, jokes, author_headers):
+    """Unpublishing a joke refreshes the cached ids."""
+    assert client.get("/api/v1/jokes/random", query_string={"region": "Tunis"}).status_code == 200
+
+    client.patch(f"/api/v1/jokes/{jokes[0].id}", json={"is_published": False}, headers=author_headers)
+    response = client.get("/api/v1/jokes/random", query_string={"region": "Tunis"})
+    assert response.status_code == 404
+
+
+def test_random_joke_pool_survives_unrelated_writes(client, jokes, author_headers, capture_statements):
+    """Text edits and draft writes keep the cached ids; a region change drops them."""
+    def reloads():
+        capture_statements.clear()
+        assert client.get("/api/v1/jokes/random", query_string={"region": "Tunis"}).status_code == 200
+        return any("ORDER BY jokes.id" in statement for statement, _ in capture_statements)
+
+    assert reloads()
+    client.patch(f"/api/v1/jokes/{jokes[0].id}", json={"text_en": "Jha at the souk"}, headers=author_headers)
+    client.patch(f"/api/v1/jokes/{jokes[3].id}", json={"region": "Sfax"}, headers=author_headers)
+    client.post("/api/v1/jokes", json={"text_tn": "Jdida", "region": "Tunis"}, headers=author_headers)
+    assert not reloads()
+
+    client.patch(f"/api/v1/jokes/{jokes[1].id}", json={"region": "Tunis"}, headers=author_headers)
+    assert reloads()
+
+
+def test_joke_of_the_day_is_stable_and_cacheable(client, jokes):
+    first = client.get("/api/v1/jokes/today")
+    second = client.get("/api/v1/jokes/today")
+
+    assert first.get_json()["id"] == second.get_json()["id"]
+    assert first.get_json()["is_published"] is True
+    assert first.headers["Cache-Control"].startswith("public, max-age=")
+    assert "Expires" in first.headers
+
+
+def test_joke_of_the_day_ignores_writes_during_the_day(client, author, author_headers, admin_headers):
+    yesterday = datetime.now(timezone.utc) - timedelta(days=1)
+    older = [
+        Joke(text_tn=f"Nokta {n}", is_published=True, author_id=author.id, created_at=yesterday)
+        for n in range(20)
+    ]
+    db.session.add_all(older)
+    db.session.commit()
+    picked = client.get("/api/v1/jokes/today").get_json()["id"]
+
+    for n in range(5):
+        client.post("/api/v1/jokes", json={"text_tn": f"Jdida {n}", "is_published": True}, headers=author_headers)
+    for joke in older[::3]:
+        if joke.id != picked:
+            client.delete(f"/api/v1/jokes/{joke.id}", headers=admin_headers)
+    assert client.get("/api/v1/jokes/today").get_json()["id"] == picked
+
+    # Unpublishing the pick itself moves to another joke created before today
+    client.patch(f"/api/v1/jokes/{picked}", json={"is_published": False}, headers=author_headers)
+    assert client.get("/api/v1/jokes/today").get_json()["id"] in {joke.id for joke in older} - {picked}
+
+
+def test_joke_row_rechecks_publication(app, jokes):
+    """A joke unpublished after the ids were loaded is not served."""
+    from jokes_tounsi.resources.jokes import _joke_row
+    assert _joke_row(jokes[0].id, JOKE_ROWS, published_only=True) is not None
+    assert _joke_row(jokes[3].id, JOKE_ROWS, published_only=True) is None
+
+
+def test_author_gets_own_draft(client, jokes, author_headers):
+    draft = jokes[3].id
+    response = client.get(f"/api/v1/jokes/{draft}", headers=author_headers)
+    assert response.status_code == 200
+    assert response.get_json()["is_published"] is False
+
+    # The conditional GET agrees with the plain one
+    revalidated = client.get(
+        f"/api/v1/jokes/{draft}", headers={**author_headers, "If-None-Match": response.headers["ETag"]}
+    )
+    assert revalidated.status_code == 304
+
+
+def test_writes_authorize_from_token_claims(client, jokes, author_headers, admin_headers, capture_statements):
+    """Joke writes never look the user up, even with a cold profile cache."""
+    capture_statements.clear()
+    created = client.post("/api/v1/jokes", json={"text_tn": "Jdida"}, headers=author_headers)
+    response = client.patch(f"/api/v1/jokes/{jokes[0].id}", json={"era": "Pre-2011"}, headers=author_headers)
+    deleted = client.delete(f"/api/v1/jokes/{jokes[1].id}", headers=admin_headers)
+    statements = [statement for statement, _ in capture_statements]
+
+    assert created.status_code == 201
+    assert response.status_code == 200
+    assert deleted.status_code == 204
+    assert not any("FROM users" in statement for statement in statements)
+
+    token = create_access_token(identity="999", additional_claims={"role": "contributor"})
+    response = client.patch(
+        f"/api/v1/jokes/{jokes[0].id}",
+        json={"era": "Post-2011"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 403
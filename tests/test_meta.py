@@ -0,0 +1,71 @@
+from jokes_tounsi.extensions import db
+from jokes_tounsi.models import FACET_COLUMNS, Joke, JokeFacetCount, rebuild_facet_counts
+
+
+def group_by_counts(column, **filters):
+    """Ground truth computed straight from the jokes table."""
+    query = (
+        db.session.query(getattr(Joke, column), db.func.count())
+        .filter(Joke.is_published == db.true())
+        .filter_by(**filters)
+        .group_by(getattr(Joke, column))
+    )
+    return {value: count for value, count in query}
+
+
+def as_dict(facet):
+    return {item["value"]: item["count"] for item in facet}
+
+
+def test_facets_match_group_by(client, jokes):
+    data = client.get("/api/v1/facets").get_json()
+    for column in FACET_COLUMNS:
+        assert as_dict(data[column]) == group_by_counts(column)
+
+    data = client.get("/api/v1/facets", query_string={"region": "Sfax"}).get_json()
+    assert as_dict(data["region"]) == {"Sfax": 2}
+    assert as_dict(data["era"]) == group_by_counts("era", region="Sfax")
+
+
+def test_facets_follow_writes(client, jokes, author_headers, admin_headers):
+    client.post(
+        "/api/v1/jokes",
+        json={"text_tn": "Jdida", "region": "Sousse", "tone": "Witty", "is_published": True},
+        headers=author_headers,
+    )
+    client.patch(f"/api/v1/jokes/{jokes[3].id}", json={"is_published": True}, headers=author_headers)
+    client.patch(f"/api/v1/jokes/{jokes[1].id}", json={"region": "Tunis"}, headers=author_headers)
+    client.delete(f"/api/v1/jokes/{jokes[0].id}", headers=admin_headers)
+
+    data = client.get("/api/v1/facets").get_json()
+    for column in FACET_COLUMNS:
+        assert as_dict(data[column]) == group_by_counts(column)
+    assert as_dict(data["region"]) == {"Tunis": 2, "Sfax": 1, "Sousse": 1}
+
+
+def test_facets_follow_search(client, jokes):
+    """With `q` the counts cover the search matches only."""
+    data = client.get("/api/v1/facets", query_string={"q": "Jha"}).get_json()
+    assert as_dict(data["region"]) == {"Tunis": 1, "Sfax": 1}
+    assert as_dict(data["era"]) == {None: 2}
+
+    data = client.get("/api/v1/facets", query_string={"q": "Jha", "region": "Sfax"}).get_json()
+    assert as_dict(data["region"]) == {"Sfax": 1}
+
+    data = client.get("/api/v1/facets", query_string={"q": "nothing-like-it"}).get_json()
+    assert data["region"] == []
+
+
+def test_rebuild_facet_counts(client, jokes):
+    db.session.execute(db.delete(JokeFacetCount))
+    db.session.commit()
+    rebuild_facet_counts()
+
+    data = client.get("/api/v1/facets").get_json()
+    assert as_dict(data["region"]) == group_by_counts("region")
+
+
+def test_classification_lists_values_in_use(client, jokes):
+    data = client.get("/api/v1/classification").get_json()
+    assert data["regions"] == ["Sfax", "Tunis"]
+    assert data["eras"] == []
@@ -0,0 +1,89 @@
+import json
+import os
+
+from jokes_tounsi import create_app
+from jokes_tounsi.config import TestingConfig
+from jokes_tounsi.extensions import db
+from jokes_tounsi.utils.metrics import MetricsRegistry, render
+
+
+def sample(text, line_prefix):
+    """Value of the first exposition line starting with `line_prefix`."""
+    for line in text.splitlines():
+        if line.startswith(line_prefix):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"{line_prefix} not found in metrics")
+
+
+def test_metrics_endpoint(app, client, jokes):
+    app.add_url_rule("/boom", "boom", lambda: 1 / 0)
+    client.get("/api/v1/jokes")
+    client.get("/api/v1/jokes", query_string={"region": "Sfax"})
+    client.get("/boom")
+
+    response = client.get("/metrics")
+    text = response.get_data(as_text=True)
+
+    assert response.content_type.startswith("text/plain; version=0.0.4")
+    assert "# TYPE http_request_duration_seconds histogram" in text
+    labels = 'endpoint="jokes.list_jokes",method="GET"'
+    assert sample(text, f'http_requests_total{{{labels},status="200"}}') == 2
+    assert sample(text, f"http_request_duration_seconds_count{{{labels}}}") == 2
+    assert sample(text, f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}}') == 2
+    assert sample(text, f"db_queries_per_request_sum{{{labels}}}") >= 4
+    assert sample(text, 'http_request_errors_total{endpoint="boom",method="GET",status="500"}') == 1
+    # Only the /metrics request itself is running
+    assert sample(text, "http_requests_in_flight ") == 1
+
+
+def test_server_timing_is_opt_in(app, client, jokes):
+    assert "Server-Timing" not in client.get("/api/v1/jokes").headers
+
+    app.config["SERVER_TIMING"] = True
+    header = client.get("/api/v1/jokes", query_string={"page": 1}).headers["Server-Timing"]
+    names = [entry.split(";")[0].strip() for entry in header.split(",")]
+    assert names == ["db", "serialize", "total"]
+    assert 'desc="' in header
+
+
+def test_metrics_aggregate_worker_files(tmp_path):
+    """Counters of every worker file are summed; gauges of dead workers dropped."""
+    registry = MetricsRegistry(directory=str(tmp_path))
+    registry.inc("http_requests_total", (("endpoint", "ping"), ("method", "GET"), ("status", 200)))
+    registry.inc("http_requests_in_flight")
+    registry.observe("http_request_duration_seconds", (("endpoint", "ping"), ("method", "GET")), 0.02)
+
+    dead_worker = {
+        "pid": 2 ** 22 + 1,  # above pid_max, never alive
+        "samples": [
+            ["http_requests_total", [["endpoint", "ping"], ["method", "GET"], ["status", 200]], 4],
+            ["http_requests_in_flight", [], 3],
+            ["http_request_duration_seconds", [["endpoint", "ping"], ["method", "GET"]],
+             [[0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1], 0.007, 1]],
+        ],
+    }
+    (tmp_path / "metrics-4194305.json").write_text(json.dumps(dead_worker))
+
+    text = render(registry.collect())
+
+    assert os.path.exists(tmp_path / f"metrics-{os.getpid()}.json")
+    assert sample(text, 'http_requests_total{endpoint="ping",method="GET",status="200"}') == 5
+    assert sample(text, "http_requests_in_flight ") == 1
+    labels = 'endpoint="ping",method="GET"'
+    assert sample(text, f'http_request_duration_seconds_bucket{{{labels},le="0.01"}}') == 1
+    assert sample(text, f'http_request_duration_seconds_bucket{{{labels},le="0.025"}}') == 2
+    assert sample(text, f"http_request_duration_seconds_count{{{labels}}}") == 2
+
+
+def test_metrics_directory_from_config(tmp_path):
+    config = type("MetricsConfig", (TestingConfig,), {"METRICS_DIR": str(tmp_path)})
+    app = create_app(config)
+    with app.app_context():
+        db.create_all()
+    client = app.test_client()
+
+    client.get("/health")
+    text = client.get("/metrics").get_data(as_text=True)
+
+    assert sample(text, 'http_requests_total{endpoint="health",method="GET",status="200"}') == 1
+    assert list(tmp_path.glob("metrics-*.json"))
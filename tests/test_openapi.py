@@ -0,0 +1,65 @@
+import gzip
+import json
+
+from flask import Flask
+from flask_smorest import Api
+
+from jokes_tounsi import create_app
+from jokes_tounsi.config import TestingConfig
+from jokes_tounsi.extensions import api
+from jokes_tounsi.resources.auth import blp as AuthBlueprint
+from jokes_tounsi.resources.jokes import blp as JokesBlueprint
+from jokes_tounsi.resources.meta import blp as MetaBlueprint
+from jokes_tounsi.security import google_client
+
+
+def test_lazy_spec_matches_eager_registration(client):
+    eager_app = Flask(__name__)
+    eager_app.config.from_object(TestingConfig)
+    eager = Api(eager_app)
+    for blueprint in (MetaBlueprint, JokesBlueprint, AuthBlueprint):
+        eager.register_blueprint(blueprint, url_prefix="/api/v1")
+
+    assert client.get("/api/v1/openapi.json").get_json() == eager.spec.to_dict()
+
+
+def test_spec_is_cacheable(client):
+    response = client.get("/api/v1/openapi.json")
+    assert response.headers["Cache-Control"] == "public, max-age=86400"
+    etag = response.headers["ETag"]
+
+    revalidated = client.get("/api/v1/openapi.json", headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["Cache-Control"] == "public, max-age=86400"
+
+    compressed = client.get("/api/v1/openapi.json", headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(compressed.data) == response.data
+
+
+def test_prebuilt_spec_skips_doc_registration(tmp_path):
+    spec_file = tmp_path / "openapi.json"
+    spec_file.write_text(json.dumps({"openapi": "3.0.2", "paths": {}}))
+    config = type("PrebuiltSpecConfig", (TestingConfig,), {"OPENAPI_SPEC_FILE": str(spec_file)})
+    app = create_app(config)
+
+    response = app.test_client().get("/api/v1/openapi.json")
+    assert response.get_json() == {"openapi": "3.0.2", "paths": {}}
+    assert api._pending_docs  # the views were never documented
+
+
+def test_openapi_write_command(runner, tmp_path):
+    path = tmp_path / "openapi.json"
+    result = runner.invoke(args=["openapi", "write", "--format=json", str(path)])
+    assert result.exit_code == 0
+    assert "/api/v1/jokes/batch" in json.loads(path.read_text())["paths"]
+
+
+def test_google_client_registered_on_first_use(app):
+    assert "google_oauth" not in app.extensions
+    app.config["GOOGLE_CLIENT_ID"] = "client-id"
+
+    client = google_client()
+    assert client is google_client()
+    assert client.client_id == "client-id"
+    assert app.extensions["google_oauth"] is client
@@ -0,0 +1,138 @@
+import json
+import logging
+
+import pytest
+from flask_jwt_extended import create_access_token
+
+from jokes_tounsi import create_app
+from jokes_tounsi.config import TestingConfig
+from jokes_tounsi.extensions import db
+from jokes_tounsi.models import Joke, User
+from jokes_tounsi.utils.query_budget import QueryBudgetExceeded, query_budget, stream_with_budget
+
+
+def add_route(app, rule, view):
+    app.add_url_rule(rule, view.__name__, view)
+
+
+def test_every_api_route_declares_a_budget(app):
+    for rule in app.url_map.iter_rules():
+        if rule.endpoint.split(".")[0] in ("jokes", "auth", "meta"):
+            view = app.view_functions[rule.endpoint]
+            assert hasattr(view, "_query_budget"), rule.endpoint
+
+
+def test_over_budget_raises_in_testing(app, client, jokes):
+    @query_budget(1)
+    def two_queries():
+        Joke.query.count()
+        Joke.query.filter_by(is_published=True).count()
+        return "ok"
+
+    add_route(app, "/two-queries", two_queries)
+    with pytest.raises(QueryBudgetExceeded, match="2 queries, budget 1"):
+        client.get("/two-queries")
+
+
+def test_repeated_statement_is_flagged_as_n_plus_one(app, client, jokes):
+    ids = [joke.id for joke in jokes]
+
+    @query_budget(10)
+    def one_per_joke():
+        for joke_id in ids:
+            db.session.execute(db.select(Joke.text_tn).where(Joke.id == joke_id)).scalar()
+        return "ok"
+
+    @query_budget(10, allow_repeats=True)
+    def batched():
+        for joke_id in ids:
+            db.session.execute(db.select(Joke.text_tn).where(Joke.id == joke_id)).scalar()
+        return "ok"
+
+    add_route(app, "/one-per-joke", one_per_joke)
+    add_route(app, "/batched", batched)
+    with pytest.raises(QueryBudgetExceeded, match="possible N\\+1"):
+        client.get("/one-per-joke")
+    assert client.get("/batched").status_code == 200
+
+
+def test_streamed_queries_count_against_the_budget(app, client, jokes):
+    @query_budget(1)
+    def streamed():
+        total = Joke.query.count()
+
+        def body():
+            yield f"{total}\n"
+            yield f"{Joke.query.filter_by(is_published=True).count()}\n"
+
+        return app.response_class(stream_with_budget(body()))
+
+    add_route(app, "/streamed", streamed)
+    with pytest.raises(QueryBudgetExceeded, match="2 queries, budget 1"):
+        client.get("/streamed").get_data()
+    assert client.get("/api/v1/jokes/export").status_code == 200
+
+
+def test_violations_are_logged_outside_testing(app, client, jokes, caplog):
+    app.config["QUERY_BUDGET_RAISE"] = False
+    app.config["QUERY_BUDGET_DEFAULT"] = 0
+
+    def unannotated():
+        Joke.query.count()
+        return "ok"
+
+    add_route(app, "/unannotated", unannotated)
+    with caplog.at_level(logging.WARNING, logger="jokes_tounsi.utils.query_budget"):
+        assert client.get("/unannotated").status_code == 200
+    assert "Query budget of unannotated exceeded: 1 queries, budget 0" in caplog.text
+
+
+def test_write_budgets_hold_with_cold_caches():
+    """Writes stay within budget in a fresh app context (new session) with an empty profile cache.
+
+    The `app` fixture keeps one app context, hence one session identity
+    map, across requests; here each request gets its own, as in production.
+    """
+    app = create_app(TestingConfig)
+    with app.app_context():
+        db.create_all()
+        author = User(email="author@example.com", display_name="Author", role="contributor")
+        admin = User(email="admin@example.com", display_name="Admin", role="admin")
+        for user in (author, admin):
+            user.set_password("password123")
+        db.session.add_all([author, admin])
+        db.session.flush()
+        jokes = [Joke(text_tn=f"Nokta {n}", region="Sfax", author_id=author.id) for n in range(3)]
+        db.session.add_all(jokes)
+        db.session.commit()
+        joke_ids = [joke.id for joke in jokes]
+        author_headers, logout_headers, admin_headers = (
+            {"Authorization": f"Bearer {create_access_token(identity=str(user.id), additional_claims={'role': user.role})}"}
+            for user in (author, author, admin)
+        )
+
+    client = app.test_client()
+    ndjson = "\n".join(json.dumps({"text_tn": f"Import {n}"}) for n in range(3))
+    writes = [
+        ("post", "/api/v1/jokes", {"json": {"text_tn": "Jdida"}, "headers": author_headers}),
+        ("patch", f"/api/v1/jokes/{joke_ids[0]}", {"json": {"era": "Pre-2011"}, "headers": author_headers}),
+        ("patch", "/api/v1/jokes/batch",
+         {"json": {"ids": joke_ids, "patch": {"is_published": True}}, "headers": admin_headers}),
+        ("post", "/api/v1/jokes/import",
+         {"data": ndjson, "content_type": "application/x-ndjson", "headers": author_headers}),
+        ("delete", f"/api/v1/jokes/{joke_ids[1]}", {"headers": admin_headers}),
+        ("post", "/api/v1/register",
+         {"json": {"email": "new@example.com", "password": "password123", "display_name": "New"}}),
+        ("post", "/api/v1/login", {"json": {"email": "new@example.com", "password": "password123"}}),
+        ("put", "/api/v1/users/role",
+         {"json": {"email": "new@example.com", "role": "contributor"}, "headers": admin_headers}),
+        ("post", "/api/v1/logout", {"headers": logout_headers}),
+    ]
+    try:
+        for method, url, kwargs in writes:
+            app.extensions["user_profiles"].clear()
+            response = getattr(client, method)(url, **kwargs)
+            assert response.status_code < 300, (method, url, response.get_json())
+    finally:
+        with app.app_context():
+            db.drop_all()
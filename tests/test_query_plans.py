@@ -0,0 +1,88 @@
+"""Query-plan checks for every SQL statement list_jokes can generate.
+
+Each filter combination is requested through the API while the emitted
+statements are captured, then replayed under EXPLAIN QUERY PLAN. A plan that
+scans the jokes table or sorts through a temporary B-tree fails the test.
+"""
+from datetime import datetime, timezone
+from itertools import combinations
+
+import pytest
+
+from jokes_tounsi.extensions import db
+from jokes_tounsi.resources.jokes import FILTER_COLUMNS
+from jokes_tounsi.utils.pagination import encode_cursor
+
+
+FILTER_COMBINATIONS = [
+    combo
+    for size in range(len(FILTER_COLUMNS) + 1)
+    for combo in combinations(FILTER_COLUMNS, size)
+]
+
+PAGINATION_MODES = {
+    "page": {"page": 2},
+    "page_without_total": {"include_total": "false"},
+    "first_cursor": {"cursor": "", "include_total": "true"},
+    "next_cursor": {"cursor": encode_cursor(datetime.now(timezone.utc).replace(tzinfo=None), 42)},
+}
+
+
+def selects(captured):
+    """The SELECTs captured so far (explain() runs statements too)."""
+    return [(statement, parameters) for statement, parameters in captured
+            if statement.lstrip().upper().startswith("SELECT")]
+
+
+def explain(statement, parameters):
+    """Return the EXPLAIN QUERY PLAN detail lines for a statement."""
+    with db.engine.connect() as conn:
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        return [row[-1] for row in rows]
+
+
+def is_table_scan(detail, table="jokes"):
+    return detail.startswith(f"SCAN {table}") and "INDEX" not in detail
+
+
+def test_jokes_table_has_expected_indexes(app):
+    indexes = {
+        row[1]
+        for row in db.session.execute(db.text("PRAGMA index_list('jokes')"))
+    }
+    assert "ix_jokes_published_created_at" in indexes
+    assert "ix_jokes_is_published" not in indexes
+
+
+@pytest.mark.parametrize("mode", sorted(PAGINATION_MODES))
+@pytest.mark.parametrize("filters", FILTER_COMBINATIONS, ids=lambda c: "+".join(c) or "none")
+def test_listing_plans_use_indexes(client, capture_statements, filters, mode):
+    query_string = {column: "x" for column in filters}
+    query_string.update(PAGINATION_MODES[mode])
+
+    response = client.get("/api/v1/jokes", query_string=query_string)
+    assert response.status_code == 200
+    assert capture_statements, "no statement captured"
+
+    for statement, parameters in selects(capture_statements):
+        plan = explain(statement, parameters)
+        assert not any(is_table_scan(detail) for detail in plan), (statement, plan)
+        assert not any("TEMP B-TREE" in detail for detail in plan), (statement, plan)
+
+
+@pytest.mark.parametrize("filters", [(), ("region",), ("era", "age_group")],
+                         ids=lambda c: "+".join(c) or "none")
+def test_search_plans_never_scan_jokes(client, capture_statements, filters):
+    """Searches drive from the FTS index; jokes rows are fetched by rowid.
+
+    Ordering by bm25 needs a sort of the matches, so only scans are checked.
+    """
+    query_string = {column: "x" for column in filters}
+    query_string["q"] = "jha"
+
+    response = client.get("/api/v1/jokes", query_string=query_string)
+    assert response.status_code == 200
+
+    for statement, parameters in selects(capture_statements):
+        plan = explain(statement, parameters)
+        assert not any(is_table_scan(detail) for detail in plan), (statement, plan)
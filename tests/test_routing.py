@@ -0,0 +1,98 @@
+import pytest
+import sqlalchemy as sa
+from flask_jwt_extended import create_access_token
+
+from jokes_tounsi import create_app
+from jokes_tounsi.config import TestingConfig, ProductionConfig
+from jokes_tounsi.extensions import db
+from jokes_tounsi.models import User, Joke
+from jokes_tounsi.routing import READONLY_BIND, sqlite_readonly_uri
+
+
+@pytest.fixture
+def routed_app(tmp_path):
+    """File database opened twice: read-write and mode=ro."""
+    config = type("RoutedConfig", (TestingConfig,), {
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'jokes.db'}",
+        "SQLITE_READONLY_ENGINE": True,
+        "SQLITE_PRAGMAS": ProductionConfig.SQLITE_PRAGMAS,
+    })
+    app = create_app(config)
+    with app.app_context():
+        db.create_all()
+        user = User(email="author@example.com", display_name="Author", role="contributor")
+        user.set_password("password123")
+        db.session.add(user)
+        db.session.flush()
+        db.session.add(Joke(text_tn="Jha fel souk", is_published=True, author_id=user.id))
+        db.session.commit()
+        app.config["TEST_TOKEN"] = create_access_token(
+            identity=str(user.id), additional_claims={"role": user.role}
+        )
+    return app
+
+
+@pytest.fixture
+def statements(routed_app):
+    """SQL statements seen by each engine, keyed by "primary"/"readonly"."""
+    seen = {"primary": [], "readonly": []}
+    with routed_app.app_context():
+        engines = {"primary": db.engine, "readonly": db.engines[READONLY_BIND]}
+    for name, engine in engines.items():
+        sa.event.listen(
+            engine, "before_cursor_execute",
+            lambda conn, cursor, statement, *args, name=name: seen[name].append(statement)
+        )
+    return seen
+
+
+def test_sqlite_readonly_uri():
+    assert sqlite_readonly_uri("sqlite:////srv/jokes.db") == "sqlite:///file%3A/srv/jokes.db?mode=ro&uri=true"
+    assert sa.engine.make_url(sqlite_readonly_uri("sqlite:////srv/jokes.db")).database == "file:/srv/jokes.db"
+    assert sqlite_readonly_uri("sqlite:///:memory:") is None
+    assert sqlite_readonly_uri("postgresql://user:pw@host/jokes") is None
+    assert sqlite_readonly_uri(None) is None
+
+
+def test_no_readonly_engine_by_default(app):
+    assert READONLY_BIND not in db.engines
+
+
+def test_get_requests_read_from_readonly_engine(routed_app, statements):
+    response = routed_app.test_client().get("/api/v1/jokes")
+
+    assert response.status_code == 200
+    assert response.get_json()["total"] == 1
+    assert statements["readonly"]
+    assert not any(s.lstrip().upper().startswith("SELECT") for s in statements["primary"])
+
+
+def test_writes_go_to_primary(routed_app, statements):
+    headers = {"Authorization": f"Bearer {routed_app.config['TEST_TOKEN']}"}
+    response = routed_app.test_client().post(
+        "/api/v1/jokes", json={"text_tn": "Jha w l7mar"}, headers=headers
+    )
+
+    assert response.status_code == 201
+    assert any(s.lstrip().upper().startswith("INSERT") for s in statements["primary"])
+    assert not statements["readonly"]
+
+
+def test_reads_after_a_write_stay_on_primary(routed_app, statements):
+    with routed_app.test_request_context("/api/v1/jokes", method="GET"):
+        joke = db.session.get(Joke, 1)
+        assert statements["readonly"]
+        joke.text_en = "Jha at the market"
+        db.session.commit()
+        statements["readonly"].clear()
+
+        assert db.session.get(Joke, 1).text_en == "Jha at the market"
+        assert not statements["readonly"]
+        db.session.remove()
+
+
+def test_readonly_engine_rejects_writes(routed_app):
+    with routed_app.app_context():
+        with db.engines[READONLY_BIND].connect() as conn:
+            with pytest.raises(sa.exc.OperationalError):
+                conn.exec_driver_sql("DELETE FROM jokes")
@@ -0,0 +1,47 @@
+from jokes_tounsi import create_app
+from jokes_tounsi.config import TestingConfig, ProductionConfig
+from jokes_tounsi.extensions import db
+
+
+def make_app(tmp_path, **overrides):
+    attrs = {
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'jokes.db'}",
+        "SQLITE_PRAGMAS": ProductionConfig.SQLITE_PRAGMAS,
+        "SQLITE_CHECKPOINT_INTERVAL": 3600,
+    }
+    attrs.update(overrides)
+    return create_app(type("ProfileConfig", (TestingConfig,), attrs))
+
+
+def test_production_pragmas_applied_on_connect(tmp_path):
+    app = make_app(tmp_path)
+
+    with app.app_context():
+        with db.engine.connect() as conn:
+            pragma = lambda name: conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+            assert pragma("journal_mode") == "wal"
+            assert pragma("synchronous") == 1  # NORMAL
+            assert pragma("busy_timeout") == ProductionConfig.SQLITE_PRAGMAS["busy_timeout"]
+            assert pragma("temp_store") == 2  # MEMORY
+            assert pragma("cache_size") == ProductionConfig.SQLITE_PRAGMAS["cache_size"]
+
+
+def test_wal_checkpointer_runs(tmp_path):
+    app = make_app(tmp_path)
+    checkpointer = app.extensions["wal_checkpointer"]
+
+    with app.app_context():
+        db.create_all()
+        app.test_client().get("/health")  # first request starts the thread
+        assert checkpointer._pid is not None
+        busy, log_pages, checkpointed = checkpointer.checkpoint()
+        assert busy == 0
+        assert checkpointed == log_pages
+    checkpointer.stop()
+
+    result = app.test_cli_runner().invoke(args=["jokes", "checkpoint"])
+    assert "Checkpointed" in result.output
+
+
+def test_no_profile_by_default(app):
+    assert "wal_checkpointer" not in app.extensions